@@ -0,0 +1,144 @@
+from django.contrib import admin, messages
+from django.core.urlresolvers import reverse
+from django.utils import timezone
+from django.utils.html import format_html
+
+from jobs.models import Job
+
+from .models import Issue, Layout, PrintRun
+from .runs import enqueue_run
+
+
+@admin.register(Layout)
+class LayoutAdmin(admin.ModelAdmin):
+    list_display = [
+        '__str__',
+        'background',
+        'font',
+        'font_size',
+    ]
+    list_filter = [
+        'kind',
+        'event',
+    ]
+    list_select_related = [
+        'event',
+    ]
+    fieldsets = (
+        (None, {
+            'fields': (
+                ('event', 'kind'),
+                ('background',),
+                ('font', 'font_size'),
+            ),
+            'classes': ('wide',),
+        }),
+        ('Text Placement', {
+            'fields': (
+                ('name_x', 'name_y', 'name_width'),
+                ('college_x', 'college_y', 'college_width'),
+                ('event_x', 'event_y', 'event_width'),
+            ),
+            'classes': ('wide',),
+            'description': 'Positions are measured in inches from the bottom left corner of the page.',
+        }),
+    )
+
+
+@admin.register(PrintRun)
+class PrintRunAdmin(admin.ModelAdmin):
+    list_display = [
+        '__str__',
+        'reprint',
+        'user',
+        'created',
+        'finished',
+        'job_link',
+    ]
+    list_filter = [
+        'kind',
+        'event',
+    ]
+    list_select_related = [
+        'event',
+        'user',
+        'job',
+    ]
+    actions = [
+        'resume',
+    ]
+    readonly_fields = [
+        'event',
+        'kind',
+        'teams',
+        'reprint',
+        'user',
+        'job_link',
+        'created',
+        'finished',
+    ]
+    fields = readonly_fields
+
+    def has_add_permission(self, request):
+        return False
+
+    def job_link(self, run):
+        if run.job is None:
+            return '-'
+        return format_html(
+            '<a href="{}">{}</a>',
+            reverse('admin:jobs_job_change', args=[run.job.pk]),
+            run.job.get_status_display(),
+        )
+    job_link.short_description = 'Job'
+
+    def resume(self, request, queryset):
+        runs = [run for run in queryset.select_related('job') if run.stopped()]
+        for run in runs:
+            if run.job is not None and run.job.status == 'running':
+                # Its worker died; keep it from being counted as running
+                Job.objects.filter(pk=run.job.pk, status='running').update(
+                    status='failed',
+                    error='The worker stopped reporting progress, the run was resumed',
+                    finished=timezone.now(),
+                )
+            enqueue_run(run, request.user)
+        self.message_user(request, '{} print runs queued to resume'.format(len(runs)))
+        skipped = queryset.count() - len(runs)
+        if skipped:
+            self.message_user(request, '{} print runs are finished or still being printed, and were left alone'.format(
+                skipped,
+            ), messages.WARNING)
+    resume.short_description = 'Resume selected print runs that stopped'
+
+
+@admin.register(Issue)
+class IssueAdmin(admin.ModelAdmin):
+    list_display = [
+        '__str__',
+        'team',
+        'issued',
+        'digest',
+    ]
+    list_filter = [
+        'kind',
+        'event',
+    ]
+    list_select_related = [
+        'participant',
+        'team',
+    ]
+    search_fields = [
+        'participant__first_name',
+        'participant__last_name',
+        'participant__email',
+    ]
+    raw_id_fields = [
+        'participant',
+        'team',
+        'run',
+    ]
+    readonly_fields = [
+        'digest',
+        'issued',
+    ]
@@ -0,0 +1,50 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from certificate.render import certificate_rows, get_layout, render_pdf, render_zip
+from certificate.utils import KIND_CHOICES
+from team.events import get_event
+from team.models import Team
+
+
+class Command(BaseCommand):
+    help = 'Render certificates for every team of an event into one PDF or a ZIP of per-team PDFs'
+
+    def add_arguments(self, parser):
+        parser.add_argument('event', help='Event code, e.g. PA, FT or ST')
+        parser.add_argument('output', help='File to write the PDF or ZIP to')
+        parser.add_argument('--kind',
+            choices=[kind for kind, label in KIND_CHOICES],
+            default='participation',
+        )
+        parser.add_argument('--zip', action='store_true', dest='archive',
+            help='Write a ZIP of one PDF per team instead of a single PDF',
+        )
+        parser.add_argument('--processes', type=int, default=None,
+            help='Worker processes used for --zip (defaults to the CPU count)',
+        )
+        parser.add_argument('--verified', action='store_true',
+            help='Only include verified teams',
+        )
+
+    def handle(self, *args, **options):
+        event = options['event'].upper()
+        if get_event(event) is None:
+            raise CommandError('Unknown event "{}"'.format(options['event']))
+
+        queryset = Team.objects.filter(event=event).order_by('pk')
+        if options['verified']:
+            queryset = queryset.filter(verification=True)
+        layout = get_layout(event, options['kind'])
+        rows = certificate_rows(queryset)
+
+        with open(options['output'], 'wb') as fileobj:
+            if options['archive']:
+                render_zip(fileobj, layout, rows, options['processes'])
+            else:
+                render_pdf(fileobj, layout, rows)
+
+        self.stdout.write('Wrote {} certificates for {} teams to {}'.format(
+            sum(len(members) for filename, title, members in rows),
+            len(rows),
+            options['output'],
+        ))
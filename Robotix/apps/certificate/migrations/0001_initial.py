@@ -0,0 +1,40 @@
+# -*- coding: utf-8 -*-
+# Generated by Django 1.10.5 on 2026-10-18 16:51
+from __future__ import unicode_literals
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Layout',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('event', models.CharField(blank=True, choices=[('PA', 'PolesApart'), ('FT', 'Fortress'), ('ST', 'Stax')], help_text='Leave blank to use this layout for every event without one of its own', max_length=2)),
+                ('kind', models.CharField(choices=[('participation', 'Participation'), ('appreciation', 'Appreciation')], max_length=20)),
+                ('background', models.FileField(blank=True, help_text='Certificate artwork as a PDF or an image. Leave blank for pre-printed stock', upload_to='certificates/backgrounds')),
+                ('font', models.CharField(default='Helvetica-Oblique', max_length=50)),
+                ('font_size', models.FloatField(default=16)),
+                ('name_x', models.FloatField(verbose_name='Name X (inches)')),
+                ('name_y', models.FloatField(verbose_name='Name Y (inches)')),
+                ('name_width', models.FloatField(default=4, help_text='Longer names are squeezed to fit', verbose_name='Name width (inches)')),
+                ('college_x', models.FloatField(verbose_name='College X (inches)')),
+                ('college_y', models.FloatField(verbose_name='College Y (inches)')),
+                ('college_width', models.FloatField(default=6, help_text='Longer college names are squeezed to fit', verbose_name='College width (inches)')),
+                ('event_x', models.FloatField(verbose_name='Event X (inches)')),
+                ('event_y', models.FloatField(verbose_name='Event Y (inches)')),
+                ('event_width', models.FloatField(default=3, verbose_name='Event width (inches)')),
+            ],
+        ),
+        migrations.AlterUniqueTogether(
+            name='layout',
+            unique_together=set([('event', 'kind')]),
+        ),
+    ]
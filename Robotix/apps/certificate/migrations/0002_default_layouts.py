@@ -0,0 +1,35 @@
+# -*- coding: utf-8 -*-
+from __future__ import unicode_literals
+
+from django.db import migrations
+
+
+DEFAULT_LAYOUTS = {
+    'participation': {
+        'name_x': 3.7, 'name_y': 5.38,
+        'college_x': 1.5, 'college_y': 4.94,
+        'event_x': 3, 'event_y': 4.54,
+    },
+    'appreciation': {
+        'name_x': 3.5, 'name_y': 5,
+        'college_x': 1.5, 'college_y': 4.5,
+        'event_x': 4, 'event_y': 4.5,
+    },
+}
+
+
+def create_default_layouts(apps, schema_editor):
+    Layout = apps.get_model('certificate', 'Layout')
+    for kind, layout in DEFAULT_LAYOUTS.items():
+        Layout.objects.get_or_create(event='', kind=kind, defaults=layout)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('certificate', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_default_layouts, migrations.RunPython.noop),
+    ]
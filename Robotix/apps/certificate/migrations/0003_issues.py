@@ -0,0 +1,63 @@
+# -*- coding: utf-8 -*-
+# Generated by Django 1.10.5 on 2026-10-18 17:42
+from __future__ import unicode_literals
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('jobs', '0001_initial'),
+        ('participant', '0005_duplicatecandidate'),
+        ('team', '0008_team_summary'),
+        ('certificate', '0002_default_layouts'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Issue',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('event', models.CharField(choices=[('PA', 'PolesApart'), ('FT', 'Fortress'), ('ST', 'Stax')], max_length=2)),
+                ('kind', models.CharField(choices=[('participation', 'Participation'), ('appreciation', 'Appreciation')], max_length=20)),
+                ('digest', models.CharField(help_text="SHA-256 of the certificate's text and layout when it was issued", max_length=64)),
+                ('issued', models.DateTimeField(auto_now_add=True)),
+                ('participant', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='certificates', to='participant.Participant')),
+            ],
+        ),
+        migrations.CreateModel(
+            name='PrintRun',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('event', models.CharField(choices=[('PA', 'PolesApart'), ('FT', 'Fortress'), ('ST', 'Stax')], max_length=2)),
+                ('kind', models.CharField(choices=[('participation', 'Participation'), ('appreciation', 'Appreciation')], max_length=20)),
+                ('teams', models.TextField(default='[]')),
+                ('reprint', models.BooleanField(default=False, help_text='Also print the members who were issued this certificate before')),
+                ('created', models.DateTimeField(auto_now_add=True)),
+                ('finished', models.DateTimeField(blank=True, null=True)),
+                ('job', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='+', to='jobs.Job')),
+                ('user', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'ordering': ('-created',),
+            },
+        ),
+        migrations.AddField(
+            model_name='issue',
+            name='run',
+            field=models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='issues', to='certificate.PrintRun'),
+        ),
+        migrations.AddField(
+            model_name='issue',
+            name='team',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='team.Team'),
+        ),
+        migrations.AlterUniqueTogether(
+            name='issue',
+            unique_together=set([('participant', 'event', 'kind')]),
+        ),
+    ]
@@ -0,0 +1,30 @@
+# -*- coding: utf-8 -*-
+# Generated by Django 1.10.5 on 2026-10-18 17:57
+from __future__ import unicode_literals
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('certificate', '0003_issues'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='issue',
+            name='event',
+            field=models.CharField(max_length=2),
+        ),
+        migrations.AlterField(
+            model_name='layout',
+            name='event',
+            field=models.CharField(blank=True, max_length=2, help_text='Leave blank to use this layout for every event without one of its own'),
+        ),
+        migrations.AlterField(
+            model_name='printrun',
+            name='event',
+            field=models.CharField(max_length=2),
+        ),
+    ]
@@ -0,0 +1,49 @@
+# -*- coding: utf-8 -*-
+# Generated by Django 1.10.5 on 2026-10-18 18:19
+from __future__ import unicode_literals
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+def blank_to_null(apps, schema_editor):
+    """Layouts for every event had a blank event; now they have none."""
+    Layout = apps.get_model('certificate', 'Layout')
+    Layout.objects.filter(event='').update(event=None)
+
+
+def null_to_blank(apps, schema_editor):
+    Layout = apps.get_model('certificate', 'Layout')
+    Layout.objects.filter(event__isnull=True).update(event='')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('team', '0012_event_foreign_keys'),
+        ('certificate', '0004_event_registry'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='layout',
+            name='event',
+            field=models.CharField(blank=True, help_text='Leave blank to use this layout for every event without one of its own', max_length=2, null=True),
+        ),
+        migrations.RunPython(blank_to_null, null_to_blank),
+        migrations.AlterField(
+            model_name='issue',
+            name='event',
+            field=models.ForeignKey(db_column='event', on_delete=django.db.models.deletion.PROTECT, related_name='+', to='team.Event'),
+        ),
+        migrations.AlterField(
+            model_name='layout',
+            name='event',
+            field=models.ForeignKey(blank=True, db_column='event', help_text='Leave blank to use this layout for every event without one of its own', null=True, on_delete=django.db.models.deletion.PROTECT, related_name='+', to='team.Event'),
+        ),
+        migrations.AlterField(
+            model_name='printrun',
+            name='event',
+            field=models.ForeignKey(db_column='event', on_delete=django.db.models.deletion.PROTECT, related_name='+', to='team.Event'),
+        ),
+    ]
@@ -0,0 +1,165 @@
+import json
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import models
+from django.utils import timezone
+
+from jobs.models import Job
+from participant.models import Participant
+from team.models import Event, Team
+
+from .utils import *
+
+
+class Layout(models.Model):
+    event       = models.ForeignKey(Event,
+        to_field='code',
+        on_delete=models.PROTECT,
+        db_column='event',
+        related_name='+',
+        null=True,
+        blank=True,
+        help_text='Leave blank to use this layout for every event without one of its own'
+    )
+    kind        = models.CharField(max_length=20, choices=KIND_CHOICES)
+    background  = models.FileField(
+        upload_to='certificates/backgrounds',
+        blank=True,
+        help_text='Certificate artwork as a PDF or an image. Leave blank for pre-printed stock'
+    )
+    font        = models.CharField(max_length=50, default='Helvetica-Oblique')
+    font_size   = models.FloatField(default=16)
+
+    name_x      = models.FloatField(verbose_name='Name X (inches)')
+    name_y      = models.FloatField(verbose_name='Name Y (inches)')
+    name_width  = models.FloatField(
+        default=4,
+        verbose_name='Name width (inches)',
+        help_text='Longer names are squeezed to fit'
+    )
+    college_x   = models.FloatField(verbose_name='College X (inches)')
+    college_y   = models.FloatField(verbose_name='College Y (inches)')
+    college_width = models.FloatField(
+        default=6,
+        verbose_name='College width (inches)',
+        help_text='Longer college names are squeezed to fit'
+    )
+    event_x     = models.FloatField(verbose_name='Event X (inches)')
+    event_y     = models.FloatField(verbose_name='Event Y (inches)')
+    event_width = models.FloatField(default=3, verbose_name='Event width (inches)')
+
+    class Meta:
+        unique_together = ('event', 'kind')
+
+    @classmethod
+    def resolve(cls, event, kind):
+        """
+        The layout for ``kind`` certificates of ``event``, falling back to
+        the event-less layout and then to the built-in defaults.
+        """
+        layouts = {
+            layout.event_id: layout
+            for layout in cls.objects.filter(models.Q(event=event) | models.Q(event__isnull=True), kind=kind)
+        }
+        return layouts.get(event) or layouts.get(None) or cls(kind=kind, **DEFAULT_LAYOUTS[kind])
+
+    def spec(self):
+        """
+        A picklable description of this layout that render workers can
+        use without touching the database.
+        """
+        return {
+            'background': self.background.path if self.background else None,
+            'font': self.font,
+            'font_size': self.font_size,
+            'fields': {
+                'name': (self.name_x, self.name_y, self.name_width),
+                'college': (self.college_x, self.college_y, self.college_width),
+                'event': (self.event_x, self.event_y, self.event_width),
+            },
+        }
+
+    def __str__(self):
+        return '{} ({})'.format(self.get_kind_display(), self.event.name if self.event_id else 'All events')
+
+
+class PrintRun(models.Model):
+    event       = models.ForeignKey(Event,
+        to_field='code',
+        on_delete=models.PROTECT,
+        db_column='event',
+        related_name='+'
+    )
+    kind        = models.CharField(max_length=20, choices=KIND_CHOICES)
+    teams       = models.TextField(default='[]')
+    reprint     = models.BooleanField(
+        default=False,
+        help_text='Also print the members who were issued this certificate before'
+    )
+    user        = models.ForeignKey(settings.AUTH_USER_MODEL,
+        null=True,
+        blank=True,
+        on_delete=models.SET_NULL
+    )
+    job         = models.ForeignKey('jobs.Job',
+        null=True,
+        blank=True,
+        on_delete=models.SET_NULL,
+        related_name='+'
+    )
+    created     = models.DateTimeField(auto_now_add=True)
+    finished    = models.DateTimeField(null=True, blank=True)
+
+    def get_teams(self):
+        return json.loads(self.teams)
+
+    def layout(self):
+        return Layout.resolve(self.event_id, self.kind).spec()
+
+    def stopped(self):
+        """Whether the run is unfinished and nothing is working on it any more."""
+        if self.finished is not None:
+            return False
+        if self.job is None:
+            # Printed within a request, which has long ended if it is still unfinished
+            return self.created < timezone.now() - timedelta(seconds=Job.stall_timeout)
+        return self.job.status == 'failed' or self.job.stalled
+
+    def __str__(self):
+        return '{} certificates for {} {} teams'.format(
+            self.get_kind_display(), len(self.get_teams()), self.event.name,
+        )
+
+    class Meta:
+        ordering = ('-created',)
+
+
+class Issue(models.Model):
+    """One certificate given to one participant."""
+    participant = models.ForeignKey(Participant, related_name='certificates')
+    team        = models.ForeignKey(Team, related_name='+')
+    event       = models.ForeignKey(Event,
+        to_field='code',
+        on_delete=models.PROTECT,
+        db_column='event',
+        related_name='+'
+    )
+    kind        = models.CharField(max_length=20, choices=KIND_CHOICES)
+    digest      = models.CharField(
+        max_length=64,
+        help_text='SHA-256 of the certificate\'s text and layout when it was issued'
+    )
+    run         = models.ForeignKey(PrintRun,
+        null=True,
+        blank=True,
+        on_delete=models.SET_NULL,
+        related_name='issues'
+    )
+    issued      = models.DateTimeField(auto_now_add=True)
+
+    def __str__(self):
+        return '{} certificate of {}'.format(self.get_kind_display(), self.participant)
+
+    class Meta:
+        unique_together = ('participant', 'event', 'kind')
@@ -0,0 +1,214 @@
+import hashlib
+import io
+import json
+import multiprocessing
+import os
+import tempfile
+import zipfile
+
+from django.conf import settings
+from django.db.models import Prefetch
+
+from participant.models import Participant
+from team.events import event_name
+
+from .models import Layout
+
+
+# Below this many teams per process a pool costs more than it saves
+MIN_TEAMS_PER_PROCESS = 8
+
+# Text is squeezed horizontally to fit its box, but never below this
+MIN_HORIZ_SCALE = 60
+
+# Rendered pages, one PDF per certificate named by its digest
+PAGE_CACHE = os.path.join('certificates', 'pages')
+
+# Parsed background artwork, kept for the life of the process so that a
+# pool worker reads each file once however many PDFs it renders
+_backgrounds = {}
+
+
+def certificate_rows(queryset):
+    """
+    Flatten a team queryset into picklable
+    ``(filename, event, [(name, college), ...])`` rows.
+
+    Members and their colleges are prefetched, so this runs two queries
+    however many teams are selected.
+    """
+    queryset = queryset.prefetch_related(Prefetch(
+        'participant',
+        queryset=Participant.objects.select_related('college'),
+    ))
+    return [
+        (
+            'Certificate-{}.pdf'.format(team),
+            event_name(team.event_id),
+            [(p.name, p.college.name) for p in team.participant.all()],
+        )
+        for team in queryset
+    ]
+
+
+def get_layout(event, kind):
+    return Layout.resolve(event, kind).spec()
+
+
+def _load_background(path):
+    key = (path, os.path.getmtime(path))
+    if key not in _backgrounds:
+        if path.lower().endswith('.pdf'):
+            from pdfrw import PdfReader
+            from pdfrw.buildxobj import pagexobj
+            _backgrounds[key] = pagexobj(PdfReader(path).pages[0])
+        else:
+            from reportlab.lib.utils import ImageReader
+            _backgrounds[key] = ImageReader(path)
+    return _backgrounds[key]
+
+
+def begin_document(p, layout):
+    """
+    Embed the layout's background into the document once, as a form
+    XObject that every page then draws by reference.
+    """
+    if not layout['background']:
+        return
+    width, height = p._pagesize
+    background = _load_background(layout['background'])
+    p.beginForm('background')
+    if layout['background'].lower().endswith('.pdf'):
+        from pdfrw.toreportlab import makerl
+        page_width, page_height = background.BBox[2], background.BBox[3]
+        p.scale(width / float(page_width), height / float(page_height))
+        p.doForm(makerl(p, background))
+    else:
+        p.drawImage(background, 0, 0, width, height)
+    p.endForm()
+
+
+def _fit(text_obj, text, layout, width):
+    from reportlab.lib.units import inch
+    from reportlab.pdfbase.pdfmetrics import stringWidth
+    text_width = stringWidth(text, layout['font'], layout['font_size'])
+    if text_width > width*inch:
+        text_obj.setHorizScale(max(MIN_HORIZ_SCALE, 100 * width*inch / text_width))
+    else:
+        text_obj.setHorizScale(100)
+
+
+def draw_certificates(p, layout, event, members):
+    from reportlab.lib.units import inch
+    fields = layout['fields']
+    for name, college in members:
+        if layout['background']:
+            p.doForm('background')
+        text_obj = p.beginText()
+        text_obj.setFont(layout['font'], layout['font_size'])
+        for text, (x, y, width) in (
+            (name, fields['name']),
+            (college, fields['college']),
+            (event, fields['event']),
+        ):
+            text_obj.setTextOrigin(x*inch, y*inch)
+            _fit(text_obj, text, layout, width)
+            text_obj.textLine(text)
+        p.drawText(text_obj)
+        p.showPage()
+
+
+def render_pdf(fileobj, layout, rows, progress=None):
+    from reportlab.pdfgen import canvas
+    p = canvas.Canvas(fileobj)
+    begin_document(p, layout)
+    for filename, event, members in rows:
+        draw_certificates(p, layout, event, members)
+        if progress is not None:
+            progress()
+    p.save()
+
+
+def page_digest(layout, event, name, college):
+    """SHA-256 of everything drawn on a certificate page apart from the background."""
+    content = [layout['font'], layout['font_size'], sorted(layout['fields'].items()), event, name, college]
+    return hashlib.sha256(json.dumps(content).encode('utf-8')).hexdigest()
+
+
+def cached_page(layout, event, name, college):
+    """
+    ``(digest, path)`` of a certificate's page under MEDIA_ROOT, rendered
+    only when no page with the same digest is there yet. Pages hold the
+    text alone; ``render_pages`` draws the background behind them.
+    """
+    digest = page_digest(layout, event, name, college)
+    directory = os.path.join(settings.MEDIA_ROOT, PAGE_CACHE, digest[:2])
+    path = os.path.join(directory, digest + '.pdf')
+    if not os.path.exists(path):
+        from reportlab.pdfgen import canvas
+        os.makedirs(directory, exist_ok=True)
+        # Write under a temporary name so a crash never leaves half a page behind
+        buf = io.BytesIO()
+        p = canvas.Canvas(buf)
+        draw_certificates(p, dict(layout, background=None), event, [(name, college)])
+        p.save()
+        fd, partial = tempfile.mkstemp(dir=directory, suffix='.partial')
+        with os.fdopen(fd, 'wb') as fileobj:
+            fileobj.write(buf.getvalue())
+        os.replace(partial, path)
+    return digest, path
+
+
+def render_pages(fileobj, layout, paths, progress=None):
+    """Put cached pages together into one PDF, over the layout's background."""
+    from pdfrw import PdfReader
+    from pdfrw.buildxobj import pagexobj
+    from pdfrw.toreportlab import makerl
+    from reportlab.pdfgen import canvas
+    p = canvas.Canvas(fileobj)
+    begin_document(p, layout)
+    for path in paths:
+        if layout['background']:
+            p.doForm('background')
+        p.doForm(makerl(p, pagexobj(PdfReader(path).pages[0])))
+        p.showPage()
+        if progress is not None:
+            progress()
+    p.save()
+
+
+def _render_team(job):
+    layout, row = job
+    buf = io.BytesIO()
+    render_pdf(buf, layout, [row])
+    return row[0], buf.getvalue()
+
+
+def _get_pool(processes, jobs):
+    if processes is None:
+        processes = getattr(settings, 'CERTIFICATE_PROCESSES', None) or multiprocessing.cpu_count()
+    processes = min(processes, jobs // MIN_TEAMS_PER_PROCESS)
+    if processes < 2:
+        return None
+    return multiprocessing.Pool(processes)
+
+
+def render_zip(fileobj, layout, rows, processes=None):
+    """
+    Write one PDF per team into a ZIP archive, rendering the teams
+    across a process pool when there are enough of them.
+    """
+    jobs = [(layout, row) for row in rows]
+    pool = _get_pool(processes, len(jobs))
+    if pool is None:
+        results = map(_render_team, jobs)
+    else:
+        results = pool.imap_unordered(_render_team, jobs, chunksize=MIN_TEAMS_PER_PROCESS)
+    try:
+        with zipfile.ZipFile(fileobj, 'w', zipfile.ZIP_DEFLATED) as archive:
+            for filename, data in results:
+                archive.writestr(filename, data)
+    finally:
+        if pool is not None:
+            pool.close()
+            pool.join()
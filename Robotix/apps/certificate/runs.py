@@ -0,0 +1,125 @@
+"""
+Certificate print runs that record what they issue.
+
+A PrintRun covers the members of some teams of one event. ``issue()``
+works through the teams a chunk at a time: each member's page is taken
+from the page cache or rendered into it and an Issue is recorded for
+them, a chunk's Issues committed together. Members issued before are
+skipped, so a run that stopped part way is simply run again and picks up
+after its last chunk. Its PDF is then put together from the cached pages
+without rendering anything. Printing is not handing out: a team's
+"Given certificate" flag is still only set from the admin.
+"""
+import json
+import tempfile
+
+from django.http import FileResponse
+from django.utils import timezone
+
+from jobs.registry import enqueue
+from team.events import event_name
+from team.models import Team
+
+from .models import Issue, PrintRun
+from .render import cached_page, render_pages
+
+
+# Teams whose certificates are committed together
+CHUNK_TEAMS = 25
+
+
+def members(team_pks):
+    """Memberships of these teams with their participants and colleges, in team order."""
+    return Team.participant.through.objects.filter(team_id__in=team_pks).select_related(
+        'participant__college',
+    ).order_by('team_id', 'participant_id')
+
+
+def _page(run, layout, membership):
+    participant = membership.participant
+    return cached_page(
+        layout,
+        event_name(run.event_id),
+        participant.name,
+        participant.college.name,
+    )
+
+
+def issue(run, progress=None):
+    """Issue the certificates of ``run`` that are still missing, a chunk of teams at a time."""
+    layout = run.layout()
+    teams = run.get_teams()
+    for start in range(0, len(teams), CHUNK_TEAMS):
+        chunk = teams[start:start + CHUNK_TEAMS]
+        memberships = list(members(chunk))
+        issued = set(Issue.objects.filter(
+            event=run.event_id,
+            kind=run.kind,
+            participant_id__in=[membership.participant_id for membership in memberships],
+        ).values_list('participant_id', flat=True))
+        new = []
+        for membership in memberships:
+            if membership.participant_id in issued:
+                continue
+            digest, path = _page(run, layout, membership)
+            new.append(Issue(
+                participant_id=membership.participant_id,
+                team_id=membership.team_id,
+                event_id=run.event_id,
+                kind=run.kind,
+                digest=digest,
+                run=run,
+            ))
+        Issue.objects.bulk_create(new)
+        if progress is not None:
+            progress(len(chunk))
+    run.finished = timezone.now()
+    run.save(update_fields=['finished'])
+    return run
+
+
+def pages(run):
+    """Paths of the cached pages ``run`` prints: those it issued, or every member's on a reprint."""
+    layout = run.layout()
+    own = set(run.issues.values_list('participant_id', flat=True))
+    for membership in members(run.get_teams()).iterator():
+        if run.reprint or membership.participant_id in own:
+            yield _page(run, layout, membership)[1]
+
+
+def render_run(fileobj, run, progress=None):
+    render_pages(fileobj, run.layout(), pages(run), progress)
+
+
+def run_response(run, filename):
+    """Issue and print ``run`` within the request and stream the PDF back."""
+    issue(run)
+    fileobj = tempfile.NamedTemporaryFile()
+    render_run(fileobj, run)
+    fileobj.seek(0)
+    response = FileResponse(fileobj, content_type='application/pdf')
+    response['Content-Disposition'] = 'attachment; filename="{}.pdf"'.format(filename)
+    return response
+
+
+def start_run(event, queryset, kind, user=None, reprint=False):
+    """A new PrintRun over the teams of ``queryset``, all of them teams of ``event``."""
+    return PrintRun.objects.create(
+        event_id=event,
+        kind=kind,
+        teams=json.dumps(list(queryset.order_by('pk').values_list('pk', flat=True))),
+        reprint=reprint,
+        user=user,
+    )
+
+
+def enqueue_run(run, user=None):
+    """Issue and print ``run`` as a background job, also to resume a run that stopped."""
+    job = enqueue('certificates', str(run),
+        user=user,
+        run=run.pk,
+        filename='{}-{}'.format(run.get_kind_display(), event_name(run.event_id)),
+    )
+    run.job = job
+    run.save(update_fields=['job'])
+    return job
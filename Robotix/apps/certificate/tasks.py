@@ -0,0 +1,17 @@
+import tempfile
+
+from jobs.registry import task
+
+from .models import PrintRun
+from .runs import issue, render_run
+
+
+@task('certificates')
+def print_certificates(job, run, filename):
+    run = PrintRun.objects.get(pk=run)
+    job.start(len(run.get_teams()))
+    issue(run, progress=job.step)
+    fileobj = tempfile.NamedTemporaryFile()
+    render_run(fileobj, run)
+    fileobj.seek(0)
+    return '{}.pdf'.format(filename), fileobj
@@ -0,0 +1,38 @@
+import json
+import shutil
+import tempfile
+
+from django.test import TestCase, override_settings
+
+from miscellaneous.testing import make_teams
+from team.models import Team
+
+from .models import Issue, PrintRun
+from .runs import issue
+
+
+class IssueTests(TestCase):
+    fixtures = ['fixtures']
+
+    def setUp(self):
+        media = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, media)
+        settings = override_settings(MEDIA_ROOT=media)
+        settings.enable()
+        self.addCleanup(settings.disable)
+        self.teams = [team.pk for team in make_teams(2)]
+
+    def run_for(self, teams):
+        return issue(PrintRun.objects.create(event_id='FT', kind='participation', teams=json.dumps(teams)))
+
+    def test_printing_is_not_handing_out(self):
+        run = self.run_for(self.teams)
+        self.assertEqual(run.issues.count(), 4)
+        self.assertIsNotNone(run.finished)
+        self.assertFalse(Team.objects.filter(certificate=True).exists())
+
+    def test_members_issued_before_are_skipped(self):
+        self.run_for(self.teams[:1])
+        run = self.run_for(self.teams)
+        self.assertEqual(run.issues.count(), 2)
+        self.assertEqual(Issue.objects.count(), 4)
@@ -0,0 +1,19 @@
+KIND_CHOICES = (
+    ('participation', 'Participation'),
+    ('appreciation', 'Appreciation'),
+)
+
+# Text origins and widths in inches, measured against the printed
+# certificate stock. Used until a Layout is saved for the kind.
+DEFAULT_LAYOUTS = {
+    'participation': {
+        'name_x': 3.7, 'name_y': 5.38,
+        'college_x': 1.5, 'college_y': 4.94,
+        'event_x': 3, 'event_y': 4.54,
+    },
+    'appreciation': {
+        'name_x': 3.5, 'name_y': 5,
+        'college_x': 1.5, 'college_y': 4.5,
+        'event_x': 4, 'event_y': 4.5,
+    },
+}
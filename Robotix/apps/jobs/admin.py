@@ -0,0 +1,92 @@
+import mimetypes
+import os
+
+from django.conf.urls import url
+from django.contrib import admin
+from django.core.exceptions import PermissionDenied
+from django.core.urlresolvers import reverse
+from django.http import FileResponse, Http404
+from django.utils.cache import add_never_cache_headers
+from django.utils.html import format_html
+
+from .models import Job
+
+
+@admin.register(Job)
+class JobAdmin(admin.ModelAdmin):
+    list_display = [
+        'title',
+        'status',
+        'progress',
+        'download',
+        'user',
+        'created',
+        'finished',
+    ]
+    list_filter = [
+        'status',
+        'task',
+    ]
+    list_select_related = [
+        'user',
+    ]
+    fields = [
+        'title',
+        'status',
+        'progress',
+        'download',
+        'user',
+        'created',
+        'started',
+        'heartbeat',
+        'finished',
+        'error',
+    ]
+    readonly_fields = fields
+
+    def has_add_permission(self, request):
+        return False
+
+    def get_urls(self):
+        urls = super(JobAdmin, self).get_urls()
+        return [
+            url(r'^(.+)/download/$',
+                self.admin_site.admin_view(self.download_view),
+                name='jobs_job_download'),
+        ] + urls
+
+    def download_view(self, request, object_id):
+        # Artifacts hold participants' details: only the job's owner, or a
+        # superuser, may fetch them
+        job = self.get_queryset(request).filter(pk=object_id).first()
+        if job is None or not job.artifact:
+            raise Http404
+        if not self.has_change_permission(request, job):
+            raise PermissionDenied
+        filename = os.path.basename(job.artifact.name)
+        response = FileResponse(
+            job.artifact.storage.open(job.artifact.name, 'rb'),
+            content_type=mimetypes.guess_type(filename)[0] or 'application/octet-stream',
+        )
+        response['Content-Disposition'] = 'attachment; filename="{}"'.format(filename)
+        add_never_cache_headers(response)
+        return response
+
+    def get_queryset(self, request):
+        queryset = super(JobAdmin, self).get_queryset(request)
+        if request.user.is_superuser:
+            return queryset
+        return queryset.filter(user=request.user)
+
+    def progress(self, job):
+        return format_html(
+            '<progress value="{}" max="100"></progress> {}%{}',
+            job.percent,
+            job.percent,
+            ' ({} of {})'.format(job.done, job.total) if job.total else '',
+        )
+
+    def download(self, job):
+        if not job.artifact:
+            return '-'
+        return format_html('<a href="{}">Download</a>', reverse('admin:jobs_job_download', args=[job.pk]))
@@ -0,0 +1,40 @@
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+
+from jobs.registry import claim, expire, run
+
+
+class Command(BaseCommand):
+    help = 'Run queued background jobs, such as certificate print runs and exports'
+
+    # Seconds between deleting expired artifacts
+    expire_interval = 60*60
+
+    def add_arguments(self, parser):
+        parser.add_argument('--interval', type=float, default=2,
+            help='Seconds to wait when no job is queued',
+        )
+        parser.add_argument('--once', action='store_true',
+            help='Run every queued job and exit instead of waiting for more',
+        )
+
+    def handle(self, *args, **options):
+        expired = 0
+        while True:
+            close_old_connections()
+            if time.time() - expired >= self.expire_interval:
+                expired = time.time()
+                count = expire()
+                if count:
+                    self.stdout.write('Deleted the artifacts of {} expired jobs'.format(count))
+            job = claim()
+            if job is not None:
+                self.stdout.write('Running job {} ({})'.format(job.pk, job))
+                run(job)
+                self.stdout.write('Job {} {}'.format(job.pk, job.status))
+            elif options['once']:
+                return
+            else:
+                time.sleep(options['interval'])
@@ -0,0 +1,47 @@
+# -*- coding: utf-8 -*-
+# Generated by Django 1.10.5 on 2026-10-18 18:34
+from __future__ import unicode_literals
+
+import os
+
+from django.conf import settings
+from django.db import migrations, models
+import jobs.models
+
+
+def move_artifacts(source, destination):
+    def move(apps, schema_editor):
+        Job = apps.get_model('jobs', 'Job')
+        for name in Job.objects.exclude(artifact='').values_list('artifact', flat=True):
+            path = os.path.join(source, name)
+            if not os.path.exists(path):
+                continue
+            target = os.path.join(destination, name)
+            if not os.path.isdir(os.path.dirname(target)):
+                os.makedirs(os.path.dirname(target))
+            os.rename(path, target)
+            try:
+                os.rmdir(os.path.dirname(path))
+            except OSError:
+                pass
+    return move
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('jobs', '0002_job_heartbeat'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='job',
+            name='artifact',
+            field=models.FileField(blank=True, storage=jobs.models.ArtifactStorage(), upload_to=jobs.models.artifact_path),
+        ),
+        # Out of MEDIA_ROOT, which nginx serves to anyone
+        migrations.RunPython(
+            move_artifacts(settings.MEDIA_ROOT, settings.JOB_ARTIFACT_ROOT),
+            move_artifacts(settings.JOB_ARTIFACT_ROOT, settings.MEDIA_ROOT),
+        ),
+    ]
@@ -0,0 +1,117 @@
+import json
+import os
+import time
+import uuid
+from datetime import timedelta
+
+from django.conf import settings
+from django.core.files.storage import FileSystemStorage
+from django.db import models
+from django.utils import timezone
+from django.utils.deconstruct import deconstructible
+
+from .utils import *
+
+
+@deconstructible
+class ArtifactStorage(FileSystemStorage):
+    """Job artifacts under JOB_ARTIFACT_ROOT, which nothing serves, so they have no URL."""
+
+    @property
+    def base_location(self):
+        return settings.JOB_ARTIFACT_ROOT
+
+    @property
+    def location(self):
+        return os.path.abspath(self.base_location)
+
+    def url(self, name):
+        raise ValueError('Job artifacts are only served by the job admin')
+
+
+def artifact_path(job, filename):
+    # A directory of its own, so artifacts keep their names without clashing
+    return os.path.join('jobs', uuid.uuid4().hex, filename)
+
+
+class Job(models.Model):
+    task        = models.CharField(max_length=50)
+    params      = models.TextField(default='{}')
+    title       = models.CharField(max_length=200)
+    user        = models.ForeignKey(settings.AUTH_USER_MODEL,
+        null=True,
+        blank=True,
+        on_delete=models.SET_NULL
+    )
+    status      = models.CharField(
+        max_length=10,
+        choices=STATUS_CHOICES,
+        default='queued'
+    )
+    done        = models.PositiveIntegerField(default=0)
+    total       = models.PositiveIntegerField(default=0)
+    artifact    = models.FileField(upload_to=artifact_path, storage=ArtifactStorage(), blank=True)
+    error       = models.TextField(blank=True)
+    created     = models.DateTimeField(auto_now_add=True)
+    started     = models.DateTimeField(null=True, blank=True)
+    heartbeat   = models.DateTimeField(
+        null=True,
+        blank=True,
+        help_text='When the worker running the job last reported progress'
+    )
+    finished    = models.DateTimeField(null=True, blank=True)
+
+    # Progress is written at most this often, in seconds
+    progress_interval = 1
+    # A running job not heard from for this long, in seconds, has lost its worker
+    stall_timeout = 10*60
+    # Artifacts are deleted this long, in seconds, after their job finished
+    artifact_lifetime = 7*24*60*60
+
+    def get_params(self):
+        return json.loads(self.params)
+
+    def start(self, total):
+        self.total = total
+        self._progress_saved = time.time()
+        Job.objects.filter(pk=self.pk).update(total=total, heartbeat=timezone.now())
+
+    def step(self, count=1):
+        self.done += count
+        now = time.time()
+        if now - getattr(self, '_progress_saved', 0) >= self.progress_interval or self.done >= self.total:
+            self._progress_saved = now
+            Job.objects.filter(pk=self.pk).update(done=self.done, heartbeat=timezone.now())
+
+    @property
+    def stalled(self):
+        """Whether the job is running but its worker has stopped reporting."""
+        last = self.heartbeat or self.started or self.created
+        return self.status == 'running' and last < timezone.now() - timedelta(seconds=self.stall_timeout)
+
+    def delete_artifact(self):
+        """Delete the artifact's file and its directory."""
+        if not self.artifact:
+            return
+        storage, name = self.artifact.storage, self.artifact.name
+        storage.delete(name)
+        try:
+            os.rmdir(storage.path(os.path.dirname(name)))
+        except OSError:
+            pass
+        self.artifact = ''
+
+    @property
+    def percent(self):
+        if self.status == 'done':
+            return 100
+        return 100 * self.done // self.total if self.total else 0
+
+    def __str__(self):
+        return self.title
+
+    class Meta:
+        ordering = ('-created',)
+        index_together = [
+            ('status', 'id'),
+        ]
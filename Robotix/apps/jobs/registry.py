@@ -0,0 +1,69 @@
+"""
+The job queue.
+
+Job functions are registered by name with ``@task`` in an app's
+``tasks`` module and called by the ``run_jobs`` worker as
+``function(job, **params)``. They report progress through
+``job.start(total)`` and ``job.step()`` and hand their output back as
+``(filename, file object)``, which is kept as the job's artifact under
+JOB_ARTIFACT_ROOT until ``expire()`` deletes it, ``Job.artifact_lifetime``
+after the job finished.
+"""
+import json
+import traceback
+from datetime import timedelta
+
+from django.core.files import File
+from django.utils import timezone
+
+from .models import Job
+
+
+tasks = {}
+
+
+def task(name):
+    def register(function):
+        tasks[name] = function
+        return function
+    return register
+
+
+def enqueue(name, title, user=None, **params):
+    if name not in tasks:
+        raise KeyError('Unknown job task "{}"'.format(name))
+    return Job.objects.create(task=name, title=title, user=user, params=json.dumps(params))
+
+
+def claim():
+    """Take the oldest queued job, safely against other workers."""
+    for pk in Job.objects.filter(status='queued').order_by('pk').values_list('pk', flat=True)[:10]:
+        now = timezone.now()
+        if Job.objects.filter(pk=pk, status='queued').update(status='running', started=now, heartbeat=now):
+            return Job.objects.get(pk=pk)
+    return None
+
+
+def run(job):
+    try:
+        result = tasks[job.task](job, **job.get_params())
+        if result is not None:
+            filename, fileobj = result
+            job.artifact.save(filename, File(fileobj), save=False)
+        job.status = 'done'
+    except Exception:
+        job.status = 'failed'
+        job.error = traceback.format_exc()
+    job.finished = timezone.now()
+    job.save()
+    return job
+
+
+def expire():
+    """Delete the artifacts of jobs that finished ``Job.artifact_lifetime`` ago. Returns how many."""
+    cutoff = timezone.now() - timedelta(seconds=Job.artifact_lifetime)
+    jobs = list(Job.objects.filter(finished__lt=cutoff).exclude(artifact=''))
+    for job in jobs:
+        job.delete_artifact()
+        Job.objects.filter(pk=job.pk).update(artifact='')
+    return len(jobs)
@@ -0,0 +1,9 @@
+from django.db.models.signals import post_delete
+from django.dispatch import receiver
+
+from .models import Job
+
+
+@receiver(post_delete, sender=Job)
+def delete_artifact(sender, instance, **kwargs):
+    instance.delete_artifact()
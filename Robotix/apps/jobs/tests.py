@@ -0,0 +1,72 @@
+import os
+import shutil
+import tempfile
+from datetime import timedelta
+
+from django.contrib.auth.models import Permission, User
+from django.core.files.base import ContentFile
+from django.core.urlresolvers import reverse
+from django.test import TestCase, override_settings
+from django.utils import timezone
+
+from .models import Job
+from .registry import expire
+
+
+class ArtifactTests(TestCase):
+
+    def setUp(self):
+        root = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, root)
+        settings = override_settings(JOB_ARTIFACT_ROOT=root)
+        settings.enable()
+        self.addCleanup(settings.disable)
+
+        self.owner = self.staff('owner')
+        self.job = Job.objects.create(task='export', title='Export', user=self.owner, status='done')
+        self.job.artifact.save('teams.csv', ContentFile(b'team\nFT-1\n'))
+        self.path = self.job.artifact.path
+        self.url = reverse('admin:jobs_job_download', args=[self.job.pk])
+
+    def staff(self, username):
+        user = User.objects.create_user(username, password='secret', is_staff=True)
+        user.user_permissions.add(Permission.objects.get(codename='change_job'))
+        return user
+
+    def test_artifacts_are_not_media(self):
+        self.assertTrue(self.path.startswith(os.path.abspath(self.job.artifact.storage.location)))
+        with self.assertRaises(ValueError):
+            self.job.artifact.url
+
+    def test_owner_downloads(self):
+        self.client.force_login(self.owner)
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(b''.join(response.streaming_content), b'team\nFT-1\n')
+        self.assertEqual(response['Content-Disposition'], 'attachment; filename="teams.csv"')
+        response.close()
+
+    def test_other_staff_cannot_download(self):
+        self.client.force_login(self.staff('other'))
+        self.assertEqual(self.client.get(self.url).status_code, 404)
+        self.client.logout()
+        self.assertEqual(self.client.get(self.url).status_code, 302)
+
+    def test_superuser_downloads(self):
+        self.client.force_login(User.objects.create_superuser('admin', 'admin@example.com', 'secret'))
+        response = self.client.get(self.url)
+        self.assertEqual(response.status_code, 200)
+        response.close()
+
+    def test_expire(self):
+        Job.objects.filter(pk=self.job.pk).update(finished=timezone.now() - timedelta(seconds=Job.artifact_lifetime - 60))
+        self.assertEqual(expire(), 0)
+        Job.objects.filter(pk=self.job.pk).update(finished=timezone.now() - timedelta(seconds=Job.artifact_lifetime + 60))
+        self.assertEqual(expire(), 1)
+        self.assertFalse(os.path.exists(self.path))
+        self.assertFalse(os.path.exists(os.path.dirname(self.path)))
+        self.assertEqual(Job.objects.get().artifact, '')
+
+    def test_deleting_the_job_deletes_its_artifact(self):
+        self.job.delete()
+        self.assertFalse(os.path.exists(self.path))
@@ -0,0 +1 @@
+default_app_config = 'miscellaneous.apps.MiscellaneousConfig'
@@ -1,12 +1,18 @@
+from django.conf.urls import url
 from django.contrib import admin
+from django.http import JsonResponse
 
 from import_export.admin import ExportMixin
 
+from .filters import ReferenceListFilterFactory
+from .imports import BulkImportMixin, CollegeImport, StateImport
 from .models import *
+from .reference import ReferenceFormFieldMixin, search_colleges
 
 
 @admin.register(College)
-class CollegeAdmin(ExportMixin, admin.ModelAdmin):
+class CollegeAdmin(BulkImportMixin, ReferenceFormFieldMixin, ExportMixin, admin.ModelAdmin):
+    importer_class = CollegeImport
     list_display = [
         'name',
         'abbv',
@@ -16,14 +22,32 @@ class CollegeAdmin(ExportMixin, admin.ModelAdmin):
         'abbv',
     ]
     list_filter = [
-        'state',
+        ReferenceListFilterFactory(State, 'state'),
     ]
 
+    def get_urls(self):
+        urls = super(CollegeAdmin, self).get_urls()
+        return [
+            url(r'^lookup/$',
+                self.admin_site.admin_view(self.lookup_view),
+                name='miscellaneous_college_lookup'),
+        ] + urls
+
+    def lookup_view(self, request):
+        try:
+            page = int(request.GET.get('page') or 1)
+            page_size = int(request.GET.get('page_size') or 20)
+        except ValueError:
+            return JsonResponse({'error': True})
+        items, total = search_colleges(request.GET.get('q', ''), page, page_size)
+        return JsonResponse({'error': False, 'items': items, 'total': total})
+
 
 @admin.register(State)
-class StateAdmin(ExportMixin, admin.ModelAdmin):
+class StateAdmin(BulkImportMixin, ReferenceFormFieldMixin, ExportMixin, admin.ModelAdmin):
+    importer_class = StateImport
     list_filter = [
-        'country__name',
+        ReferenceListFilterFactory(Country, 'country'),
     ]
     list_display = [
         'name',
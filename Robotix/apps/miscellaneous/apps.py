@@ -0,0 +1,8 @@
+from django.apps import AppConfig
+
+
+class MiscellaneousConfig(AppConfig):
+    name = 'miscellaneous'
+
+    def ready(self):
+        from . import db, signals
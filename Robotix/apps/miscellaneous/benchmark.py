@@ -0,0 +1,230 @@
+"""
+Synthetic data and timing helpers for ``manage.py benchmark``.
+
+Everything here runs against the throwaway test database the command
+creates, never against the configured one.
+"""
+import io
+import math
+import random
+import time
+
+from django.contrib import admin
+from django.contrib.auth.models import User
+from django.core.urlresolvers import reverse
+from django.db import connection
+from django.test import Client
+from django.test.utils import CaptureQueriesContext
+
+from certificate.render import certificate_rows, get_layout, render_pdf
+from participant.models import Participant
+from participant.search import index
+from team.models import Event, Team, QualificationRule
+from team.summary import refresh
+
+from .models import Country, State, College
+
+
+def _create(model, objs):
+    """bulk_create that hands back the new rows, primary keys included."""
+    last = model.objects.order_by('-pk').values_list('pk', flat=True).first() or 0
+    model.objects.bulk_create(objs)
+    return list(model.objects.filter(pk__gt=last).order_by('pk'))
+
+
+# Teams taken by the bulk action and certificate cases
+BULK_TEAMS = 100
+CERTIFICATE_TEAMS = 25
+
+PERCENTILES = (50, 90, 99)
+
+
+def seed(participants, colleges=500, states=30, team_size=4, seed=0):
+    """
+    Fill the database with ``participants`` participants spread over
+    ``colleges`` colleges in ``states`` states, grouped into teams of
+    ``team_size`` that are dealt round-robin across the events.
+    """
+    rng = random.Random(seed)
+    country = Country.objects.create(name='India')
+    states = _create(State, [
+        State(name='State {}'.format(i), country=country) for i in range(states)
+    ])
+    colleges = _create(College, [
+        College(
+            name='College of Engineering and Technology {}'.format(i),
+            abbv='CET{}'.format(i),
+            state=rng.choice(states),
+        )
+        for i in range(colleges)
+    ])
+    members = _create(Participant, [
+        Participant(
+            first_name='First{}'.format(rng.randint(0, 999)),
+            last_name='Last{}'.format(rng.randint(0, 999)),
+            mobile=7000000000 + i,
+            email='user{}@example.com'.format(i),
+            year=rng.randint(1, 5),
+            college=rng.choice(colleges),
+        )
+        for i in range(participants)
+    ])
+    events = list(Event.objects.values_list('code', flat=True))
+    teams = _create(Team, [
+        Team(
+            event_id=events[i % len(events)],
+            name='Team {}'.format(i),
+            street='Street',
+            locality='Locality',
+            city='City',
+            state=rng.choice(states),
+            country=country,
+            pin=700000 + i % 1000,
+            verification=rng.random() < 0.5,
+            certificate=rng.random() < 0.2,
+            round_one=rng.randint(0, 100),
+            qualify_round_one=rng.random() < 0.3,
+        )
+        for i in range(len(members) // team_size)
+    ])
+    Membership = Team.participant.through
+    Membership.objects.bulk_create([
+        Membership(team_id=team.pk, participant_id=member.pk)
+        for i, team in enumerate(teams)
+        for member in members[i*team_size:(i + 1)*team_size]
+    ])
+    refresh(team.pk for team in teams)
+    index(Participant.objects.all())
+    for event in events:
+        QualificationRule.objects.create(event_id=event, round='round_one', top=len(teams) // 10, college_quota=2)
+
+
+def admin_client():
+    user = User.objects.create_superuser('benchmark', 'benchmark@example.com', 'benchmark')
+    client = Client()
+    client.force_login(user)
+    return client
+
+
+def page(client, url, data=None, status=200, cached=False):
+    """
+    A case fetching ``url``, or posting ``data`` to it. Pages are rendered
+    afresh unless ``cached``, as on a hard reload.
+    """
+    headers = {} if cached else {'HTTP_CACHE_CONTROL': 'no-cache'}
+
+    def case():
+        if data is None:
+            response = client.get(url, **headers)
+        else:
+            response = client.post(url, data)
+        assert response.status_code == status, '{} returned {}'.format(url, response.status_code)
+    return case
+
+
+def revalidate(client, url):
+    """A case fetching ``url`` again with the ETag of the copy the browser already has."""
+    etag = client.get(url)['ETag']
+
+    def case():
+        response = client.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == 304, '{} returned {}'.format(url, response.status_code)
+    return case
+
+
+def export(queryset):
+    """A case running the CSV export job's work for every row of ``queryset``."""
+    model_admin = admin.site._registry[queryset.model]
+
+    def case():
+        model_admin.write_csv(None, queryset.all()).close()
+    return case
+
+
+def certificates(event, queryset, kind='participation'):
+    """A case rendering the certificates of every team in ``queryset``, teams of ``event``, into one PDF."""
+    def case():
+        render_pdf(io.BytesIO(), get_layout(event, kind), certificate_rows(queryset))
+    return case
+
+
+def cases(client):
+    """The hot paths to time, as ``[(label, callable), ...]``."""
+    participants = reverse('admin:participant_participant_changelist')
+    teams = reverse('admin:team_team_changelist') + '?event=FT'
+    fortress = Team.objects.filter(event='FT')
+    college = fortress.values_list('participant__college', flat=True).first()
+    selected = list(fortress.order_by('pk').values_list('pk', flat=True)[:BULK_TEAMS])
+    team = selected[0]
+    return [
+        ('participant changelist', page(client, participants)),
+        ('participant search by name', page(client, participants + '?q=First42')),
+        ('participant search by email', page(client, participants + '?q=user4242@')),
+        ('participant search by mobile', page(client, participants + '?q=700000424')),
+        ('participant filter by team', page(client, participants + '?team=FT')),
+        ('team changelist', page(client, teams)),
+        ('team filter by college', page(client, teams + '&college={}'.format(college))),
+        ('team filter by help desk flags', page(client, teams + '&verification__exact=1&certificate__exact=0')),
+        ('team filter by qualification', page(client, teams + '&qualify_round_one__exact=1')),
+        ('team search by member name', page(client, teams + '&q=First42')),
+        ('team changelist cached', page(client, teams, cached=True)),
+        ('team changelist revalidated', revalidate(client, teams)),
+        ('team bulk verify', page(client, teams, {
+            'action': 'verify',
+            '_selected_action': selected,
+        }, status=302)),
+        ('team bulk qualify', page(client, teams, {
+            'action': 'qualify_to_round_two',
+            '_selected_action': selected,
+        }, status=302)),
+        ('team qualify whole event', page(client, teams, {
+            'action': 'qualify_to_round_two',
+            '_selected_action': selected[:1],
+            'select_across': 1,
+        }, status=302)),
+        ('team export', export(fortress)),
+        ('team certificate', page(client, reverse('admin:team_team_actions', args=[team, 'print_participation']))),
+        ('bulk certificates', certificates('FT', fortress.filter(pk__in=selected[:CERTIFICATE_TEAMS]))),
+    ]
+
+
+def measure(case, repeat):
+    """Run ``case`` ``repeat`` times; return the timings and the query count."""
+    timings = []
+    for i in range(repeat):
+        with CaptureQueriesContext(connection) as queries:
+            start = time.time()
+            case()
+            timings.append(time.time() - start)
+    return timings, len(queries)
+
+
+def summarize(timings, queries):
+    """Nearest-rank percentiles and the maximum of ``timings``, in milliseconds."""
+    timings = sorted(timings)
+    summary = {
+        'p{}'.format(p): round(timings[max(int(math.ceil(p / 100.0 * len(timings))) - 1, 0)] * 1000, 1)
+        for p in PERCENTILES
+    }
+    summary['max'] = round(timings[-1] * 1000, 1)
+    summary['queries'] = queries
+    return summary
+
+
+def regressions(results, baseline, tolerance):
+    """
+    Cases of ``results`` slower than ``baseline`` by more than
+    ``tolerance`` (a fraction) at the median or the 90th percentile, or
+    running more queries, as ``[(label, message), ...]``.
+    """
+    found = []
+    for label, result in sorted(results.items()):
+        if label not in baseline:
+            continue
+        before = baseline[label]
+        if result['queries'] > before['queries']:
+            found.append((label, 'queries {} -> {}'.format(before['queries'], result['queries'])))
+        for key in ('p50', 'p90'):
+            if result[key] > before[key] * (1 + tolerance):
+                found.append((label, '{} {:.1f} ms -> {:.1f} ms'.format(key, before[key], result[key])))
+    return found
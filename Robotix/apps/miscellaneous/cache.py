@@ -0,0 +1,170 @@
+import hashlib
+import logging
+import threading
+import time
+from collections import Counter, OrderedDict
+
+from django.core.cache import cache
+from django.core.cache.backends.locmem import LocMemCache
+
+
+logger = logging.getLogger('robotix.cache')
+
+# How long this process keeps using its own memory after the shared cache
+# failed, before trying the shared cache again
+FALLBACK_SECONDS = 30
+
+# How long a namespace with a local LRU trusts the generation it last read.
+# A bump made by another worker is seen within this long.
+LOCAL_GENERATION_SECONDS = 5
+
+_fallback = LocMemCache('robotix-fallback', {})
+_down_until = 0
+
+# (namespace, 'local' | 'shared' | 'miss') -> lookups, for miscellaneous.metrics
+stats = Counter()
+
+
+def _seed():
+    # Generations start from the clock so a counter lost to eviction or a
+    # restart can never come back to a generation that was already used
+    return int(time.time() * 1000)
+
+
+def _shared():
+    return _fallback if time.time() < _down_until else cache
+
+
+def _mark_down(error=None):
+    global _down_until
+    if time.time() >= _down_until:
+        logger.warning('Shared cache unavailable, using local memory for %ds: %s', FALLBACK_SECONDS, error)
+    _down_until = time.time() + FALLBACK_SECONDS
+
+
+def _call(method, *args):
+    """``method`` of the shared cache, falling back to local memory when it raises."""
+    try:
+        return getattr(_shared(), method)(*args)
+    except Exception as e:
+        _mark_down(e)
+        return getattr(_fallback, method)(*args)
+
+
+class LRU(object):
+    """A small thread-safe least recently used map, local to the process."""
+
+    def __init__(self, size):
+        self.size = size
+        self.items = OrderedDict()
+        self.lock = threading.Lock()
+
+    def get(self, key):
+        with self.lock:
+            if key not in self.items:
+                return None
+            self.items.move_to_end(key)
+            return self.items[key]
+
+    def set(self, key, value):
+        with self.lock:
+            self.items[key] = value
+            self.items.move_to_end(key)
+            while len(self.items) > self.size:
+                self.items.popitem(last=False)
+
+    def clear(self):
+        with self.lock:
+            self.items.clear()
+
+
+class Generation(object):
+    """
+    A namespace in the shared cache that is invalidated as a whole.
+
+    Every key embeds the namespace's current generation, a counter kept in
+    the cache itself. ``bump()`` moves all workers on to new keys at once;
+    entries of older generations are never read again and simply expire.
+
+    With ``local_size`` the namespace also keeps that many values in an
+    in-process LRU in front of the shared cache. Values from it are shared
+    between callers and must be treated as read-only.
+    """
+
+    def __init__(self, name, timeout=None, local_size=0):
+        self.name = name
+        self.timeout = timeout
+        self.counter_key = 'generation:{}'.format(name)
+        self.local = LRU(local_size) if local_size else None
+        self.local_generation = (None, 0)
+
+    def current(self):
+        generation, expires = self.local_generation
+        if self.local is not None and generation is not None and time.time() < expires:
+            return generation
+        generation = _call('get', self.counter_key)
+        if generation is None:
+            _call('add', self.counter_key, _seed(), None)
+            generation = _call('get', self.counter_key)
+        if generation is None:
+            # A memcached that is down fails silently rather than raising
+            _mark_down('{} could not be stored'.format(self.counter_key))
+            _fallback.add(self.counter_key, _seed(), None)
+            generation = _fallback.get(self.counter_key)
+        self.local_generation = (generation, time.time() + LOCAL_GENERATION_SECONDS)
+        return generation
+
+    def key(self, *parts):
+        digest = hashlib.md5(repr(parts).encode('utf-8')).hexdigest()
+        return '{}:{}:{}'.format(self.name, self.current(), digest)
+
+    def get(self, parts):
+        """The cached value for ``parts``, or None."""
+        return self._get(self.key(*parts))
+
+    def set(self, parts, value):
+        self._set(self.key(*parts), value)
+
+    def get_or_set(self, parts, default):
+        """The cached value for ``parts``, computing it with ``default()`` on a miss."""
+        key = self.key(*parts)
+        value = self._get(key)
+        if value is None:
+            value = default()
+            self._set(key, value)
+        return value
+
+    def _get(self, key):
+        if self.local is not None:
+            value = self.local.get(key)
+            if value is not None:
+                stats[self.name, 'local'] += 1
+                return value
+        value = _call('get', key)
+        if value is None:
+            stats[self.name, 'miss'] += 1
+        else:
+            stats[self.name, 'shared'] += 1
+            if self.local is not None:
+                self.local.set(key, value)
+        return value
+
+    def _set(self, key, value):
+        _call('set', key, value, self.timeout)
+        if self.local is not None and value is not None:
+            self.local.set(key, value)
+
+    def bump(self):
+        # Drop the fallback's counter too, so a bump made while the shared
+        # cache fails silently still takes effect in this process
+        _fallback.delete(self.counter_key)
+        try:
+            _shared().incr(self.counter_key)
+        except ValueError:
+            _call('set', self.counter_key, _seed(), None)
+        except Exception as e:
+            _mark_down(e)
+            _fallback.set(self.counter_key, _seed(), None)
+        self.local_generation = (None, 0)
+        if self.local is not None:
+            self.local.clear()
@@ -0,0 +1,223 @@
+"""
+A changelist that stays fast on large tables.
+
+``ScalableChangeListMixin`` swaps a ModelAdmin's changelist for one that
+
+- counts through a short-lived cache, and on a miss never counts past
+  ``COUNT_LIMIT`` rows in the request: a longer list is reported at the
+  planner's estimate on PostgreSQL, or at ``COUNT_LIMIT``, for
+  ``ESTIMATE_TIMEOUT`` seconds while a thread counts it exactly;
+- pages with a keyset cursor (``?cursor=``) instead of ``OFFSET``, when
+  the list is ordered by plain model fields ending in the primary key,
+  which is every ordering the admin builds from a single sort column;
+- never offers "show all".
+"""
+import hashlib
+import json
+import threading
+
+from django.contrib.admin.options import IncorrectLookupParameters
+from django.contrib.admin.views.main import ChangeList
+from django.core.cache import cache
+from django.core.paginator import InvalidPage, Paginator
+from django.db import connections
+from django.db.models import Q
+from django.db.models.sql.datastructures import EmptyResultSet
+from django.utils.functional import cached_property
+
+
+CURSOR_VAR = 'cursor'
+
+# Seconds a changelist count is reused for
+COUNT_TIMEOUT = 60
+
+# Most rows a request counts; past it the count is estimated
+COUNT_LIMIT = 10000
+
+# Seconds an estimate is reused for, while the exact count is running
+ESTIMATE_TIMEOUT = 10
+
+
+def estimated_count(queryset):
+    """The planner's row estimate for an unfiltered table on PostgreSQL, else None."""
+    connection = connections[queryset.db]
+    if connection.vendor != 'postgresql' or queryset.query.where:
+        return None
+    with connection.cursor() as cursor:
+        cursor.execute('SELECT reltuples FROM pg_class WHERE relname = %s', [queryset.model._meta.db_table])
+        row = cursor.fetchone()
+    # Tables that were never analysed report 0 or -1
+    return int(row[0]) if row and row[0] > 0 else None
+
+
+def _count_exactly(queryset, key):
+    try:
+        cache.set(key, queryset.count(), COUNT_TIMEOUT)
+    finally:
+        cache.delete(key + ':counting')
+        connections[queryset.db].close()
+
+
+def cached_count(queryset):
+    try:
+        sql, params = queryset.query.sql_with_params()
+    except EmptyResultSet:
+        return 0
+    key = 'changelist-count:{}'.format(hashlib.md5(repr((sql, params)).encode('utf-8')).hexdigest())
+    count = cache.get(key)
+    if count is not None:
+        return count
+    count = queryset.order_by()[:COUNT_LIMIT + 1].count()
+    if count <= COUNT_LIMIT:
+        cache.set(key, count, COUNT_TIMEOUT)
+        return count
+    count = max(estimated_count(queryset) or 0, COUNT_LIMIT)
+    cache.set(key, count, ESTIMATE_TIMEOUT)
+    if cache.add(key + ':counting', True, COUNT_TIMEOUT):
+        threading.Thread(target=_count_exactly, args=(queryset._clone(), key), daemon=True).start()
+    return count
+
+
+class CachedCountPaginator(Paginator):
+
+    @cached_property
+    def count(self):
+        return cached_count(self.object_list)
+
+
+def _after(name, descending, value, nulls_largest):
+    """Rows that come after ``value`` in a ``name`` ordering, or None if none can."""
+    if value is None:
+        # NULLs come last when the ordering runs towards their end
+        if nulls_largest != descending:
+            return None
+        return Q(**{'{}__isnull'.format(name): False})
+    after = Q(**{'{}__{}'.format(name, 'lt' if descending else 'gt'): value})
+    if nulls_largest != descending:
+        after |= Q(**{'{}__isnull'.format(name): True})
+    return after
+
+
+def seek(queryset, ordering, values, nulls_largest):
+    """
+    Filter ``queryset`` to the rows that follow ``values`` in ``ordering``,
+    a list of ``(field name, descending)`` that ends with the primary key.
+    """
+    condition = Q(pk__in=[])
+    equal = Q()
+    for (name, descending), value in zip(ordering, values):
+        after = _after(name, descending, value, nulls_largest)
+        if after is not None:
+            condition |= equal & after
+        if value is None:
+            equal &= Q(**{'{}__isnull'.format(name): True})
+        else:
+            equal &= Q(**{name: value})
+    return queryset.filter(condition)
+
+
+class ScalableChangeList(ChangeList):
+
+    def __init__(self, request, *args, **kwargs):
+        self.cursor = request.GET.get(CURSOR_VAR)
+        super(ScalableChangeList, self).__init__(request, *args, **kwargs)
+
+    def get_filters_params(self, params=None):
+        lookup_params = super(ScalableChangeList, self).get_filters_params(params)
+        lookup_params.pop(CURSOR_VAR, None)
+        return lookup_params
+
+    def get_query_string(self, new_params=None, remove=None):
+        # Any change of filters, search or ordering starts from the first page
+        return super(ScalableChangeList, self).get_query_string(new_params, list(remove or []) + [CURSOR_VAR])
+
+    def keyset_ordering(self):
+        """The ordering as ``[(field name, descending), ...]``, or None if it cannot be seeked."""
+        ordering = []
+        for field in self.queryset.query.order_by:
+            if not isinstance(field, str):
+                return None
+            name = field.lstrip('-')
+            name = self.lookup_opts.pk.name if name == 'pk' else name
+            if '__' in name or name not in {f.name for f in self.lookup_opts.concrete_fields}:
+                return None
+            ordering.append((name, field.startswith('-')))
+        if not ordering or ordering[-1][0] != self.lookup_opts.pk.name:
+            return None
+        return ordering
+
+    def _cursor_for(self, obj, direction):
+        values = [getattr(obj, self.lookup_opts.get_field(name).attname) for name, descending in self.keyset]
+        return self.get_query_string({CURSOR_VAR: json.dumps([direction] + values, separators=(',', ':'))})
+
+    def _keyset_page(self):
+        nulls_largest = connections[self.queryset.db].features.nulls_order_largest
+        direction, values = 'after', None
+        if self.cursor:
+            try:
+                cursor = json.loads(self.cursor)
+                direction, values = cursor[0], cursor[1:]
+                if direction not in ('after', 'before') or len(values) != len(self.keyset):
+                    raise ValueError
+            except (ValueError, TypeError, IndexError):
+                direction, values = 'after', None
+
+        ordering = self.keyset
+        queryset = self.queryset
+        if direction == 'before':
+            ordering = [(name, not descending) for name, descending in ordering]
+            queryset = queryset.order_by(*[('-' if descending else '') + name for name, descending in ordering])
+        if values is not None:
+            queryset = seek(queryset, ordering, values, nulls_largest)
+        rows = list(queryset[:self.list_per_page + 1])
+        more = len(rows) > self.list_per_page
+        rows = rows[:self.list_per_page]
+        if direction == 'before':
+            rows.reverse()
+
+        self.first_url = self.get_query_string() if values is not None else None
+        self.previous_url = None
+        self.next_url = None
+        if rows:
+            if values is not None and (direction == 'after' or more):
+                self.previous_url = self._cursor_for(rows[0], 'before')
+            if direction == 'before' or more:
+                self.next_url = self._cursor_for(rows[-1], 'after')
+        return rows
+
+    def get_results(self, request):
+        paginator = self.model_admin.get_paginator(request, self.queryset, self.list_per_page)
+        result_count = paginator.count
+        if self.model_admin.show_full_result_count:
+            full_result_count = cached_count(self.root_queryset)
+        else:
+            full_result_count = None
+        multi_page = result_count > self.list_per_page
+
+        self.keyset = self.keyset_ordering()
+        if not multi_page:
+            result_list = self.queryset._clone()
+        elif self.keyset is not None:
+            result_list = self._keyset_page()
+        else:
+            try:
+                result_list = paginator.page(self.page_num + 1).object_list
+            except InvalidPage:
+                raise IncorrectLookupParameters
+
+        self.result_count = result_count
+        self.show_full_result_count = self.model_admin.show_full_result_count
+        self.show_admin_actions = not self.show_full_result_count or bool(full_result_count)
+        self.full_result_count = full_result_count
+        self.result_list = result_list
+        self.can_show_all = False
+        self.multi_page = multi_page
+        self.paginator = paginator
+
+
+class ScalableChangeListMixin(object):
+    """Use ScalableChangeList for this ModelAdmin's changelist."""
+    paginator = CachedCountPaginator
+
+    def get_changelist(self, request, **kwargs):
+        return ScalableChangeList
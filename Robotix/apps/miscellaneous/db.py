@@ -0,0 +1,72 @@
+"""
+Database routing and connection tuning.
+
+With a ``replica`` alias configured, reads inside ``replica_reads()``
+(changelist pages and exports) go to it and everything else, writes
+included, stays on ``default``. Without one, the router changes nothing.
+"""
+import threading
+from contextlib import contextmanager
+
+from django.conf import settings
+from django.db.backends.signals import connection_created
+from django.dispatch import receiver
+
+
+REPLICA = 'replica'
+
+_state = threading.local()
+
+
+@contextmanager
+def replica_reads():
+    """Send the reads made inside this block to the replica, if there is one."""
+    previous = getattr(_state, 'replica', False)
+    _state.replica = True
+    try:
+        yield
+    finally:
+        _state.replica = previous
+
+
+class ReplicaRouter(object):
+
+    def db_for_read(self, model, **hints):
+        if getattr(_state, 'replica', False) and REPLICA in settings.DATABASES:
+            return REPLICA
+        return None
+
+    def db_for_write(self, model, **hints):
+        return 'default'
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # The replica holds the same rows as the primary
+        return True
+
+    def allow_migrate(self, db, app_label, **hints):
+        return db != REPLICA
+
+
+class ReplicaChangeListMixin(object):
+    """Read changelist pages from the replica. Actions posted to the changelist still read the primary."""
+
+    def changelist_view(self, request, extra_context=None):
+        if request.method != 'GET':
+            return super(ReplicaChangeListMixin, self).changelist_view(request, extra_context)
+        with replica_reads():
+            response = super(ReplicaChangeListMixin, self).changelist_view(request, extra_context)
+            # The page's queries run when it is rendered, so render it here
+            if hasattr(response, 'render'):
+                response.render()
+            return response
+
+
+@receiver(connection_created)
+def tune_sqlite(sender, connection, **kwargs):
+    """Run SQLITE_PRAGMAS on every new SQLite connection."""
+    if connection.vendor != 'sqlite':
+        return
+    cursor = connection.cursor()
+    for pragma in getattr(settings, 'SQLITE_PRAGMAS', ()):
+        cursor.execute('PRAGMA {}'.format(pragma))
+    cursor.close()
@@ -0,0 +1,54 @@
+from django.contrib import admin
+from django.core.urlresolvers import reverse
+from django.forms.utils import flatatt
+from django.utils.html import format_html
+
+from .reference import college_label, table
+
+
+class CollegeListFilter(admin.SimpleListFilter):
+    """
+    College filter rendered as jet's AJAX select. Colleges are searched
+    page by page through the cached college lookup view, so the sidebar
+    never lists the whole college table.
+    """
+    title = 'College'
+    parameter_name = 'college'
+    template = 'jet/related_field_ajax_list_filter.html'
+
+    def lookups(self, request, model_admin):
+        self.ajax_attrs = format_html('{0}', flatatt({
+            'data-ajax--url': reverse('admin:miscellaneous_college_lookup'),
+            'data-queryset--lookup': self.parameter_name,
+        }))
+        if self.value() and self.value().isdigit():
+            return [(self.value(), college_label(int(self.value())))]
+        return []
+
+    def has_output(self):
+        return True
+
+    def queryset(self, request, queryset):
+        if self.value():
+            return queryset.filter(college=self.value())
+        return queryset
+
+
+def ReferenceListFilterFactory(model, field_path):
+    """
+    Filter on a Country or State foreign key at ``field_path``, listing
+    the cached table instead of querying it for every changelist.
+    """
+    class ReferenceListFilter(admin.SimpleListFilter):
+        title = model._meta.verbose_name
+        parameter_name = field_path
+
+        def lookups(self, request, model_admin):
+            return [(pk, str(obj)) for pk, obj in table(model).items()]
+
+        def queryset(self, request, queryset):
+            if self.value():
+                return queryset.filter(**{field_path: self.value()})
+            return queryset
+
+    return ReferenceListFilter
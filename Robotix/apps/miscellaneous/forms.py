@@ -0,0 +1,10 @@
+from django import forms
+
+
+class BulkImportForm(forms.Form):
+    rows = forms.FileField(
+        help_text='CSV with a header row naming the columns below',
+    )
+    dry_run = forms.BooleanField(required=False, initial=True,
+        help_text='Only report what would be imported',
+    )
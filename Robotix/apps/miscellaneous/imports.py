@@ -0,0 +1,286 @@
+"""
+Streaming bulk import of CSV files.
+
+A file has one column per model field, named as in the admin's exports;
+foreign keys are given by the related row's name or primary key. Rows
+are read lazily, checked with the model's own validators and written
+with one ``bulk_create`` per chunk, so only the keys of the new rows
+are held for the whole file. Foreign keys resolve through a name to pk map of the
+related table built once per import.
+
+A row whose natural key (``key_fields``) is already in the database, or
+earlier in the file, is left alone. The file is read twice: first every
+row is checked, writing nothing, which is all a dry run does; then, if no
+row is invalid, the rows are written with one transaction per chunk. An
+import that fails partway keeps the chunks written before, and importing
+the same file again resumes it, as those rows are found by their key.
+"""
+import csv
+import os
+import uuid
+from itertools import islice
+
+from django.conf import settings
+from django.conf.urls import url
+from django.core.exceptions import PermissionDenied, ValidationError
+from django.core.files.storage import FileSystemStorage
+from django.core.urlresolvers import reverse
+from django.db import models, transaction
+from django.http import HttpResponseRedirect
+from django.template.response import TemplateResponse
+from django.utils.html import format_html
+
+from jobs.registry import enqueue
+
+from .forms import BulkImportForm
+from .models import College, State
+from .reference import reference
+from .responses import changed
+
+
+# Most errors and diff lines kept for the report
+MAX_REPORTED = 1000
+
+AMBIGUOUS = object()
+
+# Files waiting to be imported, each in a directory of its own
+uploads = FileSystemStorage(location=settings.UPLOAD_ROOT)
+
+
+def name_map(model):
+    """
+    ``({lowercased name: pk}, {pk, ...})`` for every ``model`` row. Names
+    shared by several rows map to AMBIGUOUS.
+    """
+    names, pks = {}, set()
+    for pk, name in model._default_manager.values_list('pk', 'name').iterator():
+        key = name.strip().lower()
+        names[key] = AMBIGUOUS if key in names else pk
+        pks.add(pk)
+    return names, pks
+
+
+class BulkImport(object):
+    model = None
+    # Fields identifying a row that is already there, by attname
+    key_fields = ()
+    chunk_size = 1000
+
+    def __init__(self):
+        self.errors = []
+        self.error_count = 0
+        self.diff = []
+        self.created = 0
+        self.existing = 0
+
+    @property
+    def fields(self):
+        return [
+            field for field in self.model._meta.concrete_fields
+            if field.editable and not field.primary_key
+        ]
+
+    def error(self, line, message):
+        self.error_count += 1
+        if len(self.errors) < MAX_REPORTED:
+            self.errors.append((line, message))
+
+    def note(self, line, action, obj):
+        if len(self.diff) < MAX_REPORTED:
+            self.diff.append((line, action, str(obj)))
+
+    def resolve(self, field, value):
+        if field.name not in self.lookups:
+            self.lookups[field.name] = name_map(field.related_model)
+        names, pks = self.lookups[field.name]
+        if value.isdigit() and int(value) in pks:
+            return int(value)
+        pk = names.get(value.lower())
+        if pk is AMBIGUOUS:
+            raise ValidationError('"{}" matches several {}, give its id instead'.format(
+                value, field.related_model._meta.verbose_name_plural,
+            ))
+        if pk is None:
+            raise ValidationError('There is no {} "{}"'.format(field.related_model._meta.verbose_name, value))
+        return pk
+
+    def build(self, row, fields):
+        """An unsaved, validated instance for one row of the file."""
+        obj = self.model()
+        errors = {}
+        relations = []
+        for field in fields:
+            value = (row[field.name] or '').strip()
+            if isinstance(field, models.ForeignKey):
+                relations.append(field.name)
+                if not value and field.null:
+                    continue
+                try:
+                    setattr(obj, field.attname, self.resolve(field, value))
+                except ValidationError as e:
+                    errors[field.name] = e.messages
+            else:
+                setattr(obj, field.attname, value if value or field.empty_strings_allowed else None)
+        try:
+            # Foreign keys are checked by resolve() instead of a query each
+            obj.full_clean(exclude=relations, validate_unique=False)
+        except ValidationError as e:
+            errors.update(e.message_dict)
+        if errors:
+            raise ValidationError(errors)
+        return obj
+
+    def rows(self, lines):
+        reader = csv.DictReader(lines)
+        columns = reader.fieldnames or []
+        fields = [field for field in self.fields if field.name in columns]
+        missing = [
+            field.name for field in self.fields
+            if field.name not in columns and not field.blank and not field.has_default()
+        ]
+        if missing:
+            self.error(1, 'Missing columns: {}'.format(', '.join(missing)))
+            return
+        for line, row in enumerate(reader, start=2):
+            try:
+                yield line, self.build(row, fields)
+            except ValidationError as e:
+                self.error(line, '; '.join(
+                    '{}: {}'.format(field, ' '.join(messages))
+                    for field, messages in sorted(e.message_dict.items())
+                ))
+
+    def chunks(self, rows):
+        rows = self.rows(rows)
+        while True:
+            chunk = list(islice(rows, self.chunk_size))
+            if not chunk:
+                return
+            yield chunk
+
+    def classify(self, chunk):
+        """The rows of ``chunk`` to create, noting each as new or already there."""
+        first = self.key_fields[0]
+        known = set(self.model._default_manager.filter(**{
+            '{}__in'.format(first): {getattr(obj, first) for line, obj in chunk},
+        }).values_list(*self.key_fields))
+        new = []
+        for line, obj in chunk:
+            key = tuple(getattr(obj, field) for field in self.key_fields)
+            if key in known or key in self.seen:
+                self.existing += 1
+                self.note(line, 'exists', obj)
+            else:
+                self.seen.add(key)
+                new.append(obj)
+                self.created += 1
+                self.note(line, 'create', obj)
+        return new
+
+    def run(self, rows, dry_run=False, progress=None):
+        """
+        Import the rows of ``rows``, a seekable CSV text file. ``progress``
+        is called with the lines checked so far, then again from zero with
+        the lines written so far.
+        """
+        self.lookups = {}
+        # Keys of the rows created, as a dry run leaves them out of the database
+        self.seen = set()
+        rows.seek(0)
+        for chunk in self.chunks(rows):
+            if dry_run:
+                self.classify(chunk)
+            if progress is not None:
+                # Lines read so far, the header aside
+                progress(chunk[-1][0] - 1)
+        if dry_run or self.error_count:
+            return self
+
+        if progress is not None:
+            progress(0)
+        rows.seek(0)
+        try:
+            for chunk in self.chunks(rows):
+                last = self.model._default_manager.order_by('-pk').values_list('pk', flat=True).first() or 0
+                with transaction.atomic():
+                    new = self.classify(chunk)
+                    self.model._default_manager.bulk_create(new)
+                    if new:
+                        self.imported(self.model._default_manager.filter(pk__gt=last))
+                if progress is not None:
+                    progress(chunk[-1][0] - 1)
+        finally:
+            if self.created:
+                # bulk_create sends no signals
+                changed(self.model)
+        return self
+
+    def imported(self, queryset):
+        """Called with the rows of each chunk as they are written, in the chunk's transaction."""
+
+
+class StateImport(BulkImport):
+    model = State
+    key_fields = ('name', 'country_id')
+
+    def imported(self, queryset):
+        reference.bump()
+
+
+class CollegeImport(BulkImport):
+    model = College
+    key_fields = ('name', 'state_id')
+
+    def imported(self, queryset):
+        reference.bump()
+
+
+class BulkImportMixin(object):
+    """
+    Adds an "Import rows" page to a ModelAdmin. The uploaded file is kept
+    under UPLOAD_ROOT, which is not served, until the ``bulk_import`` job
+    has imported it; the job's page shows its progress and its report.
+    """
+    importer_class = None
+    change_list_template = 'admin/bulk_import/change_list.html'
+
+    def get_urls(self):
+        urls = super(BulkImportMixin, self).get_urls()
+        info = self.model._meta.app_label, self.model._meta.model_name
+        return [
+            url(r'^bulk-import/$',
+                self.admin_site.admin_view(self.bulk_import_view),
+                name='%s_%s_bulk_import' % info),
+        ] + urls
+
+    def bulk_import_view(self, request):
+        if not self.has_add_permission(request):
+            raise PermissionDenied
+        form = BulkImportForm(request.POST or None, request.FILES or None)
+        if form.is_valid():
+            upload = form.cleaned_data['rows']
+            path = uploads.save(os.path.join(uuid.uuid4().hex, upload.name), upload)
+            job = enqueue('bulk_import',
+                '{} of {} from {}'.format(
+                    'Dry run' if form.cleaned_data['dry_run'] else 'Import',
+                    self.model._meta.verbose_name_plural,
+                    upload.name,
+                ),
+                user=request.user,
+                model=self.model._meta.label,
+                path=path,
+                dry_run=form.cleaned_data['dry_run'],
+            )
+            self.message_user(request, format_html(
+                'The file is being imported in the background. <a href="{}">Follow the import</a>',
+                reverse('admin:jobs_job_change', args=[job.pk]),
+            ))
+            return HttpResponseRedirect(reverse('admin:jobs_job_change', args=[job.pk]))
+        context = dict(
+            self.admin_site.each_context(request),
+            opts=self.model._meta,
+            title='Import {}'.format(self.model._meta.verbose_name_plural),
+            form=form,
+            columns=[field.name for field in self.importer_class().fields],
+        )
+        return TemplateResponse(request, 'admin/bulk_import/import.html', context)
@@ -0,0 +1,37 @@
+"""
+Indexes for the admin search paths that Django cannot declare on a model.
+
+ParticipantAdmin and TeamAdmin search the participant search index (an
+FTS5 table on SQLite, a GIN index on PostgreSQL, both created by
+``participant`` migration 0004), OR'd with ``icontains`` on ``email`` and
+``mobile`` so part of an address or number still matches. PostgreSQL
+compares those as ``UPPER(column::text) LIKE``, which only a trigram index
+serves; SQLite and MySQL cannot index a ``LIKE '%...%'`` at all. These are
+created per database vendor instead.
+"""
+
+SEARCH_INDEXES = {
+    'postgresql': [
+        ('participant_email_trgm',
+         'CREATE INDEX {name} ON participant_participant USING gin (UPPER("email"::text) gin_trgm_ops)'),
+        ('participant_mobile_trgm',
+         'CREATE INDEX {name} ON participant_participant USING gin (UPPER("mobile"::text) gin_trgm_ops)'),
+    ],
+}
+
+
+def create_search_indexes(schema_editor):
+    vendor = schema_editor.connection.vendor
+    if vendor == 'postgresql':
+        schema_editor.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+    for name, sql in SEARCH_INDEXES.get(vendor, []):
+        schema_editor.execute(sql.format(name=name))
+
+
+def drop_search_indexes(schema_editor):
+    vendor = schema_editor.connection.vendor
+    for name, sql in SEARCH_INDEXES.get(vendor, []):
+        if vendor == 'mysql':
+            schema_editor.execute('DROP INDEX {} ON participant_participant'.format(name))
+        else:
+            schema_editor.execute('DROP INDEX IF EXISTS {}'.format(name))
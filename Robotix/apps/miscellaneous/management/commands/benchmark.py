@@ -0,0 +1,124 @@
+import json
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test.utils import override_settings
+from django.utils import timezone
+
+from miscellaneous.benchmark import admin_client, cases, measure, regressions, seed, summarize
+from miscellaneous.indexes import create_search_indexes, drop_search_indexes
+from team.models import Team
+
+
+# Composite indexes backing TeamAdmin.get_list_filter, each filter within an event
+ADMIN_FILTER_INDEXES = {
+    ('event', 'verification'),
+    ('event', 'certificate'),
+    ('qualify_round_one', 'event'),
+    ('qualify_round_two', 'event'),
+}
+
+SCALE_OPTIONS = ('participants', 'colleges', 'states', 'team_size')
+
+
+class Command(BaseCommand):
+    help = 'Time the admin hot paths against a seeded test database, optionally against a baseline'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--participants', type=int, default=50000)
+        parser.add_argument('--colleges', type=int, default=500)
+        parser.add_argument('--states', type=int, default=30)
+        parser.add_argument('--team-size', type=int, default=4)
+        parser.add_argument('--repeat', type=int, default=10)
+        parser.add_argument('--case', action='append', dest='cases', default=[],
+            help='Only time the cases whose label contains this text; may be repeated',
+        )
+        parser.add_argument('--compare-indexes', action='store_true',
+            help='Also time every case with the search and filter indexes dropped',
+        )
+        parser.add_argument('--output',
+            help='Write the percentiles and query counts to this JSON file',
+        )
+        parser.add_argument('--baseline',
+            help='JSON file written by an earlier --output run to compare against',
+        )
+        parser.add_argument('--tolerance', type=float, default=25,
+            help='Percent a median or 90th percentile may grow before it counts as a regression',
+        )
+
+    def handle(self, *args, **options):
+        baseline = None
+        if options['baseline']:
+            with open(options['baseline']) as f:
+                baseline = json.load(f)
+
+        # Time the pages as production serves them, without the debug toolbar
+        # and debug templates the development settings add
+        with override_settings(DEBUG=False):
+            report = self.run(options)
+
+        if options['output']:
+            with open(options['output'], 'w') as f:
+                json.dump(report, f, indent=2, sort_keys=True)
+        if baseline is not None:
+            self.compare(report, baseline, options['tolerance'] / 100.0)
+
+    def run(self, options):
+        old_name = connection.creation.create_test_db(verbosity=0, autoclobber=True, serialize=False)
+        try:
+            seed(options['participants'], options['colleges'], options['states'], options['team_size'])
+            selected = [
+                (label, case) for label, case in cases(admin_client())
+                if not options['cases'] or any(text in label for text in options['cases'])
+            ]
+            report = {
+                'created': timezone.now().isoformat(),
+                'vendor': connection.vendor,
+                'scale': {option: options[option] for option in SCALE_OPTIONS},
+                'repeat': options['repeat'],
+            }
+            if options['compare_indexes']:
+                self.set_indexes(False)
+                report['without_indexes'] = self.report('Without indexes', selected, options['repeat'])
+                self.set_indexes(True)
+            report['results'] = self.report('With indexes', selected, options['repeat'])
+        finally:
+            connection.creation.destroy_test_db(old_name, verbosity=0)
+        return report
+
+    def set_indexes(self, enabled):
+        index_together = {tuple(fields) for fields in Team._meta.index_together}
+        without = index_together - ADMIN_FILTER_INDEXES
+        with connection.schema_editor() as schema_editor:
+            if enabled:
+                create_search_indexes(schema_editor)
+                schema_editor.alter_index_together(Team, without, index_together)
+            else:
+                drop_search_indexes(schema_editor)
+                schema_editor.alter_index_together(Team, index_together, without)
+
+    def report(self, title, selected, repeat):
+        self.stdout.write(title)
+        results = {}
+        for label, case in selected:
+            results[label] = summary = summarize(*measure(case, repeat))
+            self.stdout.write('  {:<32} p50 {:>8.1f} ms   p90 {:>8.1f} ms   p99 {:>8.1f} ms   {:>4} queries'.format(
+                label,
+                summary['p50'],
+                summary['p90'],
+                summary['p99'],
+                summary['queries'],
+            ))
+        return results
+
+    def compare(self, report, baseline, tolerance):
+        if baseline.get('scale') != report['scale'] or baseline.get('vendor') != report['vendor']:
+            self.stderr.write('The baseline was taken at {} on {}; timings may not be comparable'.format(
+                baseline.get('scale'), baseline.get('vendor'),
+            ))
+        found = regressions(report['results'], baseline.get('results', {}), tolerance)
+        if found:
+            for label, message in found:
+                self.stderr.write('  {:<32} {}'.format(label, message))
+            raise CommandError('{} regressions against {}'.format(len(found), baseline.get('created', 'the baseline')))
+        self.stdout.write(self.style.SUCCESS('No regressions against the baseline'))
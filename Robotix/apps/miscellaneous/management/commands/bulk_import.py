@@ -0,0 +1,42 @@
+from django.apps import apps
+from django.contrib import admin
+from django.core.management.base import BaseCommand, CommandError
+
+
+class Command(BaseCommand):
+    help = 'Import states, colleges or participants from a CSV, in chunks'
+
+    def add_arguments(self, parser):
+        parser.add_argument('model', help='Model label, e.g. miscellaneous.College or participant.Participant')
+        parser.add_argument('rows', help='CSV with a header row naming the model fields')
+        parser.add_argument('--dry-run', action='store_true',
+            help='Only report what would be imported',
+        )
+        parser.add_argument('--show', type=int, default=20,
+            help='Rows of the diff to print',
+        )
+
+    def handle(self, *args, **options):
+        try:
+            model = apps.get_model(options['model'])
+        except (LookupError, ValueError):
+            raise CommandError('Unknown model "{}"'.format(options['model']))
+        importer_class = getattr(admin.site._registry.get(model), 'importer_class', None)
+        if importer_class is None:
+            raise CommandError('{} has no bulk import'.format(model._meta.label))
+
+        with open(options['rows'], encoding='utf-8-sig', newline='') as lines:
+            importer = importer_class().run(lines, options['dry_run'])
+        if importer.error_count:
+            for line, error in importer.errors:
+                self.stderr.write('Line {}: {}'.format(line, error))
+            raise CommandError('Nothing imported, {} invalid rows'.format(importer.error_count))
+
+        for line, action, label in importer.diff[:options['show']]:
+            self.stdout.write('{}\t{}\t{}'.format(line, action, label))
+        self.stdout.write('{} {} new {}, {} already there'.format(
+            'Would create' if options['dry_run'] else 'Created',
+            importer.created,
+            model._meta.verbose_name_plural,
+            importer.existing,
+        ))
@@ -0,0 +1,90 @@
+import json
+import os
+import subprocess
+import sys
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+
+def memory(pid):
+    """``{field: kilobytes}`` for the Rss, Pss and private lines of a process's smaps."""
+    totals = {'Rss': 0, 'Pss': 0, 'Private_Clean': 0, 'Private_Dirty': 0}
+    with open('/proc/{}/smaps'.format(pid)) as f:
+        for line in f:
+            field, _, value = line.partition(':')
+            if field in totals:
+                totals[field] += int(value.split()[0])
+    return totals
+
+
+def children(pid):
+    found = []
+    for name in os.listdir('/proc'):
+        if not name.isdigit():
+            continue
+        try:
+            with open('/proc/{}/stat'.format(name)) as f:
+                # The command name may hold spaces; the parent pid follows it
+                ppid = int(f.read().rpartition(')')[2].split()[1])
+        except (IOError, ValueError):
+            continue
+        if ppid == pid:
+            found.append(int(name))
+    return sorted(found)
+
+
+class Command(BaseCommand):
+    help = 'Measure the import time and memory of a fresh worker, or of running gunicorn workers'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--top', type=int, default=15,
+            help='Packages to list, slowest first',
+        )
+        parser.add_argument('--master', type=int,
+            help='Report the memory of the workers of this gunicorn master instead',
+        )
+
+    def handle(self, *args, **options):
+        if options['master']:
+            self.workers(options['master'])
+        else:
+            self.profile(options['top'])
+
+    def profile(self, top):
+        env = dict(os.environ,
+            DJANGO_SETTINGS_MODULE=settings.SETTINGS_MODULE,
+            PYTHONPATH=os.pathsep.join(path for path in sys.path if path),
+        )
+        try:
+            output = subprocess.check_output([sys.executable, '-m', 'miscellaneous.startup'], env=env)
+        except subprocess.CalledProcessError as e:
+            raise CommandError('The profiled worker failed with exit status {}'.format(e.returncode))
+        report = json.loads(output.decode('utf-8'))
+
+        self.stdout.write('Startup of a fresh worker with {}'.format(settings.SETTINGS_MODULE))
+        for label, seconds, kilobytes in report['phases']:
+            self.stdout.write('  {:<24} {:>8.0f} ms {:>8.1f} MB'.format(label, seconds * 1000, kilobytes / 1024.0))
+        self.stdout.write('Packages by their own import time')
+        for package, seconds, kilobytes in report['packages'][:top]:
+            self.stdout.write('  {:<24} {:>8.0f} ms {:>8.1f} MB'.format(package, seconds * 1000, kilobytes / 1024.0))
+
+    def workers(self, master):
+        pids = children(master)
+        if not pids:
+            raise CommandError('Process {} has no workers'.format(master))
+        self.stdout.write('  {:>8} {:>10} {:>10} {:>10}'.format('pid', 'RSS MB', 'PSS MB', 'private MB'))
+        private = []
+        for pid in [master] + pids:
+            usage = memory(pid)
+            private.append(usage['Private_Clean'] + usage['Private_Dirty'])
+            self.stdout.write('  {:>8} {:>10.1f} {:>10.1f} {:>10.1f}{}'.format(
+                pid,
+                usage['Rss'] / 1024.0,
+                usage['Pss'] / 1024.0,
+                private[-1] / 1024.0,
+                '  (master)' if pid == master else '',
+            ))
+        self.stdout.write('Each further worker costs about {:.1f} MB'.format(
+            sum(private[1:]) / 1024.0 / len(pids),
+        ))
@@ -0,0 +1,90 @@
+"""
+In-process request metrics in the Prometheus text format.
+
+``MetricsMiddleware`` feeds one observation per request into the
+histograms here, labelled with the URL name of the view and, for admin
+actions, the action's name. Each gunicorn worker keeps its own numbers;
+every sample carries a ``pid`` label so a scrape of each worker can be
+summed. Lookups of the namespaces in ``miscellaneous.cache`` are counted
+by where they were answered: the worker's own LRU, the shared cache, or
+neither.
+"""
+import os
+import re
+import threading
+from collections import defaultdict
+
+from . import cache
+
+
+REQUEST_BUCKETS = (0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30)
+QUERY_BUCKETS = (1, 2, 5, 10, 25, 50, 100, 250, 500, 1000)
+
+HISTOGRAMS = (
+    ('robotix_request_seconds', 'Time spent handling the request', REQUEST_BUCKETS),
+    ('robotix_sql_seconds', 'Time spent in SQL queries', REQUEST_BUCKETS),
+    ('robotix_render_seconds', 'Time spent rendering templates', REQUEST_BUCKETS),
+    ('robotix_queries', 'SQL queries run', QUERY_BUCKETS),
+    ('robotix_duplicate_queries', 'SQL queries repeating an earlier query of the request', QUERY_BUCKETS),
+)
+
+_lock = threading.Lock()
+# (metric, view) -> [bucket counts..., sum, count]
+_histograms = defaultdict(lambda: None)
+
+
+_literals = re.compile(r"'(?:[^']|'')*'|\b\d+(?:\.\d+)?\b")
+_lists = re.compile(r'\((?:\s*\?\s*,)+\s*\?\s*\)')
+
+
+def fingerprint(sql):
+    """``sql`` with its literals replaced, so repeats of one statement compare equal."""
+    return _lists.sub('(...)', _literals.sub('?', sql))
+
+
+def observe(view, values):
+    """Record ``{metric name: value}`` for one request to ``view``."""
+    with _lock:
+        for name, help_text, buckets in HISTOGRAMS:
+            if name not in values:
+                continue
+            value = values[name]
+            histogram = _histograms[name, view]
+            if histogram is None:
+                histogram = _histograms[name, view] = [0] * (len(buckets) + 2)
+            for i, bound in enumerate(buckets):
+                if value <= bound:
+                    histogram[i] += 1
+            histogram[-2] += value
+            histogram[-1] += 1
+
+
+def _label(value):
+    return str(value).replace('\\', r'\\').replace('"', r'\"').replace('\n', r'\n')
+
+
+def exposition():
+    """All histograms in the Prometheus text exposition format."""
+    pid = os.getpid()
+    lines = []
+    with _lock:
+        snapshot = {key: list(value) for key, value in _histograms.items() if value is not None}
+    for name, help_text, buckets in HISTOGRAMS:
+        lines.append('# HELP {} {}'.format(name, help_text))
+        lines.append('# TYPE {} histogram'.format(name))
+        for (metric, view), histogram in sorted(snapshot.items()):
+            if metric != name:
+                continue
+            labels = 'view="{}",pid="{}"'.format(_label(view), pid)
+            for bound, count in zip(buckets, histogram):
+                lines.append('{}_bucket{{{},le="{}"}} {}'.format(name, labels, bound, count))
+            lines.append('{}_bucket{{{},le="+Inf"}} {}'.format(name, labels, histogram[-1]))
+            lines.append('{}_sum{{{}}} {}'.format(name, labels, round(histogram[-2], 6)))
+            lines.append('{}_count{{{}}} {}'.format(name, labels, histogram[-1]))
+    lines.append('# HELP robotix_cache_lookups_total Cache lookups by namespace and where they were answered')
+    lines.append('# TYPE robotix_cache_lookups_total counter')
+    for (namespace, result), count in sorted(cache.stats.items()):
+        lines.append('robotix_cache_lookups_total{{namespace="{}",result="{}",pid="{}"}} {}'.format(
+            _label(namespace), result, pid, count,
+        ))
+    return '\n'.join(lines) + '\n'
@@ -0,0 +1,104 @@
+import logging
+import time
+from collections import Counter
+from itertools import chain, islice
+
+from django.conf import settings
+from django.contrib import admin
+from django.db import connections
+from django.utils.deprecation import MiddlewareMixin
+
+from .metrics import fingerprint, observe
+
+
+logger = logging.getLogger('robotix.metrics')
+
+# A statement repeated this often in one request is reported as a likely N+1
+N_PLUS_ONE_THRESHOLD = getattr(settings, 'METRICS_N_PLUS_ONE_THRESHOLD', 10)
+
+
+def model_admin(match):
+    """The ModelAdmin whose admin URL ``match`` is, or None."""
+    if match.namespace != admin.site.name:
+        return None
+    for model, model_admin in admin.site._registry.items():
+        if match.url_name.startswith('{}_{}_'.format(model._meta.app_label, model._meta.model_name)):
+            return model_admin
+    return None
+
+
+def view_label(request):
+    """
+    The URL name of the view, with the admin action or object tool if any.
+    Actions and tools come from the client, so any the view's ModelAdmin
+    does not have are all labelled ``other``, keeping the labels few.
+    """
+    match = getattr(request, 'resolver_match', None)
+    if match is None:
+        return 'unresolved'
+    label = match.view_name
+    if request.method == 'POST' and request.POST.get('action'):
+        action = request.POST['action']
+        modeladmin = model_admin(match)
+        actions = modeladmin.get_actions(request) if modeladmin else {}
+        label += ':' + (action if action in actions else 'other')
+    if match.kwargs.get('tool'):
+        tool = match.kwargs['tool']
+        modeladmin = model_admin(match)
+        tools = chain(getattr(modeladmin, 'change_actions', ()), getattr(modeladmin, 'changelist_actions', ()))
+        label += ':' + (tool if tool in tools else 'other')
+    return label
+
+
+class MetricsMiddleware(MiddlewareMixin):
+    """
+    Times every request, its SQL and its template rendering, and counts
+    its queries and repeated query fingerprints, for ``metrics.exposition``.
+
+    Queries are read from the connections' ``queries_log``, which Django
+    fills whenever ``force_debug_cursor`` is on, whatever DEBUG says.
+    Only entries added during the request are read, and the flag is put
+    back as it was, so tooling that captures queries around requests (and
+    keeps the log from being cleared) sees no difference.
+    """
+
+    def process_request(self, request):
+        request._metrics_start = time.time()
+        request._metrics_render = 0
+        request._metrics_debug_cursor = {}
+        request._metrics_logged = {}
+        for connection in connections.all():
+            request._metrics_debug_cursor[connection.alias] = connection.force_debug_cursor
+            request._metrics_logged[connection.alias] = len(connection.queries_log)
+            connection.force_debug_cursor = True
+
+    def process_template_response(self, request, response):
+        started = time.time()
+
+        def rendered(response):
+            request._metrics_render += time.time() - started
+        response.add_post_render_callback(rendered)
+        return response
+
+    def process_response(self, request, response):
+        if not hasattr(request, '_metrics_start'):
+            return response
+        queries = []
+        for connection in connections.all():
+            connection.force_debug_cursor = request._metrics_debug_cursor.get(connection.alias, False)
+            logged = request._metrics_logged.get(connection.alias, 0)
+            queries.extend(islice(connection.queries_log, logged, None))
+
+        label = view_label(request)
+        repeats = Counter(fingerprint(query['sql']) for query in queries)
+        observe(label, {
+            'robotix_request_seconds': time.time() - request._metrics_start,
+            'robotix_sql_seconds': sum(float(query['time']) for query in queries),
+            'robotix_render_seconds': request._metrics_render,
+            'robotix_queries': len(queries),
+            'robotix_duplicate_queries': sum(count - 1 for count in repeats.values()),
+        })
+        for sql, count in repeats.items():
+            if count >= N_PLUS_ONE_THRESHOLD:
+                logger.warning('Possible N+1 in %s: %d runs of %s', label, count, sql[:500])
+        return response
@@ -0,0 +1,42 @@
+import math
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+
+
+def client_ip(request):
+    address = request.META.get('REMOTE_ADDR', '')
+    # Only a trusted proxy's word on the client counts
+    if address in settings.TRUSTED_PROXY:
+        return request.META.get('HTTP_X_REAL_IP') or address or None
+    return address or None
+
+
+class TokenBucket(object):
+    """
+    Token bucket rate limit kept in the shared cache, so every worker
+    process draws from the same bucket for a client.
+
+    Each client starts with ``capacity`` tokens and earns ``rate`` tokens a
+    second back up to that. The read-modify-write is not atomic, so under
+    heavy concurrency a client may get a request or two past the limit.
+    """
+
+    def __init__(self, name, rate, capacity):
+        self.name = name
+        self.rate = float(rate)
+        self.capacity = capacity
+        self.timeout = int(math.ceil(capacity / self.rate)) + 1
+
+    def take(self, client):
+        """Spend a token of ``client``; return 0, or seconds to wait if none is left."""
+        key = 'ratelimit:{}:{}'.format(self.name, client)
+        now = time.time()
+        tokens, stamp = cache.get(key) or (self.capacity, now)
+        tokens = min(self.capacity, tokens + (now - stamp) * self.rate)
+        if tokens < 1:
+            cache.set(key, (tokens, now), self.timeout)
+            return int(math.ceil((1 - tokens) / self.rate))
+        cache.set(key, (tokens - 1, now), self.timeout)
+        return 0
@@ -0,0 +1,104 @@
+"""
+Cached Country, State and College rows for rendering foreign keys.
+
+Rows live under the ``reference`` generation, in the shared cache and in
+an LRU in every worker, and ``miscellaneous.signals`` bumps it whenever
+one of them is saved or deleted. Country and State are small enough to be
+cached as whole tables; colleges are cached one row at a time, and so are
+the pages of the admin's college typeahead.
+"""
+from collections import OrderedDict
+
+from django import forms
+from django.db.models import Q
+from django.forms.models import ModelChoiceIterator
+
+from .cache import Generation
+from .models import College, Country, State
+
+
+reference = Generation('reference', timeout=24*60*60, local_size=5000)
+
+# Models small enough to offer every row as a choice or filter
+TABLES = (Country, State)
+
+# Most colleges the typeahead asks for at once
+MAX_PAGE_SIZE = 100
+
+
+def table(model):
+    """``{pk: instance}`` for every row of ``model``, ordered by name."""
+    def load():
+        return OrderedDict((obj.pk, obj) for obj in model.objects.order_by('name', 'pk'))
+    return reference.get_or_set((model._meta.label, 'table'), load)
+
+
+def get(model, pk):
+    """The ``model`` row with this pk, or None."""
+    if model in TABLES:
+        return table(model).get(pk)
+    return reference.get_or_set((model._meta.label, pk), lambda: model.objects.filter(pk=pk).first())
+
+
+def _college_label(college):
+    state = table(State).get(college.state_id)
+    return '{} ({})'.format(college.name, state.name if state else '')
+
+
+def college_label(pk):
+    college = get(College, pk)
+    return _college_label(college) if college else ''
+
+
+def search_colleges(term, page=1, page_size=MAX_PAGE_SIZE):
+    """
+    One page of colleges whose name or abbreviation contains ``term``,
+    as ``([{'id': pk, 'text': label}, ...], total)``.
+    """
+    term = term.strip()
+    page = max(page, 1)
+    page_size = min(max(page_size, 1), MAX_PAGE_SIZE)
+
+    def load():
+        queryset = College.objects.order_by('name')
+        if term:
+            queryset = queryset.filter(Q(name__icontains=term) | Q(abbv__icontains=term))
+        offset = (page - 1) * page_size
+        items = [
+            {'id': college.pk, 'text': _college_label(college)}
+            for college in queryset[offset:offset + page_size]
+        ]
+        return items, queryset.count()
+    return reference.get_or_set((College._meta.label, 'search', term.lower(), page, page_size), load)
+
+
+class ReferenceChoiceIterator(ModelChoiceIterator):
+
+    def __iter__(self):
+        if self.field.empty_label is not None:
+            yield ('', self.field.empty_label)
+        for obj in table(self.queryset.model).values():
+            yield self.choice(obj)
+
+    def __len__(self):
+        return len(table(self.queryset.model)) + (self.field.empty_label is not None)
+
+
+class ReferenceChoiceField(forms.ModelChoiceField):
+    """A ModelChoiceField whose choices come from the cached table instead of a query per render."""
+
+    def _get_choices(self):
+        if hasattr(self, '_choices'):
+            return self._choices
+        return ReferenceChoiceIterator(self)
+
+    choices = property(_get_choices, forms.ChoiceField._set_choices)
+
+
+class ReferenceFormFieldMixin(object):
+    """Render every Country and State foreign key of a ModelAdmin as a ReferenceChoiceField."""
+
+    def formfield_for_foreignkey(self, db_field, request, **kwargs):
+        if db_field.related_model in TABLES and 'queryset' not in kwargs:
+            kwargs.setdefault('form_class', ReferenceChoiceField)
+        return super(ReferenceFormFieldMixin, self).formfield_for_foreignkey(db_field, request, **kwargs)
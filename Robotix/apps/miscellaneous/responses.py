@@ -0,0 +1,161 @@
+"""
+Cached admin pages.
+
+A ModelAdmin with CachedResponseMixin keeps the changelist and change
+pages it renders for GET requests in the shared cache. A page is keyed by
+its viewer, its path and query string and the data version of every model
+it shows: the admin's model, the models its foreign keys and many-to-many
+fields point at, and its ``cache_models``. Pages carry the viewer's name
+and the actions and links their permissions allow, so the viewer counts
+as their user, their role (as in the admins' ``get_list_display``) and
+every permission they hold. A model's version is bumped by every save,
+delete and m2m change of its rows (``miscellaneous.signals``) and by
+``changed()`` where rows are written in bulk, so a page is never served
+once the data under it has changed.
+
+The key is also the page's ETag: a browser revalidating a page that is
+still current gets a 304 before any query runs. A hard reload, sending
+``Cache-Control: no-cache``, renders the page afresh.
+"""
+import re
+
+from django.conf.urls import url
+from django.contrib import messages
+from django.core.exceptions import PermissionDenied
+from django.http import HttpResponse, HttpResponseNotModified
+from django.contrib.admin.utils import unquote
+from django.middleware.csrf import get_token
+from django.utils.cache import add_never_cache_headers, patch_cache_control
+from django.utils.http import parse_etags, quote_etag
+
+from .cache import Generation
+
+
+pages = Generation('admin-pages', timeout=10*60, local_size=50)
+
+# Data versions by model label
+versions = {}
+
+# Labels of the models some cached page shows; signals only bump these
+watched = set()
+
+# Rendered CSRF tokens are swapped for the requesting browser's own
+CSRF_INPUT = re.compile(br"name='csrfmiddlewaretoken' value='[^']*'")
+CSRF_MARKER = b'\x00csrf\x00'
+
+
+def model_label(model):
+    return model._meta.concrete_model._meta.label_lower
+
+
+def _version(label):
+    if label not in versions:
+        versions[label] = Generation('data:{}'.format(label))
+    return versions[label]
+
+
+def watch(*models):
+    watched.update(model_label(model) for model in models)
+
+
+def changed(*models):
+    """Bump the data version of ``models``, for writes that send no signals."""
+    for label in {model_label(model) for model in models}:
+        _version(label).bump()
+
+
+def role(request):
+    if request.user.is_superuser:
+        return 'superuser'
+    if request.user.get_username() == 'helpdesk':
+        return 'helpdesk'
+    return 'staff'
+
+
+class CachedResponseMixin(object):
+    """Serve a ModelAdmin's changelist and change pages from the shared cache."""
+    # Models whose rows its pages show, besides the admin's own and those
+    # its relations point at
+    cache_models = ()
+
+    def __init__(self, model, admin_site):
+        super(CachedResponseMixin, self).__init__(model, admin_site)
+        watch(*self.page_models())
+
+    def page_models(self):
+        models = {self.model}
+        for field in self.model._meta.get_fields():
+            if field.is_relation and not field.auto_created and field.related_model is not None:
+                models.add(field.related_model)
+                if field.many_to_many:
+                    models.add(field.remote_field.through)
+        models.update(self.cache_models)
+        return models
+
+    def get_urls(self):
+        urls = super(CachedResponseMixin, self).get_urls()
+        info = self.model._meta.app_label, self.model._meta.model_name
+        return [
+            url(r'^$',
+                self.admin_site.admin_view(self.cached_view(self.changelist_view), cacheable=True),
+                name='%s_%s_changelist' % info),
+            url(r'^(.+)/change/$',
+                self.admin_site.admin_view(self.cached_view(self.change_view, change=True), cacheable=True),
+                name='%s_%s_change' % info),
+        ] + urls
+
+    def page_key(self, request):
+        models = sorted({model_label(model) for model in self.page_models()})
+        return pages.key(
+            role(request),
+            request.user.pk,
+            sorted(request.user.get_all_permissions()),
+            request.get_full_path(),
+            [(label, _version(label).current()) for label in models],
+        )
+
+    def cached_view(self, view, change=False):
+        def cached(request, *args, **kwargs):
+            # Pending messages are shown, and used up, by the next page rendered
+            if request.method not in ('GET', 'HEAD') or len(messages.get_messages(request)):
+                response = view(request, *args, **kwargs)
+                add_never_cache_headers(response)
+                return response
+            # The views check this themselves, but a cached page skips them
+            obj = None
+            if change:
+                obj = self.get_object(request, unquote(args[0]))
+                if obj is None:
+                    # The view reports the missing object
+                    return view(request, *args, **kwargs)
+            if not self.has_change_permission(request, obj):
+                raise PermissionDenied
+
+            key = self.page_key(request)
+            etag = quote_etag(key)
+            refresh = 'no-cache' in request.META.get('HTTP_CACHE_CONTROL', '')
+            if not refresh and key in parse_etags(request.META.get('HTTP_IF_NONE_MATCH', '')):
+                response = HttpResponseNotModified()
+            else:
+                page = None if refresh else pages.get([key])
+                if page is None:
+                    response = view(request, *args, **kwargs)
+                    if hasattr(response, 'render'):
+                        response.render()
+                    if response.status_code != 200 or response.streaming:
+                        add_never_cache_headers(response)
+                        return response
+                    pages.set([key], (response['Content-Type'], CSRF_INPUT.sub(
+                        b"name='csrfmiddlewaretoken' value='" + CSRF_MARKER + b"'",
+                        response.content,
+                    )))
+                else:
+                    content_type, content = page
+                    response = HttpResponse(
+                        content.replace(CSRF_MARKER, get_token(request).encode('ascii')),
+                        content_type=content_type,
+                    )
+            response['ETag'] = etag
+            patch_cache_control(response, private=True, no_cache=True, must_revalidate=True)
+            return response
+        return cached
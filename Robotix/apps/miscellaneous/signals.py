@@ -0,0 +1,32 @@
+from django.db.models.signals import m2m_changed, post_delete, post_save
+from django.dispatch import receiver
+
+from .models import College, Country, State
+from .reference import reference
+from .responses import changed, model_label, watched
+
+
+@receiver(post_save, sender=College)
+@receiver(post_delete, sender=College)
+@receiver(post_save, sender=State)
+@receiver(post_delete, sender=State)
+@receiver(post_save, sender=Country)
+@receiver(post_delete, sender=Country)
+def invalidate_reference(sender, **kwargs):
+    reference.bump()
+
+
+@receiver(post_save)
+@receiver(post_delete)
+def invalidate_pages(sender, **kwargs):
+    if model_label(sender) in watched:
+        changed(sender)
+
+
+@receiver(m2m_changed)
+def invalidate_pages_on_members_change(sender, instance, model, action, **kwargs):
+    if action.startswith('post_'):
+        changed(*[
+            related for related in (sender, type(instance), model)
+            if model_label(related) in watched
+        ])
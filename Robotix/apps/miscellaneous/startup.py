@@ -0,0 +1,100 @@
+"""
+Import time and memory of a fresh worker, for ``manage.py startup_profile``.
+
+Run as ``python -m miscellaneous.startup`` so the import hooks are in
+place before Django is imported. Prints a JSON report on stdout: the time
+and resident memory after each startup phase, and the time and memory
+each top-level package added by itself, not counting what its own
+imports pulled in first.
+"""
+import builtins
+import importlib
+import importlib.util
+import json
+import os
+import sys
+import time
+from collections import defaultdict
+
+
+PAGE_KB = os.sysconf('SC_PAGE_SIZE') // 1024
+
+_import = builtins.__import__
+_import_module = importlib.import_module
+
+# One [seconds, kilobytes] per import in progress, for its nested imports
+_stack = []
+# top-level package -> [seconds, kilobytes]
+_packages = defaultdict(lambda: [0.0, 0])
+
+
+def rss():
+    """Resident memory of this process, in kilobytes."""
+    with open('/proc/self/statm') as f:
+        return int(f.read().split()[1]) * PAGE_KB
+
+
+def _timed(name, load):
+    if name in sys.modules:
+        return load()
+    start, memory = time.time(), rss()
+    _stack.append([0.0, 0])
+    try:
+        return load()
+    finally:
+        elapsed, grown = time.time() - start, rss() - memory
+        nested = _stack.pop()
+        package = _packages[name.partition('.')[0]]
+        package[0] += elapsed - nested[0]
+        package[1] += grown - nested[1]
+        if _stack:
+            _stack[-1][0] += elapsed
+            _stack[-1][1] += grown
+
+
+def timed_import(name, globals=None, locals=None, fromlist=(), level=0):
+    if level:
+        # Relative imports count towards the package doing them
+        return _import(name, globals, locals, fromlist, level)
+    return _timed(name, lambda: _import(name, globals, locals, fromlist, level))
+
+
+def timed_import_module(name, package=None):
+    if name.startswith('.'):
+        name = importlib.util.resolve_name(name, package)
+    return _timed(name, lambda: _import_module(name))
+
+
+def main():
+    builtins.__import__ = timed_import
+    importlib.import_module = timed_import_module
+
+    phases = []
+    start = time.time()
+
+    def phase(label):
+        phases.append((label, time.time() - start, rss()))
+
+    phase('interpreter')
+    from django.core.wsgi import get_wsgi_application
+    get_wsgi_application()
+    phase('django.setup')
+    from django.core.urlresolvers import get_resolver
+    get_resolver().url_patterns
+    phase('URLconf and admin')
+    from django.conf import settings
+    for module in getattr(settings, 'PRELOAD_MODULES', ()):
+        importlib.import_module(module)
+    phase('PRELOAD_MODULES')
+
+    json.dump({
+        'phases': phases,
+        'packages': sorted(
+            ([package, seconds, kilobytes] for package, (seconds, kilobytes) in _packages.items()),
+            key=lambda row: -row[1],
+        ),
+    }, sys.stdout)
+
+
+if __name__ == '__main__':
+    main()
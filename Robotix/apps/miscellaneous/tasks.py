@@ -0,0 +1,59 @@
+import csv
+import io
+import os
+import tempfile
+
+from django.apps import apps
+from django.contrib import admin
+
+from import_export.formats import base_formats
+
+from jobs.registry import task
+
+from .db import replica_reads
+from .imports import uploads
+
+
+@task('export')
+def export(job, model, pks, file_format):
+    model = apps.get_model(model)
+    model_admin = admin.site._registry[model]
+    queryset = model._default_manager.filter(pk__in=pks)
+    file_format = getattr(base_formats, file_format)()
+    job.start(len(pks))
+    with replica_reads():
+        if isinstance(file_format, base_formats.XLSX):
+            fileobj = model_admin.write_xlsx(None, queryset, progress=job.step)
+        else:
+            fileobj = model_admin.write_csv(None, queryset, progress=job.step)
+    return model_admin.get_export_filename(file_format), fileobj
+
+
+@task('bulk_import')
+def bulk_import(job, model, path, dry_run):
+    model = apps.get_model(model)
+    importer = admin.site._registry[model].importer_class()
+    try:
+        with open(uploads.path(path), encoding='utf-8-sig', newline='') as rows:
+            job.start(max(sum(1 for line in rows) - 1, 0))
+            importer.run(rows, dry_run, progress=lambda done: job.step(done - job.done))
+    finally:
+        uploads.delete(path)
+        os.rmdir(os.path.dirname(uploads.path(path)))
+
+    fileobj = tempfile.NamedTemporaryFile(suffix='.csv')
+    text = io.TextIOWrapper(fileobj, encoding='utf-8', newline='')
+    writer = csv.writer(text)
+    writer.writerow(['line', 'result', 'detail'])
+    for line, error in importer.errors:
+        writer.writerow([line, 'error', error])
+    for line, action, label in importer.diff:
+        writer.writerow([line, action, label])
+    text.flush()
+    text.detach()
+    fileobj.seek(0)
+    if importer.error_count:
+        job.error = '{} invalid rows, nothing imported'.format(importer.error_count)
+    return 'Import-{}-{}-new-{}-existing.csv'.format(
+        model._meta.model_name, importer.created, importer.existing,
+    ), fileobj
@@ -0,0 +1,64 @@
+"""
+Test runner and the rows the apps' tests build.
+
+The factories expect the ``fixtures`` fixture, which has the states,
+countries and colleges they refer to by primary key.
+"""
+from django.conf import settings
+from django.test.runner import DiscoverRunner
+
+from participant.models import Participant
+from team.models import Team
+
+from .models import College
+
+
+class ProjectAppsRunner(DiscoverRunner):
+    """Runs the tests of PROJECT_APPS when ``manage.py test`` is given no labels."""
+
+    def build_suite(self, test_labels=None, extra_tests=None, **kwargs):
+        return super(ProjectAppsRunner, self).build_suite(
+            test_labels or settings.PROJECT_APPS, extra_tests, **kwargs
+        )
+
+
+def make_participant(mobile, **kwargs):
+    kwargs.setdefault('first_name', 'Asha')
+    kwargs.setdefault('last_name', 'Rao')
+    kwargs.setdefault('email', '{}@example.com'.format(mobile))
+    kwargs.setdefault('year', 1)
+    kwargs.setdefault('college_id', 1)
+    return Participant.objects.create(mobile=mobile, **kwargs)
+
+
+def make_team(event, *members, **kwargs):
+    kwargs.setdefault('name', 'Team')
+    team = Team.objects.create(
+        event_id=event, street='Street', locality='Locality', city='City', state_id=1, pin=721302, **kwargs
+    )
+    team.participant.set(members)
+    return team
+
+
+def make_teams(count, event='FT', members=2, scores=()):
+    """
+    ``count`` teams of ``event`` scored ``scores`` in round one, each with
+    ``members`` new participants of as many different colleges.
+    """
+    colleges = list(College.objects.order_by('pk').values_list('pk', flat=True)[:members])
+    start = Participant.objects.count()
+    Participant.objects.bulk_create(
+        Participant(
+            first_name='Member', last_name=str(start + i), mobile=7000000000 + start + i,
+            email='member{}@example.com'.format(start + i), year=1, college_id=colleges[i % members],
+        )
+        for i in range(count * members)
+    )
+    participants = list(Participant.objects.order_by('pk').values_list('pk', flat=True)[start:])
+    return [
+        make_team(
+            event, *participants[i * members:(i + 1) * members],
+            name='Team {}'.format(i), round_one=scores[i] if i < len(scores) else None
+        )
+        for i in range(count)
+    ]
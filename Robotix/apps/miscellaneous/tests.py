@@ -0,0 +1,93 @@
+from unittest import mock
+
+from django.contrib import admin
+from django.contrib.auth.models import Permission, User
+from django.core.cache import cache
+from django.core.urlresolvers import reverse
+from django.test import RequestFactory, TestCase
+
+from team.models import QualificationRule, Team
+
+from . import changelist
+from .models import College, Country, State
+from .reference import college_label, search_colleges
+from .testing import make_team, make_teams
+
+
+class CachedResponseTests(TestCase):
+    fixtures = ['fixtures']
+
+    def setUp(self):
+        self.model_admin = admin.site._registry[Team]
+        self.user = User.objects.create_user('desk', is_staff=True)
+        self.user.user_permissions.add(Permission.objects.get(codename='change_team'))
+
+    def key(self):
+        request = RequestFactory().get(reverse('admin:team_team_changelist') + '?event=FT')
+        # A fresh user, as permissions are cached on the instance
+        request.user = User.objects.get(pk=self.user.pk)
+        return self.model_admin.page_key(request)
+
+    def test_models_rendered(self):
+        self.assertTrue({State, Country, College, QualificationRule} <= self.model_admin.page_models())
+        for model in (State, Country, College):
+            key = self.key()
+            obj = model.objects.first()
+            obj.name = obj.name + '!'
+            obj.save()
+            self.assertNotEqual(self.key(), key, model)
+
+    def test_permissions(self):
+        key = self.key()
+        self.user.user_permissions.add(Permission.objects.get(codename='delete_team'))
+        self.assertNotEqual(self.key(), key)
+
+    def test_change_page_checks_the_object(self):
+        url = reverse('admin:team_team_change', args=[make_team('FT').pk])
+        self.client.force_login(User.objects.create_user('other', is_staff=True))
+        self.assertEqual(self.client.get(url).status_code, 403)
+        self.client.force_login(self.user)
+        self.assertEqual(self.client.get(url).status_code, 200)
+
+
+class CountTests(TestCase):
+    fixtures = ['fixtures']
+
+    def setUp(self):
+        cache.clear()
+        make_teams(3)
+
+    def test_exact_within_the_limit(self):
+        self.assertEqual(changelist.cached_count(Team.objects.all()), 3)
+        Team.objects.first().delete()
+        self.assertEqual(changelist.cached_count(Team.objects.all()), 3)
+
+    def test_counted_in_the_background_past_the_limit(self):
+        with mock.patch.object(changelist, 'COUNT_LIMIT', 2), \
+                mock.patch.object(changelist.threading, 'Thread') as thread:
+            self.assertEqual(changelist.cached_count(Team.objects.all()), 2)
+            self.assertEqual(changelist.cached_count(Team.objects.all()), 2)
+        self.assertEqual(thread.call_count, 1)
+        target, args = thread.call_args[1]['target'], thread.call_args[1]['args']
+        target(*args)
+        self.assertEqual(changelist.cached_count(Team.objects.all()), 3)
+
+
+class CollegeLookupTests(TestCase):
+    fixtures = ['fixtures']
+
+    def setUp(self):
+        cache.clear()
+
+    def test_follows_renames(self):
+        college = College.objects.select_related('state').first()
+        items, total = search_colleges(college.name)
+        self.assertIn({'id': college.pk, 'text': college_label(college.pk)}, items)
+        with self.assertNumQueries(0):
+            self.assertEqual(search_colleges(college.name), (items, total))
+            college_label(college.pk)
+
+        college.state.name = 'Renamed State'
+        college.state.save()
+        self.assertEqual(college_label(college.pk), '{} (Renamed State)'.format(college.name))
+        self.assertIn('(Renamed State)', search_colleges(college.name)[0][0]['text'])
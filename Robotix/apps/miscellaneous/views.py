@@ -0,0 +1,13 @@
+from django.conf import settings
+from django.core.exceptions import PermissionDenied
+from django.http import HttpResponse
+
+from .metrics import exposition
+from .ratelimit import client_ip
+
+
+def metrics(request):
+    """Prometheus scrape endpoint, for staff and the addresses in METRICS_IPS."""
+    if not (request.user.is_staff or client_ip(request) in getattr(settings, 'METRICS_IPS', ('127.0.0.1',))):
+        raise PermissionDenied
+    return HttpResponse(exposition(), content_type='text/plain; version=0.0.4; charset=utf-8')
@@ -1,13 +1,25 @@
-from django.contrib import admin
+from django.conf.urls import url
+from django.contrib import admin, messages
+from django.contrib.admin.views.main import ORDER_VAR
+from django.core.exceptions import ValidationError
+from django.http import JsonResponse
 
-from import_export.admin import ExportMixin
-from import_export import resources
-from jet.filters import RelatedFieldAjaxListFilter
+from team.events import event_choices
+from team.models import Event, Team
+from team.admin import TeamInline
+from miscellaneous.changelist import ScalableChangeListMixin
+from miscellaneous.db import ReplicaChangeListMixin
+from miscellaneous.export import StreamingExportMixin, StreamingResource
+from miscellaneous.filters import CollegeListFilter, ReferenceListFilterFactory
+from miscellaneous.imports import BulkImportMixin
+from miscellaneous.models import College, State
+from miscellaneous.reference import get
+from miscellaneous.responses import CachedResponseMixin
 
-from team.models import *
-from team.admin import TeamInlineFactory
-
-from .models import Participant
+from .duplicates import merge
+from .imports import ParticipantImport
+from .models import Participant, DuplicateCandidate
+from .search import matching, search_results
 
 
 class TeamListFilter(admin.SimpleListFilter):
@@ -15,33 +27,35 @@ class TeamListFilter(admin.SimpleListFilter):
     parameter_name = 'team'
 
     def lookups(self, request, model_admin):
-        return (
-            ('polesapart', 'Poles Apart'),
-            ('fortress', 'Fortress'),
-            ('stax', 'Stax'),
-        )
+        return event_choices()
 
     def queryset(self, request, queryset):
         if self.value():
-            query = dict()
-            query['team_{}_related__isnull'.format(self.value())] = False
-            return queryset.filter(**query)
+            members = Team.participant.through.objects.filter(team__event=self.value())
+            return queryset.filter(pk__in=members.values('participant_id'))
         return queryset
 
 
-class ParticipantResource(resources.ModelResource):
+class ParticipantResource(StreamingResource):
 
     class Meta:
         model = Participant
         use_transactions = True
 
     def dehydrate_college(self, participant):
-        return participant.college.name
+        return get(College, participant.college_id).name
 
 
 @admin.register(Participant)
-class ParticipantAdmin(ExportMixin, admin.ModelAdmin):
+class ParticipantAdmin(CachedResponseMixin, BulkImportMixin, ReplicaChangeListMixin, ScalableChangeListMixin, StreamingExportMixin, admin.ModelAdmin):
     resource_class = ParticipantResource
+    importer_class = ParticipantImport
+    cache_models = [
+        Team.participant.through,
+        Team,
+        Event,
+        State,
+    ]
     fieldsets = (
         ('Contact Information', {
             'fields': (
@@ -57,8 +71,8 @@ class ParticipantAdmin(ExportMixin, admin.ModelAdmin):
     )
     list_filter = [
         TeamListFilter,
-        ('college', RelatedFieldAjaxListFilter),
-        'college__state',
+        CollegeListFilter,
+        ReferenceListFilterFactory(State, 'college__state'),
         'year',
     ]
     list_display = [
@@ -67,6 +81,7 @@ class ParticipantAdmin(ExportMixin, admin.ModelAdmin):
         'mobile',
         'college',
     ]
+    # Shows the search box; get_search_results searches the index instead
     search_fields = [
         '=first_name',
         '=last_name',
@@ -74,7 +89,82 @@ class ParticipantAdmin(ExportMixin, admin.ModelAdmin):
         'mobile',
     ]
     inlines = [
-        TeamInlineFactory(PolesApart),
-        TeamInlineFactory(Fortress),
-        TeamInlineFactory(Stax),
+        TeamInline,
+    ]
+
+    def get_urls(self):
+        urls = super(ParticipantAdmin, self).get_urls()
+        return [
+            url(r'^search/$',
+                self.admin_site.admin_view(self.search_view),
+                name='participant_participant_search'),
+        ] + urls
+
+    def search_view(self, request):
+        return JsonResponse({'results': search_results(request.GET.get('q', ''))})
+
+    def get_search_results(self, request, queryset, search_term):
+        if not search_term:
+            return queryset, False
+        # Ranked by relevance unless a column to sort by was picked
+        return matching(queryset, search_term, ranked=ORDER_VAR not in request.GET), False
+
+
+@admin.register(DuplicateCandidate)
+class DuplicateCandidateAdmin(admin.ModelAdmin):
+    """Merge queue filled by ``manage.py find_duplicates``."""
+    list_display = [
+        'participant_details',
+        'duplicate_details',
+        'score',
+        'reason',
+        'status',
     ]
+    list_filter = [
+        'status',
+        'reason',
+    ]
+    list_select_related = [
+        'participant__college',
+        'duplicate__college',
+    ]
+    actions = [
+        'merge_selected',
+        'dismiss',
+    ]
+
+    def has_add_permission(self, request):
+        return False
+
+    def _details(self, participant):
+        return '{} ({}, {}, {})'.format(participant.name, participant.mobile, participant.email, participant.college)
+
+    def participant_details(self, candidate):
+        return self._details(candidate.participant)
+    participant_details.short_description = 'Keep'
+
+    def duplicate_details(self, candidate):
+        return self._details(candidate.duplicate)
+    duplicate_details.short_description = 'Merge into it'
+
+    def merge_selected(self, request, queryset):
+        merged = set()
+        for candidate in queryset.filter(status='pending').select_related('participant', 'duplicate').order_by('-score'):
+            # Earlier merges in this batch may have taken either side away
+            if candidate.participant_id in merged or candidate.duplicate_id in merged:
+                continue
+            try:
+                merge(candidate.participant, candidate.duplicate)
+            except ValidationError as e:
+                self.message_user(request, 'Could not merge {} into {}: {}'.format(
+                    candidate.duplicate, candidate.participant, '; '.join(e.messages),
+                ), messages.ERROR)
+                continue
+            merged.add(candidate.duplicate_id)
+        self.message_user(request, '{} duplicate participants merged'.format(len(merged)))
+    merge_selected.short_description = 'Merge selected duplicates'
+
+    def dismiss(self, request, queryset):
+        rows = queryset.update(status='dismissed')
+        self.message_user(request, '{} pairs marked as not duplicates'.format(rows))
+    dismiss.short_description = 'Mark selected pairs as not duplicates'
@@ -0,0 +1,8 @@
+from django.apps import AppConfig
+
+
+class ParticipantConfig(AppConfig):
+    name = 'participant'
+
+    def ready(self):
+        from . import signals
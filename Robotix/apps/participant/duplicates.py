@@ -0,0 +1,156 @@
+"""
+Duplicate participant detection and merging.
+
+Participants are only compared within blocks sharing a normalized mobile
+number or e-mail address, so a scan is one pass over the table plus a few
+comparisons per block instead of every pair. Pairs are then scored on how
+many blocks they share, how alike their names are and whether their
+colleges match, and the likely ones are queued as DuplicateCandidate rows
+for review in the admin.
+"""
+from collections import defaultdict
+from difflib import SequenceMatcher
+from itertools import combinations
+
+from django.core.exceptions import ValidationError
+from django.db import transaction
+
+from team.models import Team
+from team.summary import members_changed
+from team.validation import membership_errors, team_label
+
+from .models import Participant, DuplicateCandidate
+from .utils import normalize_email, normalize_mobile, normalize_name
+
+
+# Blocks bigger than this are a shared office number or inbox rather
+# than one person, and would make the scan quadratic
+MAX_BLOCK = 20
+
+MIN_SCORE = 0.6
+
+
+def score(keys, name, other_name, same_college):
+    """0 to 1: a quarter per shared block key, plus name and college likeness."""
+    similarity = SequenceMatcher(None, name, other_name).ratio()
+    return round(0.25 * len(keys) + 0.35 * similarity + 0.15 * same_college, 3)
+
+
+def find_candidates():
+    """``{(older pk, newer pk): (score, reason)}`` for every likely duplicate pair."""
+    blocks = defaultdict(list)
+    people = {}
+    rows = Participant.objects.values_list('pk', 'first_name', 'last_name', 'mobile', 'email', 'college_id')
+    for pk, first_name, last_name, mobile, email, college in rows.iterator():
+        people[pk] = (normalize_name(first_name, last_name), college)
+        blocks['mobile', normalize_mobile(mobile) or str(mobile)].append(pk)
+        blocks['email', normalize_email(email)].append(pk)
+
+    keys = defaultdict(set)
+    for (kind, value), pks in blocks.items():
+        if 1 < len(pks) <= MAX_BLOCK:
+            for pair in combinations(sorted(pks), 2):
+                keys[pair].add(kind)
+
+    candidates = {}
+    for (first, second), pair_keys in keys.items():
+        (name, college), (other_name, other_college) = people[first], people[second]
+        pair_score = score(pair_keys, name, other_name, college == other_college)
+        if pair_score >= MIN_SCORE:
+            candidates[first, second] = (pair_score, ', '.join(sorted(pair_keys)))
+    return candidates
+
+
+def scan():
+    """
+    Bring the merge queue up to date. Pending pairs are added, rescored or
+    dropped; pairs already marked as not duplicates stay dismissed.
+    Returns the number of pending pairs.
+    """
+    candidates = find_candidates()
+    with transaction.atomic():
+        existing = {
+            (row.participant_id, row.duplicate_id): row
+            for row in DuplicateCandidate.objects.all()
+        }
+        DuplicateCandidate.objects.filter(pk__in=[
+            row.pk for pair, row in existing.items()
+            if row.status == 'pending' and pair not in candidates
+        ]).delete()
+        for pair, (pair_score, reason) in candidates.items():
+            row = existing.get(pair)
+            if row and row.status == 'pending' and (row.score, row.reason) != (pair_score, reason):
+                DuplicateCandidate.objects.filter(pk=row.pk).update(score=pair_score, reason=reason)
+        DuplicateCandidate.objects.bulk_create(
+            DuplicateCandidate(participant_id=first, duplicate_id=second, score=pair_score, reason=reason)
+            for (first, second), (pair_score, reason) in candidates.items()
+            if (first, second) not in existing
+        )
+    return DuplicateCandidate.objects.filter(status='pending').count()
+
+
+def merge_errors(keep, duplicate):
+    """
+    The team rules merging ``duplicate`` into ``keep`` would break: both in
+    teams of the same event, or a team over its size once ``keep`` joins it.
+    """
+    through = Team.participant.through.objects
+    teams = defaultdict(set)
+    events = {}
+    affected = through.filter(team__participant__in=[keep, duplicate]).distinct()
+    for team, event, member in affected.values_list('team_id', 'team__event', 'participant_id'):
+        teams[team].add(keep.pk if member == duplicate.pk else member)
+        events[team] = event
+    batch = [(pk, events[pk], members) for pk, members in sorted(teams.items())]
+    return [
+        '{}: {}'.format(team_label(batch[i][1], batch[i][0]), error)
+        for i, errors in sorted(membership_errors(batch).items())
+        for error in errors
+    ]
+
+
+def merge(keep, duplicate):
+    """
+    Move everything of ``duplicate`` over to ``keep`` and delete it, in one
+    transaction. Many-to-many rows, team memberships among them, follow the
+    participant unless ``keep`` is already related to the same object; so do
+    other relations, unless ``keep`` already has a row they would clash with
+    on a unique constraint (a certificate of the same kind for the same
+    event). The duplicate's own search document and queued pairs go with it.
+
+    Raises ValidationError, merging nothing, if the merged participant would
+    break the team rules.
+    """
+    errors = merge_errors(keep, duplicate)
+    if errors:
+        raise ValidationError(errors)
+    teams = list(duplicate.teams.values_list('pk', flat=True))
+    with transaction.atomic():
+        for relation in Participant._meta.related_objects:
+            if relation.one_to_one or relation.related_model is DuplicateCandidate:
+                continue
+            if relation.many_to_many:
+                through = relation.through._default_manager
+                source = relation.field.m2m_reverse_field_name()
+                target = '{}_id'.format(relation.field.m2m_field_name())
+                rows = through.filter(**{source: duplicate})
+                rows.filter(**{
+                    '{}__in'.format(target): through.filter(**{source: keep}).values(target)
+                }).delete()
+                rows.update(**{source: keep})
+            else:
+                name = relation.field.name
+                manager = relation.related_model._base_manager
+                rows = manager.filter(**{name: duplicate})
+                for unique in relation.related_model._meta.unique_together:
+                    if name not in unique:
+                        continue
+                    others = [field for field in unique if field != name]
+                    taken = set(manager.filter(**{name: keep}).values_list(*others))
+                    rows.filter(pk__in=[
+                        row[0] for row in rows.values_list('pk', *others) if row[1:] in taken
+                    ]).delete()
+                rows.update(**{name: keep})
+        duplicate.delete()
+    # Memberships moved by the update above sent no signals
+    members_changed(teams)
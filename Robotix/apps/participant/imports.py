@@ -0,0 +1,12 @@
+from miscellaneous.imports import BulkImport
+
+from .models import Participant
+from .search import index
+
+
+class ParticipantImport(BulkImport):
+    model = Participant
+    key_fields = ('mobile', 'email')
+
+    def imported(self, queryset):
+        index(queryset)
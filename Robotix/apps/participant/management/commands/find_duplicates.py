@@ -0,0 +1,10 @@
+from django.core.management.base import BaseCommand
+
+from participant.duplicates import scan
+
+
+class Command(BaseCommand):
+    help = 'Queue likely duplicate participants for review in the admin'
+
+    def handle(self, *args, **options):
+        self.stdout.write('{} pairs are waiting for review'.format(scan()))
@@ -0,0 +1,14 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from participant.models import Participant, SearchDocument
+from participant.search import index
+
+
+class Command(BaseCommand):
+    help = 'Rebuild the help desk search documents of every participant'
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            index(Participant.objects.all())
+        self.stdout.write('Indexed {} participants'.format(SearchDocument.objects.count()))
@@ -0,0 +1,25 @@
+# -*- coding: utf-8 -*-
+from __future__ import unicode_literals
+
+from django.db import migrations
+
+from miscellaneous.indexes import create_search_indexes, drop_search_indexes
+
+
+def forwards(apps, schema_editor):
+    create_search_indexes(schema_editor)
+
+
+def backwards(apps, schema_editor):
+    drop_search_indexes(schema_editor)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('participant', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.RunPython(forwards, backwards),
+    ]
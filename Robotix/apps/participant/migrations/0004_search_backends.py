@@ -0,0 +1,79 @@
+# -*- coding: utf-8 -*-
+from __future__ import unicode_literals
+
+from django.db import migrations
+
+from participant.utils import search_document
+
+
+SQLITE_FTS = [
+    "CREATE VIRTUAL TABLE participant_searchdocument_fts USING fts5("
+    "document, content='participant_searchdocument', content_rowid='participant_id', prefix='2 3')",
+    "CREATE TRIGGER participant_searchdocument_ai AFTER INSERT ON participant_searchdocument BEGIN "
+    "INSERT INTO participant_searchdocument_fts(rowid, document) VALUES (new.participant_id, new.document); "
+    "END",
+    "CREATE TRIGGER participant_searchdocument_ad AFTER DELETE ON participant_searchdocument BEGIN "
+    "INSERT INTO participant_searchdocument_fts(participant_searchdocument_fts, rowid, document) "
+    "VALUES ('delete', old.participant_id, old.document); "
+    "END",
+    "CREATE TRIGGER participant_searchdocument_au AFTER UPDATE ON participant_searchdocument BEGIN "
+    "INSERT INTO participant_searchdocument_fts(participant_searchdocument_fts, rowid, document) "
+    "VALUES ('delete', old.participant_id, old.document); "
+    "INSERT INTO participant_searchdocument_fts(rowid, document) VALUES (new.participant_id, new.document); "
+    "END",
+]
+
+SQLITE_FTS_DROP = [
+    "DROP TRIGGER IF EXISTS participant_searchdocument_ai",
+    "DROP TRIGGER IF EXISTS participant_searchdocument_ad",
+    "DROP TRIGGER IF EXISTS participant_searchdocument_au",
+    "DROP TABLE IF EXISTS participant_searchdocument_fts",
+]
+
+POSTGRESQL_GIN = [
+    "CREATE INDEX participant_searchdocument_tsv ON participant_searchdocument "
+    "USING gin (to_tsvector('simple', document))",
+]
+
+POSTGRESQL_GIN_DROP = [
+    "DROP INDEX IF EXISTS participant_searchdocument_tsv",
+]
+
+
+def create_search_backend(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    for sql in {'sqlite': SQLITE_FTS, 'postgresql': POSTGRESQL_GIN}.get(vendor, []):
+        schema_editor.execute(sql)
+
+    Participant = apps.get_model('participant', 'Participant')
+    SearchDocument = apps.get_model('participant', 'SearchDocument')
+    SearchDocument.objects.bulk_create(
+        SearchDocument(
+            participant_id=participant.pk,
+            document=search_document(
+                participant.first_name,
+                participant.last_name,
+                participant.mobile,
+                participant.email,
+                participant.college.abbv,
+            ),
+        )
+        for participant in Participant.objects.select_related('college').iterator()
+    )
+
+
+def drop_search_backend(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    for sql in {'sqlite': SQLITE_FTS_DROP, 'postgresql': POSTGRESQL_GIN_DROP}.get(vendor, []):
+        schema_editor.execute(sql)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('participant', '0003_searchdocument'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_search_backend, drop_search_backend),
+    ]
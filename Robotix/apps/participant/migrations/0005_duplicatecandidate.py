@@ -0,0 +1,34 @@
+# -*- coding: utf-8 -*-
+# Generated by Django 1.10.5 on 2026-10-18 17:09
+from __future__ import unicode_literals
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('participant', '0004_search_backends'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DuplicateCandidate',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('score', models.FloatField(db_index=True)),
+                ('reason', models.CharField(max_length=50)),
+                ('status', models.CharField(choices=[('pending', 'Pending'), ('dismissed', 'Not a duplicate')], default='pending', max_length=10)),
+                ('duplicate', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='participant.Participant', verbose_name='Merge into it')),
+                ('participant', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to='participant.Participant', verbose_name='Keep')),
+            ],
+            options={
+                'ordering': ('-score',),
+            },
+        ),
+        migrations.AlterUniqueTogether(
+            name='duplicatecandidate',
+            unique_together=set([('participant', 'duplicate')]),
+        ),
+    ]
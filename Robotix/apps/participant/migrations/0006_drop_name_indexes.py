@@ -0,0 +1,39 @@
+# -*- coding: utf-8 -*-
+from __future__ import unicode_literals
+
+from django.db import migrations
+
+
+# Indexes for the =first_name and =last_name searches the search index replaced
+NAME_INDEXES = [
+    'participant_first_name_upper',
+    'participant_last_name_upper',
+    'participant_first_name_nocase',
+    'participant_last_name_nocase',
+    'participant_first_name',
+    'participant_last_name',
+]
+
+
+def drop_name_indexes(apps, schema_editor):
+    connection = schema_editor.connection
+    with connection.cursor() as cursor:
+        existing = connection.introspection.get_constraints(cursor, 'participant_participant')
+    for name in NAME_INDEXES:
+        if name not in existing:
+            continue
+        if connection.vendor == 'mysql':
+            schema_editor.execute('DROP INDEX {} ON participant_participant'.format(name))
+        else:
+            schema_editor.execute('DROP INDEX {}'.format(name))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('participant', '0005_duplicatecandidate'),
+    ]
+
+    operations = [
+        migrations.RunPython(drop_name_indexes, migrations.RunPython.noop),
+    ]
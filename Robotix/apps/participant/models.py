@@ -38,3 +38,40 @@ class Participant(models.Model):
 
     def __str__(self):
         return self.name
+
+
+class SearchDocument(models.Model):
+    participant = models.OneToOneField(Participant,
+        primary_key=True,
+        related_name='search_document'
+    )
+    document    = models.TextField()
+
+    def __str__(self):
+        return self.document
+
+
+class DuplicateCandidate(models.Model):
+    """A pair of participants that look like the same person, for review."""
+    participant = models.ForeignKey(Participant,
+        related_name='+',
+        verbose_name='Keep'
+    )
+    duplicate   = models.ForeignKey(Participant,
+        related_name='+',
+        verbose_name='Merge into it'
+    )
+    score       = models.FloatField(db_index=True)
+    reason      = models.CharField(max_length=50)
+    status      = models.CharField(
+        max_length=10,
+        choices=DUPLICATE_STATUS_CHOICES,
+        default='pending'
+    )
+
+    def __str__(self):
+        return '{} / {}'.format(self.participant, self.duplicate)
+
+    class Meta:
+        unique_together = ('participant', 'duplicate')
+        ordering = ('-score',)
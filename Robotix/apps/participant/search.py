@@ -0,0 +1,172 @@
+"""
+Full-text search over participants for the help desk.
+
+Each participant has a SearchDocument row kept current by the signals in
+``participant.signals``. SQLite searches it through an FTS5 table and
+PostgreSQL through a GIN full-text index, both created by migration 0004
+and ranked by relevance. Any other database falls back to substring
+matches on the document.
+
+``search()`` hands the autocomplete widgets the ids of the best matches
+only. The changelists filter by every match instead, through
+``matches()``: participants matching in the index, or with every word of
+the term somewhere in their e-mail address or mobile number, as the
+admin searched before the index, so part of a number still finds them.
+``matching()`` also ranks a participant queryset in the database.
+"""
+from django.db import connection
+from django.db.models import Q
+
+from .models import Participant, SearchDocument
+from .utils import search_document, search_tokens
+
+
+FTS_TABLE = 'participant_searchdocument_fts'
+
+# Most participant ids a search hands back to a widget
+SEARCH_LIMIT = 1000
+
+_fts_available = {}
+
+
+def document_for(participant):
+    return search_document(
+        participant.first_name,
+        participant.last_name,
+        participant.mobile,
+        participant.email,
+        participant.college.abbv,
+    )
+
+
+def index(participants):
+    """(Re)build the search documents of ``participants``."""
+    participants = participants.select_related('college')
+    SearchDocument.objects.filter(participant__in=participants).delete()
+    SearchDocument.objects.bulk_create(
+        SearchDocument(participant_id=participant.pk, document=document_for(participant))
+        for participant in participants.iterator()
+    )
+
+
+def _has_fts():
+    if connection.alias not in _fts_available:
+        _fts_available[connection.alias] = FTS_TABLE in connection.introspection.table_names()
+    return _fts_available[connection.alias]
+
+
+def _fts_query(tokens):
+    return ' '.join('"{}"*'.format(token) for token in tokens)
+
+
+def _tsquery(tokens):
+    return ' & '.join('{}:*'.format(token) for token in tokens)
+
+
+def search(term, limit=SEARCH_LIMIT):
+    """Ids of the participants matching every word of ``term``, best first."""
+    tokens = search_tokens(term)
+    if not tokens:
+        return []
+    if connection.vendor == 'sqlite' and _has_fts():
+        sql = (
+            'SELECT rowid FROM {0} WHERE {0} MATCH %s '
+            'ORDER BY bm25({0}) LIMIT %s'.format(FTS_TABLE)
+        )
+        params = [_fts_query(tokens), limit]
+    elif connection.vendor == 'postgresql':
+        sql = (
+            "SELECT participant_id FROM participant_searchdocument "
+            "WHERE to_tsvector('simple', document) @@ to_tsquery('simple', %s) "
+            "ORDER BY ts_rank(to_tsvector('simple', document), to_tsquery('simple', %s)) DESC "
+            "LIMIT %s"
+        )
+        query = _tsquery(tokens)
+        params = [query, query, limit]
+    else:
+        documents = SearchDocument.objects.all()
+        for token in tokens:
+            documents = documents.filter(document__contains=token)
+        return list(documents.values_list('participant_id', flat=True)[:limit])
+
+    with connection.cursor() as cursor:
+        cursor.execute(sql, params)
+        return [row[0] for row in cursor.fetchall()]
+
+
+def matches(term):
+    """Q of the participants matching ``term`` in the index or in their e-mail address and mobile number."""
+    contact = Q()
+    for bit in term.split():
+        contact &= Q(email__icontains=bit) | Q(mobile__icontains=bit)
+    if not search_tokens(term):
+        return contact if term.split() else Q(pk__in=[])
+    return Q(pk__in=matching_ids(term)) | contact
+
+
+def matching(queryset, term, ranked=True):
+    """
+    The participants of ``queryset`` that ``matches(term)``, all of them.
+    Always ordered by id last, so pages are stable; ``ranked`` first
+    orders them best first by a ``search_rank`` column, those only found
+    by their e-mail address or mobile number last.
+    """
+    queryset = queryset.filter(matches(term))
+    tokens = search_tokens(term)
+    participants = Participant._meta.db_table
+    if not ranked:
+        return queryset.order_by('pk')
+    if tokens and connection.vendor == 'sqlite' and _has_fts():
+        rank = 'SELECT bm25({0}) FROM {0} WHERE {0} MATCH %s AND {0}.rowid = {1}.id'.format(FTS_TABLE, participants)
+        query = _fts_query(tokens)
+    elif tokens and connection.vendor == 'postgresql':
+        rank = (
+            "SELECT -ts_rank(to_tsvector('simple', d.document), to_tsquery('simple', %s)) "
+            "FROM participant_searchdocument d WHERE d.participant_id = {}.id"
+        ).format(participants)
+        query = _tsquery(tokens)
+    else:
+        return queryset.order_by('pk')
+    return queryset.extra(
+        select={'search_rank': 'COALESCE(({}), 0)'.format(rank)},
+        select_params=[query],
+    ).order_by('search_rank', 'pk')
+
+
+def matching_ids(term):
+    """The ids of every participant matching ``term``, unranked, as a subquery for ``__in``."""
+    tokens = search_tokens(term)
+    if not tokens:
+        return []
+    documents = SearchDocument.objects.all()
+    # Unqualified columns, as the table is aliased inside the subquery
+    if connection.vendor == 'sqlite' and _has_fts():
+        documents = documents.extra(
+            where=['participant_id IN (SELECT rowid FROM {0} WHERE {0} MATCH %s)'.format(FTS_TABLE)],
+            params=[_fts_query(tokens)],
+        )
+    elif connection.vendor == 'postgresql':
+        documents = documents.extra(
+            where=["to_tsvector('simple', document) @@ to_tsquery('simple', %s)"],
+            params=[_tsquery(tokens)],
+        )
+    else:
+        for token in tokens:
+            documents = documents.filter(document__contains=token)
+    return documents.values('participant_id')
+
+
+def search_results(term, limit=20):
+    """Ranked participants matching ``term``, as dicts for the JSON endpoint."""
+    ids = search(term, limit)
+    participants = Participant.objects.select_related('college').in_bulk(ids)
+    return [
+        {
+            'id': participant.pk,
+            'name': participant.name,
+            'mobile': participant.mobile,
+            'email': participant.email,
+            'college': participant.college.abbv or participant.college.name,
+        }
+        for participant in (participants[pk] for pk in ids if pk in participants)
+    ]
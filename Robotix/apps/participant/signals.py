@@ -0,0 +1,24 @@
+from django.db.models.signals import post_save
+from django.dispatch import receiver
+
+from miscellaneous.models import College
+
+from .models import Participant, SearchDocument
+from .search import document_for, index
+
+
+@receiver(post_save, sender=Participant)
+def index_participant(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+    SearchDocument.objects.update_or_create(
+        participant=instance,
+        defaults={'document': document_for(instance)},
+    )
+
+
+@receiver(post_save, sender=College)
+def index_college_participants(sender, instance, created=False, raw=False, **kwargs):
+    if raw or created:
+        return
+    index(Participant.objects.filter(college=instance))
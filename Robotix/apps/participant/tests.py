@@ -0,0 +1,145 @@
+import io
+
+from django.core.exceptions import ValidationError
+from django.db import DatabaseError
+from django.test import TestCase
+
+from certificate.models import Issue
+from miscellaneous.testing import make_participant, make_team
+
+from .duplicates import merge
+from .imports import ParticipantImport
+from .models import DuplicateCandidate, Participant, SearchDocument
+from .search import matching, matching_ids
+
+
+class MergeTests(TestCase):
+    fixtures = ['fixtures']
+
+    def setUp(self):
+        self.keep = make_participant(9000000001)
+        self.duplicate = make_participant(9000000002)
+        DuplicateCandidate.objects.create(participant=self.keep, duplicate=self.duplicate, score=1, reason='email')
+
+    def test_moves_teams_and_certificates(self):
+        team = make_team('ST', self.duplicate)
+        Issue.objects.create(participant=self.duplicate, team=team, event_id='ST', kind='participation', digest='x')
+        merge(self.keep, self.duplicate)
+
+        self.assertFalse(Participant.objects.filter(pk=self.duplicate.pk).exists())
+        self.assertEqual(list(team.participant.all()), [self.keep])
+        self.assertEqual(Issue.objects.get().participant, self.keep)
+        self.assertFalse(DuplicateCandidate.objects.exists())
+
+    def test_shared_team(self):
+        team = make_team('FT', self.keep, self.duplicate)
+        merge(self.keep, self.duplicate)
+        self.assertEqual(list(team.participant.all()), [self.keep])
+
+    def test_certificate_conflict(self):
+        team = make_team('FT', self.keep, self.duplicate)
+        Issue.objects.create(participant=self.keep, team=team, event_id='FT', kind='participation', digest='x')
+        Issue.objects.create(participant=self.duplicate, team=team, event_id='FT', kind='participation', digest='y')
+        merge(self.keep, self.duplicate)
+        self.assertEqual(list(Issue.objects.values_list('participant', 'digest')), [(self.keep.pk, 'x')])
+
+    def test_teams_of_the_same_event(self):
+        make_team('FT', self.keep)
+        other = make_team('FT', self.duplicate)
+        with self.assertRaises(ValidationError) as raised:
+            merge(self.keep, self.duplicate)
+        self.assertIn('{}: '.format(other), raised.exception.messages[0])
+        self.assertTrue(Participant.objects.filter(pk=self.duplicate.pk).exists())
+        self.assertEqual(list(other.participant.all()), [self.duplicate])
+
+
+class FailingImport(ParticipantImport):
+    chunk_size = 2
+
+    def imported(self, queryset):
+        if self.created > self.chunk_size:
+            raise DatabaseError('disk full')
+        super(FailingImport, self).imported(queryset)
+
+
+class BulkImportTests(TestCase):
+    fixtures = ['fixtures']
+
+    def sheet(self, count, start=0):
+        lines = ['first_name,last_name,mobile,email,year,college']
+        lines.extend(
+            'Imported,Person{0},{1},person{0}@example.com,2,1'.format(i, 8000000000 + i)
+            for i in range(start, start + count)
+        )
+        return io.StringIO('\n'.join(lines))
+
+    def test_import(self):
+        make_participant(8000000000, email='person0@example.com')
+        importer = ParticipantImport().run(self.sheet(5))
+        self.assertEqual((importer.created, importer.existing, importer.errors), (4, 1, []))
+        self.assertEqual(Participant.objects.count(), 5)
+        self.assertEqual(SearchDocument.objects.count(), 5)
+        self.assertEqual(Participant.objects.filter(pk__in=matching_ids('person3')).get().mobile, 8000000003)
+
+    def test_repeated_rows(self):
+        sheet = self.sheet(2)
+        sheet = io.StringIO(sheet.getvalue() + '\n' + sheet.getvalue().splitlines()[1])
+        importer = ParticipantImport().run(sheet)
+        self.assertEqual((importer.created, importer.existing), (2, 1))
+
+    def test_dry_run(self):
+        importer = ParticipantImport().run(self.sheet(3), dry_run=True)
+        self.assertEqual(importer.created, 3)
+        self.assertEqual([action for line, action, obj in importer.diff], ['create'] * 3)
+        self.assertFalse(Participant.objects.exists())
+
+    def test_invalid_row_writes_nothing(self):
+        sheet = io.StringIO(self.sheet(3).getvalue() + '\nBad,Row,123,not-an-email,9,Nowhere')
+        importer = ParticipantImport().run(sheet)
+        self.assertEqual(importer.error_count, 1)
+        self.assertEqual(importer.errors[0][0], 5)
+        self.assertFalse(Participant.objects.exists())
+
+    def test_missing_columns(self):
+        importer = ParticipantImport().run(io.StringIO('first_name\nAsha'))
+        self.assertEqual(importer.errors, [(1, 'Missing columns: mobile, email, year, college')])
+
+    def test_resume(self):
+        with self.assertRaises(DatabaseError):
+            FailingImport().run(self.sheet(5))
+        # The first chunk stays written
+        self.assertEqual(Participant.objects.count(), 2)
+
+        importer = ParticipantImport().run(self.sheet(5))
+        self.assertEqual((importer.created, importer.existing), (3, 2))
+        self.assertEqual(Participant.objects.count(), 5)
+        self.assertEqual(SearchDocument.objects.count(), 5)
+
+
+class SearchTests(TestCase):
+    fixtures = ['fixtures']
+
+    def setUp(self):
+        self.first = make_participant(9000000001, email='first@example.com')
+        self.second = make_participant(9000000002, first_name='Ravi', email='second@example.com')
+        self.third = make_participant(9000000003, email='third@example.com')
+
+    def found(self, term, **kwargs):
+        return list(matching(Participant.objects.all(), term, **kwargs))
+
+    def test_part_of_a_mobile_or_email(self):
+        self.assertEqual(self.found('00000002'), [self.second])
+        self.assertEqual(self.found('third@exa'), [self.third])
+
+    def test_ties_by_id(self):
+        self.assertEqual(self.found('asha'), [self.first, self.third])
+        self.assertEqual(self.found('example'), [self.first, self.second, self.third])
+
+    def test_every_match_as_a_subquery(self):
+        found = Participant.objects.filter(pk__in=matching_ids('asha'))
+        self.assertEqual(set(found), {self.first, self.third})
+
+    def test_unranked_leaves_the_ordering_to_the_changelist(self):
+        queryset = matching(Participant.objects.all(), 'asha', ranked=False)
+        self.assertEqual(list(queryset.query.order_by), ['pk'])
+        self.assertNotIn('search_rank', queryset.query.extra)
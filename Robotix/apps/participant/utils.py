@@ -1,3 +1,6 @@
+import re
+
+
 YEAR_CHOICES = (
     (1,'First'),
     (2,'Second'), 
@@ -5,3 +8,58 @@ YEAR_CHOICES = (
     (4,'Fourth'),
     (5,'Fifth'),
 )
+
+DUPLICATE_STATUS_CHOICES = (
+    ('pending', 'Pending'),
+    ('dismissed', 'Not a duplicate'),
+)
+
+
+def _words(value):
+    return re.findall(r'[a-z0-9]+', str(value).lower())
+
+
+def normalize_mobile(value):
+    """The 10 digit mobile number in ``value``, dropping any 0 or +91 prefix."""
+    digits = re.sub(r'\D', '', str(value))
+    if len(digits) >= 10:
+        return digits[-10:]
+    return None
+
+
+def normalize_email(value):
+    """``value`` lower-cased, without any +tag in the local part."""
+    local, sep, domain = value.strip().lower().partition('@')
+    return '{}@{}'.format(local.split('+')[0], domain) if sep else local
+
+
+def normalize_name(first_name, last_name):
+    return ' '.join(_words(first_name) + _words(last_name))
+
+
+def search_document(first_name, last_name, mobile, email, abbv):
+    """
+    The text indexed for a participant: name words, the mobile number,
+    the e-mail local part whole and in pieces, and the college abbreviation.
+    """
+    local = email.split('@')[0]
+    words = _words(first_name) + _words(last_name)
+    words.append(normalize_mobile(mobile) or str(mobile))
+    words.append(''.join(_words(local)))
+    words += _words(local)
+    words.append(''.join(_words(abbv)))
+    words += _words(abbv)
+    return ' '.join(sorted(set(word for word in words if word)))
+
+
+def search_tokens(term):
+    """Split a help desk search into the words to prefix-match."""
+    mobile = normalize_mobile(term) if re.match(r'^[\d\s+()-]+$', term) else None
+    if mobile:
+        return [mobile]
+    return [
+        word
+        for part in term.split()
+        for word in ([''.join(_words(part.split('@')[0]))] if '@' in part else _words(part))
+        if word
+    ]
@@ -0,0 +1,36 @@
+from django.contrib import admin
+
+from .models import Registration
+
+
+@admin.register(Registration)
+class RegistrationAdmin(admin.ModelAdmin):
+    list_display = [
+        'key',
+        'kind',
+        'status',
+        'ip',
+        'created',
+        'processed',
+    ]
+    list_filter = [
+        'status',
+        'kind',
+    ]
+    search_fields = [
+        '=key',
+        '=ip',
+    ]
+    readonly_fields = [
+        'key',
+        'kind',
+        'payload',
+        'status',
+        'result',
+        'ip',
+        'created',
+        'processed',
+    ]
+
+    def has_add_permission(self, request):
+        return False
@@ -0,0 +1,57 @@
+from django import forms
+
+from participant.models import Participant
+from team.events import event_choices
+from team.models import Team
+from team.validation import max_team_size
+
+
+class ParticipantForm(forms.ModelForm):
+
+    class Meta:
+        model = Participant
+        fields = ['first_name', 'last_name', 'mobile', 'email', 'year', 'college']
+        error_messages = {
+            # The form field would report the mobile validator's failures
+            # under its own 'invalid' message, "Enter a whole number."
+            'mobile': {'invalid': 'Invalid mobile number. Do NOT add a 0 or +91'},
+        }
+
+
+class MembersField(forms.Field):
+    """A JSON list of team members' mobile numbers, checked like Participant.mobile."""
+
+    def to_python(self, value):
+        if value in self.empty_values:
+            return []
+        if not isinstance(value, list):
+            raise forms.ValidationError('Expected a list of mobile numbers', code='invalid')
+        mobile = Participant._meta.get_field('mobile')
+        try:
+            return [mobile.clean(member, None) for member in value]
+        except forms.ValidationError as e:
+            raise forms.ValidationError(e.messages, code='invalid')
+
+
+class TeamForm(forms.ModelForm):
+    event = forms.ChoiceField(choices=event_choices)
+    members = MembersField()
+
+    class Meta:
+        model = Team
+        fields = ['name', 'street', 'locality', 'city', 'state', 'country', 'pin']
+
+    def clean(self):
+        cleaned_data = super(TeamForm, self).clean()
+        members = cleaned_data.get('members') or []
+        if len(set(members)) != len(members):
+            self.add_error('members', 'A member is listed more than once')
+        if cleaned_data.get('event') and len(members) > max_team_size(cleaned_data['event']):
+            self.add_error('members', 'Max team size is {}'.format(max_team_size(cleaned_data['event'])))
+        return cleaned_data
+
+
+FORMS = {
+    'participant': ParticipantForm,
+    'team': TeamForm,
+}
@@ -0,0 +1,28 @@
+import time
+
+from django.core.management.base import BaseCommand
+
+from registration.processing import BATCH_SIZE, process
+
+
+class Command(BaseCommand):
+    help = 'Apply queued API registrations in small transactional batches'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=BATCH_SIZE)
+        parser.add_argument('--interval', type=float, default=1,
+            help='Seconds to wait when the queue is empty',
+        )
+        parser.add_argument('--once', action='store_true',
+            help='Drain the queue and exit instead of waiting for more',
+        )
+
+    def handle(self, *args, **options):
+        while True:
+            processed = process(options['batch_size'])
+            if processed:
+                self.stdout.write('Processed {} registrations'.format(processed))
+            elif options['once']:
+                return
+            else:
+                time.sleep(options['interval'])
@@ -0,0 +1,44 @@
+import json
+
+from django.db import models
+
+from .utils import *
+
+
+class Registration(models.Model):
+    """A registration received through the API, waiting for or done by the queue."""
+    key         = models.CharField(
+        max_length=64,
+        unique=True,
+        help_text='Idempotency key sent by the client, or generated for it'
+    )
+    kind        = models.CharField(max_length=20, choices=KIND_CHOICES)
+    payload     = models.TextField()
+    status      = models.CharField(
+        max_length=10,
+        choices=STATUS_CHOICES,
+        default='pending'
+    )
+    result      = models.TextField(blank=True)
+    ip          = models.GenericIPAddressField(null=True, blank=True, verbose_name='IP address')
+    created     = models.DateTimeField(auto_now_add=True)
+    processed   = models.DateTimeField(null=True, blank=True)
+
+    def data(self):
+        return json.loads(self.payload)
+
+    def as_json(self):
+        return {
+            'key': self.key,
+            'kind': self.kind,
+            'status': self.status,
+            'result': json.loads(self.result) if self.result else None,
+        }
+
+    def __str__(self):
+        return '{} {}'.format(self.kind, self.key)
+
+    class Meta:
+        index_together = [
+            ('status', 'id'),
+        ]
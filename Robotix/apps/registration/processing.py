@@ -0,0 +1,160 @@
+"""
+The registration queue.
+
+API requests only validate and store a Registration; ``process`` later
+applies pending ones a small batch per transaction. A deadline rush then
+costs one short insert per request instead of a chain of writes holding
+SQLite's write lock, and no gunicorn worker waits on another's commit.
+Each registration is applied in a savepoint of its own, so one that
+raises is marked failed with the error and the rest of its batch stands.
+
+Run a single ``manage.py process_registrations`` worker: batches are
+claimed without row locks.
+
+A request without an Idempotency-Key gets one derived from who it
+registers, so a client that retries without a key still gets its first
+registration back instead of queueing the same team twice.
+"""
+import hashlib
+import json
+import logging
+
+from django.db import IntegrityError, transaction
+from django.utils import timezone
+
+from participant.models import Participant
+from team.validation import membership_errors
+
+from .forms import FORMS
+from .models import Registration
+
+
+BATCH_SIZE = 25
+
+logger = logging.getLogger('robotix.registrations')
+
+
+def canonical(payload):
+    return json.dumps(payload, sort_keys=True)
+
+
+def derived_key(kind, form):
+    """
+    The key of a registration sent without one: a digest of the team's
+    event and members' mobiles, or the participant's mobile and e-mail.
+    """
+    data = form.cleaned_data
+    if kind == 'team':
+        who = [data['event']] + sorted(data['members'])
+    else:
+        who = [data['mobile'], data['email'].lower()]
+    return hashlib.sha1(canonical([kind] + who).encode('utf-8')).hexdigest()
+
+
+def enqueue(kind, payload, key, ip=None, requeue_failed=False):
+    """
+    Store a validated registration under ``key``. Returns the registration
+    and whether it is new; a retry with the same key and payload gets the
+    original back, and a different payload under a used key raises
+    ValueError. With ``requeue_failed``, a failed registration under the
+    key is queued again with ``payload`` instead, as a derived key is
+    the only one its sender can use to try again.
+    """
+    try:
+        with transaction.atomic():
+            return Registration.objects.create(key=key, kind=kind, payload=canonical(payload), ip=ip), True
+    except IntegrityError:
+        registration = Registration.objects.get(key=key)
+        if requeue_failed and registration.status == 'failed' and registration.kind == kind:
+            registration.payload = canonical(payload)
+            registration.status = 'pending'
+            registration.result = ''
+            registration.ip = ip
+            registration.processed = None
+            registration.save()
+            return registration, True
+        if registration.kind != kind or registration.payload != canonical(payload):
+            raise ValueError('Idempotency key {} was already used for a different registration'.format(key))
+        return registration, False
+
+
+def _finish(registration, status, **result):
+    registration.status = status
+    registration.result = json.dumps(result)
+    registration.processed = timezone.now()
+    registration.save(update_fields=['status', 'result', 'processed'])
+
+
+def _crashed(registration, error):
+    logger.exception('Registration %s failed', registration.key)
+    _finish(registration, 'failed', errors={'__all__': ['{}: {}'.format(type(error).__name__, error)]})
+
+
+def _register_participants(registrations):
+    for registration in registrations:
+        try:
+            with transaction.atomic():
+                form = FORMS['participant'](registration.data())
+                if not form.is_valid():
+                    _finish(registration, 'failed', errors=form.errors)
+                    continue
+                participant = form.save()
+                _finish(registration, 'done', participant=participant.pk)
+        except Exception as e:
+            _crashed(registration, e)
+
+
+def _register_teams(registrations):
+    forms = []
+    for registration in registrations:
+        form = FORMS['team'](registration.data())
+        if form.is_valid():
+            forms.append((registration, form))
+        else:
+            _finish(registration, 'failed', errors=form.errors)
+
+    mobiles = {mobile for registration, form in forms for mobile in form.cleaned_data['members']}
+    participants = {}
+    for mobile, pk in Participant.objects.filter(mobile__in=mobiles).order_by('pk').values_list('mobile', 'pk'):
+        participants.setdefault(mobile, pk)
+
+    teams = []
+    for registration, form in forms:
+        missing = [mobile for mobile in form.cleaned_data['members'] if mobile not in participants]
+        if missing:
+            _finish(registration, 'failed', errors={'members': [
+                'No participant is registered with mobile {}'.format(mobile) for mobile in missing
+            ]})
+        else:
+            teams.append((registration, form))
+
+    errors = membership_errors([
+        (None, form.cleaned_data['event'], {participants[mobile] for mobile in form.cleaned_data['members']})
+        for registration, form in teams
+    ])
+    for i, (registration, form) in enumerate(teams):
+        if i in errors:
+            _finish(registration, 'failed', errors={'members': errors[i]})
+            continue
+        try:
+            with transaction.atomic():
+                team = form.save(commit=False)
+                team.event_id = form.cleaned_data['event']
+                team.save()
+                team.participant.set([participants[mobile] for mobile in form.cleaned_data['members']])
+                _finish(registration, 'done', team=str(team))
+        except Exception as e:
+            _crashed(registration, e)
+
+
+def process(batch_size=BATCH_SIZE):
+    """
+    Apply up to ``batch_size`` pending registrations in one transaction,
+    each in a savepoint.
+    """
+    with transaction.atomic():
+        batch = list(Registration.objects.filter(status='pending').order_by('pk')[:batch_size])
+        # Participants first, so a team can list members queued with it
+        _register_participants([registration for registration in batch if registration.kind == 'participant'])
+        _register_teams([registration for registration in batch if registration.kind == 'team'])
+    return len(batch)
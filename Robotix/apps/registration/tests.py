@@ -0,0 +1,141 @@
+import json
+from unittest import mock
+
+from django.core.cache import cache
+from django.core.urlresolvers import reverse
+from django.db import DatabaseError
+from django.test import TestCase
+
+from participant.models import Participant
+from team.models import Team
+
+from .forms import ParticipantForm
+from .models import Registration
+from .processing import enqueue, process
+
+
+def participant(mobile, **kwargs):
+    payload = {
+        'first_name': 'Asha', 'last_name': 'Rao', 'mobile': mobile,
+        'email': '{}@example.com'.format(mobile), 'year': 2, 'college': 1,
+    }
+    payload.update(kwargs)
+    return payload
+
+
+def team(*members, **kwargs):
+    payload = {
+        'event': 'FT', 'name': 'Asha Rao', 'street': 'Street', 'locality': 'Locality',
+        'city': 'City', 'state': 1, 'country': 1, 'pin': 721302, 'members': list(members),
+    }
+    payload.update(kwargs)
+    return payload
+
+
+class ProcessTests(TestCase):
+    fixtures = ['fixtures']
+
+    def result(self, key):
+        registration = Registration.objects.get(key=key)
+        return registration.status, json.loads(registration.result)
+
+    def test_enqueue_is_idempotent(self):
+        first, created = enqueue('participant', participant(9000000001), 'a')
+        self.assertTrue(created)
+        again, created = enqueue('participant', participant(9000000001), 'a')
+        self.assertEqual((again.pk, created), (first.pk, False))
+        with self.assertRaises(ValueError):
+            enqueue('participant', participant(9000000002), 'a')
+
+    def test_participants_and_their_team(self):
+        enqueue('participant', participant(9000000001), 'a')
+        enqueue('participant', participant(9000000002), 'b')
+        enqueue('team', team(9000000001, 9000000002), 'c')
+        self.assertEqual(process(), 3)
+
+        status, result = self.result('c')
+        self.assertEqual(status, 'done')
+        created = Team.objects.get()
+        self.assertEqual(result['team'], str(created))
+        self.assertEqual(created.event_id, 'FT')
+        self.assertEqual(
+            sorted(created.participant.values_list('mobile', flat=True)),
+            [9000000001, 9000000002],
+        )
+        self.assertEqual(process(), 0)
+
+    def test_invalid(self):
+        enqueue('participant', participant(9000000001, email='nowhere'), 'a')
+        enqueue('team', team(9000000009), 'b')
+        process()
+        status, result = self.result('a')
+        self.assertEqual((status, list(result['errors'])), ('failed', ['email']))
+        status, result = self.result('b')
+        self.assertEqual(status, 'failed')
+        self.assertIn('9000000009', result['errors']['members'][0])
+
+    def test_one_team_per_event(self):
+        enqueue('participant', participant(9000000001), 'a')
+        enqueue('team', team(9000000001), 'b')
+        enqueue('team', team(9000000001), 'c')
+        enqueue('team', team(9000000001, event='ST'), 'd')
+        process()
+        self.assertEqual(
+            [self.result(key)[0] for key in 'abcd'],
+            ['done', 'done', 'failed', 'done'],
+        )
+
+    def test_error_fails_only_its_registration(self):
+        save = ParticipantForm.save
+
+        def failing_save(form, *args, **kwargs):
+            obj = save(form, *args, **kwargs)
+            if obj.mobile == 9000000002:
+                raise DatabaseError('disk full')
+            return obj
+
+        for i, key in enumerate('abc', start=1):
+            enqueue('participant', participant(9000000000 + i), key)
+        with mock.patch.object(ParticipantForm, 'save', failing_save), \
+                self.assertLogs('robotix.registrations', 'ERROR'):
+            process()
+
+        self.assertEqual(self.result('b'), ('failed', {'errors': {'__all__': ['DatabaseError: disk full']}}))
+        self.assertEqual([self.result(key)[0] for key in 'ac'], ['done', 'done'])
+        # The failed registration's participant was rolled back with it
+        self.assertEqual(
+            sorted(Participant.objects.values_list('mobile', flat=True)),
+            [9000000001, 9000000003],
+        )
+
+
+class DerivedKeyTests(TestCase):
+    fixtures = ['fixtures']
+
+    def setUp(self):
+        # Every request comes from the same address
+        cache.clear()
+
+    def post(self, kind, payload):
+        url = reverse('registration:{}'.format(kind))
+        return self.client.post(url, json.dumps(payload), content_type='application/json')
+
+    def test_retry_without_a_key(self):
+        self.assertEqual(self.post('participant', participant(9000000001)).status_code, 202)
+        self.assertEqual(self.post('participant', participant(9000000001, email='9000000001@EXAMPLE.com')).status_code, 409)
+        self.assertEqual(self.post('team', team(9000000001)).status_code, 202)
+        response = self.post('team', team(9000000001))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(Registration.objects.count(), 2)
+
+        process()
+        self.assertEqual(Team.objects.count(), 1)
+        self.assertEqual(response.json()['key'], Registration.objects.get(kind='team').key)
+
+    def test_failed_registration_is_queued_again(self):
+        self.post('team', team(9000000001))
+        process()
+        self.post('participant', participant(9000000001))
+        self.assertEqual(self.post('team', team(9000000001)).status_code, 202)
+        process()
+        self.assertEqual(Registration.objects.get(kind='team').status, 'done')
@@ -0,0 +1,10 @@
+from django.conf.urls import url
+
+from . import views
+
+
+urlpatterns = [
+    url(r'^participants/$', views.register, {'kind': 'participant'}, name='participant'),
+    url(r'^teams/$', views.register, {'kind': 'team'}, name='team'),
+    url(r'^registrations/(?P<key>[^/]+)/$', views.status, name='status'),
+]
@@ -0,0 +1,10 @@
+KIND_CHOICES = (
+    ('participant', 'Participant'),
+    ('team', 'Team'),
+)
+
+STATUS_CHOICES = (
+    ('pending', 'Pending'),
+    ('done', 'Done'),
+    ('failed', 'Failed'),
+)
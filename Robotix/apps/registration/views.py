@@ -0,0 +1,71 @@
+import json
+from functools import wraps
+
+from django.conf import settings
+from django.core.urlresolvers import reverse
+from django.http import JsonResponse
+from django.shortcuts import get_object_or_404
+from django.views.decorators.csrf import csrf_exempt
+from django.views.decorators.http import require_GET, require_POST
+
+from miscellaneous.ratelimit import TokenBucket, client_ip
+
+from .forms import FORMS
+from .models import Registration
+from .processing import derived_key, enqueue
+
+
+bucket = TokenBucket('registration',
+    rate=getattr(settings, 'REGISTRATION_RATE', 0.2),
+    capacity=getattr(settings, 'REGISTRATION_BURST', 10),
+)
+
+
+def rate_limited(view):
+    @wraps(view)
+    def wrapper(request, *args, **kwargs):
+        wait = bucket.take(client_ip(request))
+        if wait:
+            response = JsonResponse({'errors': {'__all__': ['Too many requests, try again later']}}, status=429)
+            response['Retry-After'] = wait
+            return response
+        return view(request, *args, **kwargs)
+    return wrapper
+
+
+@csrf_exempt
+@require_POST
+@rate_limited
+def register(request, kind):
+    try:
+        payload = json.loads(request.body.decode('utf-8'))
+    except ValueError:
+        payload = None
+    if not isinstance(payload, dict):
+        return JsonResponse({'errors': {'__all__': ['Expected a JSON object']}}, status=400)
+
+    form = FORMS[kind](payload)
+    if not form.is_valid():
+        return JsonResponse({'errors': form.errors}, status=400)
+
+    key = request.META.get('HTTP_IDEMPOTENCY_KEY')
+    if key and len(key) > Registration._meta.get_field('key').max_length:
+        return JsonResponse({'errors': {'__all__': ['Idempotency key is too long']}}, status=400)
+    try:
+        if key:
+            registration, created = enqueue(kind, payload, key, client_ip(request))
+        else:
+            registration, created = enqueue(
+                kind, payload, derived_key(kind, form), client_ip(request), requeue_failed=True,
+            )
+    except ValueError as e:
+        return JsonResponse({'errors': {'__all__': [str(e)]}}, status=409)
+
+    data = registration.as_json()
+    data['url'] = reverse('registration:status', args=[registration.key])
+    return JsonResponse(data, status=202 if created else 200)
+
+
+@require_GET
+def status(request, key):
+    return JsonResponse(get_object_or_404(Registration, key=key).as_json())
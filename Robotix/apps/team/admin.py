@@ -1,76 +1,186 @@
-from django.http import HttpResponse
-from django.contrib import admin
+import json
+import os
+
+from django.conf.urls import url
+from django.contrib import admin, messages
+from django.core.exceptions import PermissionDenied
+from django.core.urlresolvers import reverse
+from django.db.models import Prefetch
+from django.http import QueryDict
+from django.template.response import TemplateResponse
+from django.utils.html import format_html
 from django import forms
 
-from import_export.admin import ExportMixin
-from import_export import resources
 from django_object_actions import DjangoObjectActions
 
-from miscellaneous.models import College
-
+from miscellaneous.changelist import ScalableChangeListMixin
+from miscellaneous.db import ReplicaChangeListMixin
+from miscellaneous.export import StreamingExportMixin, StreamingResource
+from miscellaneous.filters import CollegeListFilter
+from miscellaneous.models import College, Country, State
+from miscellaneous.reference import ReferenceFormFieldMixin, get
+from miscellaneous.responses import CachedResponseMixin
+from participant.models import Participant
+from participant.search import matches
+from certificate.runs import enqueue_run, run_response, start_run
+
+from .events import event_choices, event_name, rounds
+from .forms import ScoreImportForm
 from .models import *
+from .qualification import QUALIFY_FIELDS, promote, qualify
+from .scores import ScoreImport
+from .summary import members_changed
+from .validation import membership_errors, team_label
+
+
+class MembershipFormSet(forms.BaseInlineFormSet):
+    """
+    Checks the team size and one-team-per-event rules for every team the
+    inline touches, whether it hangs off a team or off a participant, and
+    brings those teams' summaries and leaderboards up to date on save.
+    """
+
+    def clean(self):
+        super(MembershipFormSet, self).clean()
+        if any(self.errors):
+            return
+        rows = [
+            (form.cleaned_data.get('team'), form.cleaned_data.get('participant'), form.cleaned_data.get('DELETE'))
+            for form in self.forms if form.cleaned_data
+        ]
+        if isinstance(self.instance, Team):
+            team = self.instance
+            members = {participant.pk for _, participant, delete in rows if participant and not delete}
+            batch = [(team.pk, team.event_id, members)]
+        else:
+            participant = self.instance
+            teams = {team.pk: team for team, _, delete in rows if team}
+            # Validation has already moved the instances on to their new
+            # teams; the teams they leave are in the initial data
+            teams.update(Team.objects.in_bulk([
+                form.initial['team'] for form in self.initial_forms
+                if form.initial.get('team') not in teams
+            ]))
+            members = {pk: set() for pk in teams}
+            others = self.model.objects.filter(team_id__in=teams).exclude(participant_id=participant.pk)
+            for team, member in others.values_list('team_id', 'participant_id'):
+                members[team].add(member)
+            for team, _, delete in rows:
+                if team and not delete:
+                    # A participant being added has no pk yet, nor any
+                    # memberships that could clash
+                    members[team.pk].add(participant.pk or 0)
+            batch = [(pk, teams[pk].event_id, members[pk]) for pk in sorted(teams)]
+        errors = membership_errors(batch)
+        if errors:
+            raise forms.ValidationError([
+                '{}: {}'.format(team_label(batch[i][1], batch[i][0]), error)
+                for i in sorted(errors) for error in errors[i]
+            ])
+
+    def save(self, commit=True):
+        teams = {form.initial.get('team') for form in self.initial_forms}
+        memberships = super(MembershipFormSet, self).save(commit)
+        if commit:
+            teams.update(membership.team_id for membership in memberships)
+            if isinstance(self.instance, Team):
+                teams.add(self.instance.pk)
+            # Saving through rows directly sends no signals
+            members_changed(pk for pk in teams if pk)
+        return memberships
+
+
+class TeamInline(admin.StackedInline):
+    """Memberships, of every event, on team and participant pages."""
+    model = Team.participant.through
+    formset = MembershipFormSet
+    extra = 0
+    verbose_name = 'Team'
+    verbose_name_plural = 'Teams'
+
+    def get_queryset(self, request):
+        return super(TeamInline, self).get_queryset(request).select_related('team')
+
+
+class EventListFilter(admin.SimpleListFilter):
+    title = 'Event'
+    parameter_name = 'event'
 
+    def lookups(self, request, model_admin):
+        return event_choices()
 
-def TeamInlineFactory(event):
-    class TeamInline(admin.StackedInline):
-        model = event.participant.through
-        extra = 0
-
-    return TeamInline
-
+    def queryset(self, request, queryset):
+        if self.value():
+            return queryset.filter(event=self.value())
+        return queryset
 
-class ParticipantCollegeFilter(admin.SimpleListFilter):
-    title = 'College'
-    parameter_name = 'college'
 
-    def lookups(self, request, model_admin):
-        return College.objects.values_list('pk', 'name')
+class ParticipantCollegeFilter(CollegeListFilter):
 
     def queryset(self, request, queryset):
         if self.value():
-            return queryset.filter(participant__college=self.value()).distinct()
+            members = queryset.model.participant.through.objects.filter(participant__college=self.value())
+            return queryset.filter(pk__in=members.values('team_id'))
         return queryset
 
 
-def TeamFormFactory(event):
-    class TeamForm(forms.ModelForm):
+class TeamForm(forms.ModelForm):
 
-        class Meta:
-            model = event
-            fields = '__all__'
+    class Meta:
+        model = Team
+        fields = '__all__'
 
-        def clean_participant(self):
-            if self.cleaned_data['participant'].count() > self.Meta.model.max_team_size:
-                raise forms.ValidationError(
-                    'Max team size is '+str(self.Meta.model.max_team_size),
-                    code='invalid'
-                )
-            return self.cleaned_data['participant']
+    def clean(self):
+        cleaned_data = super(TeamForm, self).clean()
+        event = cleaned_data['event'].code if cleaned_data.get('event') else self.instance.event_id
+        if event and 'participant' in cleaned_data:
+            members = {participant.pk for participant in cleaned_data['participant']}
+            errors = membership_errors([(self.instance.pk, event, members)])
+            if errors:
+                self.add_error('participant', errors[0])
+        return cleaned_data
 
-    return TeamForm
 
-class TeamResource(resources.ModelResource):
+class TeamResource(StreamingResource):
 
     class Meta:
-        model = Fortress
+        model = Team
         use_transactions = True
 
+    def prepare_queryset(self, queryset):
+        return queryset.prefetch_related(
+            Prefetch('participant', queryset=Participant.objects.select_related('college'))
+        )
+
+    def dehydrate_event(self, team):
+        return team.event_id
+
     def dehydrate_participant(self, team):
-        import os
         return os.linesep.join(
             '{} ({})'.format(participant.name, participant.mobile) \
             for participant in team.participant.all()
         )
 
     def dehydrate_state(self, team):
-        return team.state.name
+        return get(State, team.state_id).name
 
     def dehydrate_country(self, team):
-        return team.country.name
+        return get(Country, team.country_id).name
 
 
-class TeamAdmin(ExportMixin, DjangoObjectActions, admin.ModelAdmin):
+@admin.register(Team)
+class TeamAdmin(CachedResponseMixin, ReferenceFormFieldMixin, ReplicaChangeListMixin, ScalableChangeListMixin, StreamingExportMixin, DjangoObjectActions, admin.ModelAdmin):
+    form = TeamForm
     resource_class = TeamResource
+    inlines = [
+        TeamInline,
+    ]
+    change_list_template = 'admin/team/change_list.html'
+    cache_models = [
+        College,
+        QualificationRule,
+    ]
+    # Shows the search box; get_search_results searches the index instead
     search_fields = [
         '=participant__first_name',
         '=participant__last_name',
@@ -81,8 +191,10 @@ class TeamAdmin(ExportMixin, DjangoObjectActions, admin.ModelAdmin):
         'verify',
         'qualify_to_round_two',
         'qualify_to_round_three',
+        'print_participation_certificates',
+        'print_appreciation_certificates',
     ]
-    objectactions = [
+    change_actions = [
         'verify_this',
         'qualify_this',
         'print_participation',
@@ -90,9 +202,14 @@ class TeamAdmin(ExportMixin, DjangoObjectActions, admin.ModelAdmin):
     ]
 
     def get_fieldsets(self, request, obj=None, **kwargs):
+        # Each round's score, and beside it the flag the round before earned
+        scores = rounds(obj.event_id if obj else None)
+        scoring = [(scores[0],)] + [
+            (round, QUALIFY_FIELDS[previous]) for previous, round in zip(scores, scores[1:])
+        ]
         fieldsets = [
             (None, {
-                'fields': ('participant',),
+                'fields': ('event', 'participant',),
                 'classes': ('wide',)
             }),
             ('Complete Postal Address', {
@@ -106,11 +223,7 @@ class TeamAdmin(ExportMixin, DjangoObjectActions, admin.ModelAdmin):
                 'description': 'Enter the complete address. We may have to post certificates to this address.',
             }),
             ('Scoring', {
-                'fields': (
-                    ('round_one',),
-                    ('round_two', 'qualify_round_one',),
-                    ('round_three', 'qualify_round_two',),
-                ),
+                'fields': scoring,
                 'classes': ('wide'),
             }),
             ('Help Desk', {
@@ -124,20 +237,33 @@ class TeamAdmin(ExportMixin, DjangoObjectActions, admin.ModelAdmin):
             return fieldsets[:-2]
         return fieldsets
 
+    def get_readonly_fields(self, request, obj=None):
+        # The event is part of the team's number
+        if obj is not None:
+            return ['event']
+        return []
+
+    def get_changeform_initial_data(self, request):
+        initial = super(TeamAdmin, self).get_changeform_initial_data(request)
+        filters = QueryDict(request.GET.get('_changelist_filters', ''))
+        if 'event' in filters:
+            initial.setdefault('event', filters['event'])
+        return initial
+
     def get_list_display(self, request, obj=None, **kwargs):
-        list_display = [
-            'round_one',
-            'qualify_round_one',
-            'round_two',
-            'qualify_round_two',
-            'round_three',
-        ]
+        scores = rounds(request.GET.get('event'))
+        list_display = []
+        for round in scores:
+            list_display.append(round)
+            if round != scores[-1]:
+                list_display.append(QUALIFY_FIELDS[round])
         if request.user.get_username() == 'helpdesk':
-            return ['__str__', 'verification', 'certificate',] + list_display
-        return ['__str__',] + list_display
+            return ['__str__', 'member_names', 'verification', 'certificate',] + list_display
+        return ['__str__', 'member_names',] + list_display
 
     def get_list_filter(self, request, obj=None, **kwargs):
         list_filter = [
+            EventListFilter,
             ParticipantCollegeFilter,
             'qualify_round_one',
             'qualify_round_two',
@@ -146,68 +272,117 @@ class TeamAdmin(ExportMixin, DjangoObjectActions, admin.ModelAdmin):
             return ['verification', 'certificate',] + list_filter
         return list_filter
 
+    def get_search_results(self, request, queryset, search_term):
+        if not search_term:
+            return queryset, False
+        members = self.model.participant.through.objects.filter(
+            participant_id__in=Participant.objects.filter(matches(search_term)).values('pk'),
+        )
+        return queryset.filter(pk__in=members.values('team_id')), False
+
+    def get_urls(self):
+        urls = super(TeamAdmin, self).get_urls()
+        info = self.model._meta.app_label, self.model._meta.model_name
+        return [
+            url(r'^import-scores/$',
+                self.admin_site.admin_view(self.import_scores_view),
+                name='%s_%s_import_scores' % info),
+        ] + urls
+
+    def import_scores_view(self, request):
+        if not request.user.is_superuser:
+            raise PermissionDenied
+        form = ScoreImportForm(
+            request.POST or None,
+            request.FILES or None,
+            initial={'event': request.GET.get('event')},
+        )
+        scores = None
+        if form.is_valid():
+            lines = (line.decode('utf-8-sig') for line in form.cleaned_data['scores'])
+            scores = ScoreImport(form.cleaned_data['event']).read(lines)
+            if not scores.errors:
+                scores.plan().apply(
+                    form.cleaned_data['qualify'],
+                    form.cleaned_data['rule'],
+                    request.user,
+                    dry_run=form.cleaned_data['dry_run'],
+                )
+                if not form.cleaned_data['dry_run']:
+                    self.message_user(request, '{} changes imported'.format(len(scores.diff)))
+        context = dict(
+            self.admin_site.each_context(request),
+            opts=self.model._meta,
+            title='Import scores',
+            form=form,
+            scores=scores,
+        )
+        return TemplateResponse(request, 'admin/team/import_scores.html', context)
+
     def verify(self, request, queryset):
         rows = queryset.update(verification=True)
         self.message_user(request,  '{} teams marked as verified'.format(rows))
     verify.short_description = 'Verify selected teams'
 
+    def _events(self, queryset):
+        return sorted(queryset.order_by().values_list('event', flat=True).distinct())
+
+    def _qualify(self, request, queryset, round):
+        rules = {
+            rule.event_id: rule
+            for rule in QualificationRule.objects.filter(event__in=self._events(queryset), round=round)
+        }
+        for event in self._events(queryset):
+            if event not in rules:
+                self.message_user(request, 'There is no qualification rule for {} {} yet'.format(
+                    event_name(event), dict(QUALIFY_ROUND_CHOICES)[round],
+                ), messages.ERROR)
+                continue
+            decision = qualify(queryset, round, rules[event], request.user)
+            self.message_user(request, '{}: {} of {} teams qualify ({}): {} newly qualified, {} no longer'.format(
+                event_name(event),
+                len(json.loads(decision.qualified)),
+                decision.considered,
+                decision.rule,
+                decision.added,
+                decision.removed,
+            ))
+
     def qualify_to_round_two(self, request, queryset):
-        rows = queryset.update(qualify_round_one=True)
-        self.message_user(request, '{} teams are qualified to Round Two')
-    qualify_to_round_two.short_description = 'Qualify these teams to Round Two'
+        self._qualify(request, queryset, 'round_one')
+    qualify_to_round_two.short_description = 'Qualify to Round Two by the event\'s rule, among the selected teams'
 
     def qualify_to_round_three(self, request, queryset):
-        rows = queryset.update(qualify_round_two=True)
-        self.message_user(request, '{} teams are qualified to Round Three')
-    qualify_to_round_three.short_description = 'Qualify these teams to Round Three'
+        self._qualify(request, queryset, 'round_two')
+    qualify_to_round_three.short_description = 'Qualify to Round Three by the event\'s rule, among the selected teams'
 
     def print_participation(self, request, team):
-        from reportlab.pdfgen import canvas
-        from reportlab.lib.units import inch
-        response = HttpResponse(content_type='application/pdf')
-        response['Content-Disposition'] = 'attachment; filename="Certificate-{}.pdf"'.format(team)
-        p = canvas.Canvas(response)
-        for participant in team.participant.all():
-            text_obj = p.beginText()
-            text_obj.setFont('Helvetica-Oblique', 16)
-            text_obj.setTextOrigin(3.7*inch, 5.38*inch)
-            text_obj.textLine(participant.name.title())
-            text_obj.setTextOrigin(1.5*inch, 4.94*inch)
-            if len(participant.college.name) > 60:
-                text_obj.setHorizScale(80)
-            text_obj.textLine(participant.college.name)
-            text_obj.setTextOrigin(3*inch, 4.54*inch)
-            text_obj.textLine(self.form.Meta.model._meta.verbose_name)
-            p.drawText(text_obj)
-            p.showPage()
-        p.save()
-        return response
+        run = start_run(team.event_id, Team.objects.filter(pk=team.pk), 'participation', request.user, reprint=True)
+        return run_response(run, 'Certificate-{}'.format(team))
     print_participation.label = 'Print Participation Certificates'
 
-
     def print_appreciation(self, request, team):
-        from reportlab.pdfgen import canvas
-        from reportlab.lib.units import inch
-        response = HttpResponse(content_type='application/pdf')
-        response['Content-Disposition'] = 'attachment; filename="Certificate-{}.pdf"'.format(team)
-        p = canvas.Canvas(response)
-        for participant in team.participant.all():
-            text_obj = p.beginText()
-            text_obj.setFont('Helvetica-Oblique', 16)
-            text_obj.setTextOrigin(3.5*inch, 5*inch)
-            text_obj.textLine(participant.name.title())
-            text_obj.setTextOrigin(1.5*inch, 4.5*inch)
-            if len(participant.college.name) > 60:
-                text_obj.setHorizScale(80)
-            text_obj.textLine(participant.college.name)
-            text_obj.setTextOrigin(4*inch, 4.5*inch)
-            text_obj.textLine(self.form.Meta.model._meta.verbose_name)
-            p.drawText(text_obj)
-            p.showPage()
-        p.save()
-        return response
+        run = start_run(team.event_id, Team.objects.filter(pk=team.pk), 'appreciation', request.user, reprint=True)
+        return run_response(run, 'Certificate-{}'.format(team))
     print_appreciation.label = 'Print Appreciation Certificates'
 
+    def _print_certificates(self, request, queryset, kind):
+        for event in self._events(queryset):
+            job = enqueue_run(start_run(event, queryset.filter(event=event), kind, request.user), request.user)
+            self.message_user(request, format_html(
+                '{} certificates not issued yet are being printed in the background. <a href="{}">Follow the print run</a>',
+                event_name(event),
+                reverse('admin:jobs_job_change', args=[job.pk]),
+            ))
+
+    def print_participation_certificates(self, request, queryset):
+        self._print_certificates(request, queryset, 'participation')
+    print_participation_certificates.short_description = 'Print Participation Certificates for selected teams'
+
+    def print_appreciation_certificates(self, request, queryset):
+        self._print_certificates(request, queryset, 'appreciation')
+    print_appreciation_certificates.short_description = 'Print Appreciation Certificates for selected teams'
+
     def verify_this(self, request, team):
         team.verification=True
         team.save()
@@ -215,33 +390,75 @@ class TeamAdmin(ExportMixin, DjangoObjectActions, admin.ModelAdmin):
     verify_this.label = 'Verify'
 
     def qualify_this(self, request, team):
-        if team.qualify_round_one:
-            team.qualify_round_two = True
-        else:
-            team.qualify_round_one = True
-        team.save()
+        round = 'round_two' if team.qualify_round_one else 'round_one'
+        if round not in rounds(team.event_id)[:-1]:
+            self.message_user(request, 'Team {} has no round left to qualify for'.format(team), messages.ERROR)
+            return
+        decision = promote(team, request.user)
+        self.message_user(request, 'Team {} qualified from {}'.format(team, decision.get_round_display()))
     qualify_this.label = 'Qualify to the next Round'
 
 
-@admin.register(PolesApart)
-class PolesApartAdmin(TeamAdmin):
-    form = TeamFormFactory(PolesApart)
-    inlines = [
-        TeamInlineFactory(PolesApart),
+@admin.register(Event)
+class EventAdmin(admin.ModelAdmin):
+    list_display = [
+        'name',
+        'code',
+        'max_team_size',
+        'rounds',
     ]
 
-
-@admin.register(Fortress)
-class FortressAdmin(TeamAdmin):
-    form = TeamFormFactory(Fortress)
-    inlines = [
-        TeamInlineFactory(Fortress),
+    def get_readonly_fields(self, request, obj=None):
+        # Teams and their numbers refer to the event by its code
+        if obj is not None:
+            return ['code']
+        return []
+
+
+@admin.register(QualificationRule)
+class QualificationRuleAdmin(admin.ModelAdmin):
+    list_display = [
+        'event',
+        'round',
+        'top',
+        'cutoff',
+        'college_quota',
+    ]
+    list_select_related = [
+        'event',
     ]
 
 
-@admin.register(Stax)
-class StaxAdmin(TeamAdmin):
-    form = TeamFormFactory(Stax)
-    inlines = [
-        TeamInlineFactory(Stax),
+@admin.register(Qualification)
+class QualificationAdmin(admin.ModelAdmin):
+    list_display = [
+        '__str__',
+        'considered',
+        'added',
+        'removed',
+        'user',
+        'created',
+    ]
+    list_filter = [
+        'event',
+        'round',
     ]
+    list_select_related = [
+        'event',
+        'user',
+    ]
+    readonly_fields = [
+        'event',
+        'round',
+        'rule',
+        'considered',
+        'qualified',
+        'added',
+        'removed',
+        'user',
+        'created',
+    ]
+    fields = readonly_fields
+
+    def has_add_permission(self, request):
+        return False
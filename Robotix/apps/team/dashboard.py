@@ -0,0 +1,45 @@
+from django import forms
+from django.core.urlresolvers import reverse
+
+from jet.dashboard.modules import DashboardModule
+
+from .leaderboard import ROUNDS, college_breakdown, standings
+from .events import event_choices
+
+
+class LeaderboardSettingsForm(forms.Form):
+    event = forms.ChoiceField(choices=event_choices)
+    round = forms.ChoiceField(choices=ROUNDS)
+    limit = forms.IntegerField(min_value=1, label='Teams shown')
+    colleges = forms.BooleanField(required=False, label='Show college breakdown')
+
+
+class Leaderboard(DashboardModule):
+    """Read-only top of an event's ranking for one round."""
+    title = 'Leaderboard'
+    template = 'admin/team/leaderboard_module.html'
+    settings_form = LeaderboardSettingsForm
+    event = 'PA'
+    round = 'round_one'
+    limit = 10
+    colleges = False
+
+    def settings_dict(self):
+        return {
+            'event': self.event,
+            'round': self.round,
+            'limit': self.limit,
+            'colleges': self.colleges,
+        }
+
+    def load_settings(self, settings):
+        self.event = settings.get('event', self.event)
+        self.round = settings.get('round', self.round)
+        self.limit = int(settings.get('limit', self.limit))
+        self.colleges = settings.get('colleges', self.colleges)
+
+    def init_with_context(self, context):
+        self.title_url = '{}?event={}'.format(reverse('admin:team_team_changelist'), self.event)
+        self.children = standings(self.event, self.round)[:self.limit]
+        if self.colleges:
+            self.breakdown = college_breakdown(self.event, self.round)[:self.limit]
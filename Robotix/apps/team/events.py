@@ -0,0 +1,47 @@
+"""
+The event registry.
+
+Events are rows of Event, so adding one is adding a row from the admin.
+Everything that needs the events, their names, team sizes or rounds (the
+team admin and its filters, forms, leaderboards, certificates) reads them
+through ``events()``. It keeps the whole table in the shared cache and in
+each worker's memory under the ``events`` generation, which
+``team.signals`` bumps whenever an event is saved or deleted.
+"""
+from collections import OrderedDict
+
+from miscellaneous.cache import Generation
+
+from .leaderboard import ROUNDS
+from .models import Event
+
+
+registry = Generation('events', timeout=24*60*60, local_size=10)
+
+
+def events():
+    """``{code: Event}`` for every event, ordered by name."""
+    return registry.get_or_set(
+        ('events',),
+        lambda: OrderedDict((event.code, event) for event in Event.objects.all()),
+    )
+
+
+def get_event(code):
+    """The Event with this code, or None."""
+    return events().get(code)
+
+
+def event_name(code):
+    event = get_event(code)
+    return event.name if event else code
+
+
+def event_choices():
+    return [(code, event.name) for code, event in events().items()]
+
+
+def rounds(code):
+    """The score fields of the rounds the event ``code`` has, all three if it is unknown."""
+    event = get_event(code)
+    return [round for round, name in ROUNDS[:event.rounds if event else None]]
@@ -0,0 +1,49 @@
+from django import forms
+
+from .events import event_choices, event_name
+from .qualification import QUALIFY_FIELDS, import_rule
+
+
+class ScoreImportForm(forms.Form):
+    event = forms.ChoiceField(choices=event_choices)
+    scores = forms.FileField(
+        help_text='CSV with a team column (e.g. FT-12) and any of round_one, round_two, round_three',
+    )
+    qualify = forms.ChoiceField(
+        required=False,
+        choices=[('', 'Leave qualification as it is')] + [
+            (field, 'Qualify from {}'.format(field.replace('_', ' '))) for field in sorted(QUALIFY_FIELDS)
+        ],
+    )
+    top = forms.IntegerField(required=False, min_value=1,
+        help_text='Qualify the top N teams, ties included. Leave the limits blank to use the event\'s rule',
+    )
+    cutoff = forms.IntegerField(required=False,
+        help_text='Only teams scoring at least this much qualify',
+    )
+    college_quota = forms.IntegerField(required=False, min_value=1,
+        help_text='At most this many teams of one college qualify',
+    )
+    dry_run = forms.BooleanField(required=False, initial=True,
+        help_text='Only show what would change',
+    )
+
+    def clean(self):
+        cleaned_data = super(ScoreImportForm, self).clean()
+        cleaned_data['rule'] = None
+        if cleaned_data.get('qualify') and cleaned_data.get('event'):
+            cleaned_data['rule'] = import_rule(
+                cleaned_data['event'],
+                cleaned_data['qualify'],
+                cleaned_data.get('top'),
+                cleaned_data.get('cutoff'),
+                cleaned_data.get('college_quota'),
+            )
+            if cleaned_data['rule'] is None:
+                raise forms.ValidationError(
+                    'There is no qualification rule for {} {} yet, give a top N, a cutoff or a college quota'.format(
+                        event_name(cleaned_data['event']), cleaned_data['qualify'].replace('_', ' '),
+                    ),
+                    code='invalid',
+                )
+        return cleaned_data
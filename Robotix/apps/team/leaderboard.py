@@ -0,0 +1,88 @@
+"""
+Per-event, per-round rankings.
+
+Standings are computed with one indexed query per event and round, and
+kept in the shared cache under a generation of their own per event, so a
+live round with many volunteers refreshing the dashboard costs one query
+per score change rather than one per page view. ``team.signals`` and the
+bulk score import bump an event's generation whenever one of its scores
+changes.
+"""
+from miscellaneous.cache import Generation
+
+from .models import Team
+
+
+ROUNDS = (
+    ('round_one', 'Round One'),
+    ('round_two', 'Round Two'),
+    ('round_three', 'Round Three'),
+)
+
+boards = {}
+
+
+def board(event_code):
+    if event_code not in boards:
+        boards[event_code] = Generation('leaderboard:{}'.format(event_code), timeout=60*60)
+    return boards[event_code]
+
+
+def invalidate(event_code):
+    board(event_code).bump()
+
+
+def _standings(event_code, round):
+    teams = list(
+        Team.objects.filter(event=event_code, **{'{}__isnull'.format(round): False})
+        .order_by('-{}'.format(round), 'pk')
+        .values_list('pk', 'name', round)
+    )
+    colleges = {}
+    members = Team.participant.through.objects.filter(
+        team__event=event_code,
+        **{'team__{}__isnull'.format(round): False}
+    ).values_list('team_id', 'participant__college__name').distinct()
+    for team, college in members:
+        colleges.setdefault(team, []).append(college)
+
+    # Standard competition ranking: tied teams share a rank and the next
+    # rank skips as many places as there were ties
+    standings = []
+    for place, (pk, name, score) in enumerate(teams, start=1):
+        rank = standings[-1]['rank'] if standings and standings[-1]['score'] == score else place
+        standings.append({
+            'team': '{}-{}'.format(event_code, pk),
+            'pk': pk,
+            'name': name,
+            'score': score,
+            'rank': rank,
+            'colleges': sorted(colleges.get(pk, [])),
+        })
+    return standings
+
+
+def standings(event_code, round):
+    """Every scored team of the event in ``round``, best first, with ranks."""
+    return board(event_code).get_or_set(
+        ('standings', round),
+        lambda: _standings(event_code, round),
+    )
+
+
+def college_breakdown(event_code, round):
+    """Per college: number of ranked teams, best rank and best score, best first."""
+    def load():
+        colleges = {}
+        for standing in standings(event_code, round):
+            for college in standing['colleges']:
+                if college not in colleges:
+                    colleges[college] = {
+                        'college': college,
+                        'teams': 0,
+                        'rank': standing['rank'],
+                        'score': standing['score'],
+                    }
+                colleges[college]['teams'] += 1
+        return sorted(colleges.values(), key=lambda row: (row['rank'], row['college']))
+    return board(event_code).get_or_set(('colleges', round), load)
@@ -0,0 +1,29 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from team.events import event_choices
+from team.validation import audit
+
+
+class Command(BaseCommand):
+    help = 'Report teams that break the team size or one-team-per-event rules'
+
+    def add_arguments(self, parser):
+        parser.add_argument('events', nargs='*', metavar='event',
+            help='Event codes to audit, e.g. PA, FT or ST (defaults to all events)',
+        )
+
+    def handle(self, *args, **options):
+        codes = [code for code, name in event_choices()]
+        events = [event.upper() for event in options['events']] or codes
+        for event in events:
+            if event not in codes:
+                raise CommandError('Unknown event "{}"'.format(event))
+
+        problems = 0
+        for event in events:
+            for team, error in audit(event):
+                self.stdout.write('{}\t{}'.format(team, error))
+                problems += 1
+        if problems:
+            raise CommandError('{} problems found'.format(problems))
+        self.stdout.write('No problems found')
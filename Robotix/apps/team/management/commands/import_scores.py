@@ -0,0 +1,61 @@
+import json
+
+from django.core.exceptions import ValidationError
+from django.core.management.base import BaseCommand, CommandError
+
+from team.events import get_event
+from team.qualification import QUALIFY_FIELDS, import_rule
+from team.scores import ScoreImport
+
+
+class Command(BaseCommand):
+    help = 'Import round scores of an event from a CSV and optionally qualify teams'
+
+    def add_arguments(self, parser):
+        parser.add_argument('event', help='Event code, e.g. PA, FT or ST')
+        parser.add_argument('scores', help='CSV with a team column and round_one, round_two or round_three columns')
+        parser.add_argument('--qualify', choices=sorted(QUALIFY_FIELDS),
+            help='Qualify the event\'s teams from this round on the new scores, by the event\'s rule '
+                 'for the round unless limits are given',
+        )
+        parser.add_argument('--top', type=int, help='Qualify the top N teams, ties included')
+        parser.add_argument('--cutoff', type=int, help='Only teams scoring at least this much qualify')
+        parser.add_argument('--college-quota', type=int, help='At most this many teams of one college qualify')
+        parser.add_argument('--dry-run', action='store_true',
+            help='Only report what would change',
+        )
+
+    def handle(self, *args, **options):
+        event = options['event'].upper()
+        if get_event(event) is None:
+            raise CommandError('Unknown event "{}"'.format(options['event']))
+        rule = None
+        if options['qualify']:
+            try:
+                rule = import_rule(event, options['qualify'], options['top'], options['cutoff'], options['college_quota'])
+            except ValidationError as e:
+                raise CommandError('; '.join(e.messages))
+            if rule is None:
+                raise CommandError('{} has no rule for {} yet, give --top, --cutoff or --college-quota'.format(
+                    event, options['qualify'],
+                ))
+
+        with open(options['scores'], encoding='utf-8-sig', newline='') as lines:
+            scores = ScoreImport(event).read(lines)
+        if scores.errors:
+            for line, error in scores.errors:
+                self.stderr.write('Line {}: {}'.format(line, error) if line else error)
+            raise CommandError('Nothing imported, fix the errors above')
+
+        scores.plan().apply(options['qualify'], rule, dry_run=options['dry_run'])
+        for team, field, old, new in scores.diff:
+            self.stdout.write('{}\t{}\t{} -> {}'.format(team, field, old, new))
+        self.stdout.write('{} {} changes for {} teams'.format(
+            'Would make' if options['dry_run'] else 'Made',
+            len(scores.diff),
+            len({team for team, field, old, new in scores.diff}),
+        ))
+        if scores.decision is not None:
+            self.stdout.write('{} of {} teams qualify ({})'.format(
+                len(json.loads(scores.decision.qualified)), scores.decision.considered, scores.decision.rule,
+            ))
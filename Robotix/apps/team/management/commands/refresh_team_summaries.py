@@ -0,0 +1,13 @@
+from django.core.management.base import BaseCommand
+
+from team.models import Team
+from team.summary import refresh
+
+
+class Command(BaseCommand):
+    help = 'Rebuild the member summary of every team, e.g. after loading fixtures'
+
+    def handle(self, *args, **options):
+        pks = list(Team.objects.values_list('pk', flat=True))
+        refresh(pks)
+        self.stdout.write('{} team summaries refreshed'.format(len(pks)))
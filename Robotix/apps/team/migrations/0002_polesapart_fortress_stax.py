@@ -0,0 +1,157 @@
+# -*- coding: utf-8 -*-
+# Generated by Django 1.10.5 on 2026-10-18 16:53
+from __future__ import unicode_literals
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+def check_retired_events(apps, schema_editor):
+    """
+    BombDisposal, Bricks and Conquest are dropped below, as no event uses
+    them any more. Refuse to drop teams along with them.
+    """
+    counts = [
+        (model_name, apps.get_model('team', model_name).objects.count())
+        for model_name in ('BombDisposal', 'Bricks', 'Conquest')
+    ]
+    teams = ['{} {}'.format(count, model_name) for model_name, count in counts if count]
+    if teams:
+        raise RuntimeError(
+            'The retired event tables still hold teams ({}). Back up the team_bombdisposal, '
+            'team_bricks and team_conquest tables and their _participant tables, then empty '
+            'them before migrating.'.format(', '.join(teams))
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('miscellaneous', '0001_initial'),
+        ('participant', '0001_initial'),
+        ('team', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.RunPython(check_retired_events, migrations.RunPython.noop),
+        migrations.CreateModel(
+            name='Fortress',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(help_text="Provide Team leader's or caretaker's full name", max_length=50, verbose_name="Receiver's Name")),
+                ('street', models.CharField(max_length=100)),
+                ('locality', models.CharField(max_length=100)),
+                ('city', models.CharField(max_length=100)),
+                ('pin', models.IntegerField()),
+                ('certificate', models.BooleanField(default=False, verbose_name='Given certificate')),
+                ('verification', models.BooleanField(default=False, verbose_name='Verified')),
+                ('round_one', models.IntegerField(blank=True, null=True, verbose_name='Round One Score')),
+                ('qualify_round_one', models.BooleanField(default=False, verbose_name='Qualified for Round Two')),
+                ('round_two', models.IntegerField(blank=True, null=True, verbose_name='Round Two Score')),
+                ('qualify_round_two', models.BooleanField(default=False, verbose_name='Qualified for Round Three')),
+                ('round_three', models.IntegerField(blank=True, null=True, verbose_name='Round Three Score')),
+                ('country', models.ForeignKey(default=1, on_delete=django.db.models.deletion.CASCADE, to='miscellaneous.Country')),
+                ('participant', models.ManyToManyField(help_text="<strong>Type in team member's name, mobile or e-mail to begin a search</strong><br>", related_name='team_fortress_related', to='participant.Participant', verbose_name='Team Members')),
+                ('state', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='miscellaneous.State')),
+            ],
+            options={
+                'verbose_name': 'Fortress',
+                'verbose_name_plural': 'Fortress',
+            },
+        ),
+        migrations.CreateModel(
+            name='PolesApart',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(help_text="Provide Team leader's or caretaker's full name", max_length=50, verbose_name="Receiver's Name")),
+                ('street', models.CharField(max_length=100)),
+                ('locality', models.CharField(max_length=100)),
+                ('city', models.CharField(max_length=100)),
+                ('pin', models.IntegerField()),
+                ('certificate', models.BooleanField(default=False, verbose_name='Given certificate')),
+                ('verification', models.BooleanField(default=False, verbose_name='Verified')),
+                ('round_one', models.IntegerField(blank=True, null=True, verbose_name='Round One Score')),
+                ('qualify_round_one', models.BooleanField(default=False, verbose_name='Qualified for Round Two')),
+                ('round_two', models.IntegerField(blank=True, null=True, verbose_name='Round Two Score')),
+                ('qualify_round_two', models.BooleanField(default=False, verbose_name='Qualified for Round Three')),
+                ('round_three', models.IntegerField(blank=True, null=True, verbose_name='Round Three Score')),
+                ('country', models.ForeignKey(default=1, on_delete=django.db.models.deletion.CASCADE, to='miscellaneous.Country')),
+                ('participant', models.ManyToManyField(help_text="<strong>Type in team member's name, mobile or e-mail to begin a search</strong><br>", related_name='team_polesapart_related', to='participant.Participant', verbose_name='Team Members')),
+                ('state', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='miscellaneous.State')),
+            ],
+            options={
+                'verbose_name': 'PolesApart',
+                'verbose_name_plural': 'PolesApart',
+            },
+        ),
+        migrations.CreateModel(
+            name='Stax',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(help_text="Provide Team leader's or caretaker's full name", max_length=50, verbose_name="Receiver's Name")),
+                ('street', models.CharField(max_length=100)),
+                ('locality', models.CharField(max_length=100)),
+                ('city', models.CharField(max_length=100)),
+                ('pin', models.IntegerField()),
+                ('certificate', models.BooleanField(default=False, verbose_name='Given certificate')),
+                ('verification', models.BooleanField(default=False, verbose_name='Verified')),
+                ('round_one', models.IntegerField(blank=True, null=True, verbose_name='Round One Score')),
+                ('qualify_round_one', models.BooleanField(default=False, verbose_name='Qualified for Round Two')),
+                ('round_two', models.IntegerField(blank=True, null=True, verbose_name='Round Two Score')),
+                ('qualify_round_two', models.BooleanField(default=False, verbose_name='Qualified for Round Three')),
+                ('round_three', models.IntegerField(blank=True, null=True, verbose_name='Round Three Score')),
+                ('country', models.ForeignKey(default=1, on_delete=django.db.models.deletion.CASCADE, to='miscellaneous.Country')),
+                ('participant', models.ManyToManyField(help_text="<strong>Type in team member's name, mobile or e-mail to begin a search</strong><br>", related_name='team_stax_related', to='participant.Participant', verbose_name='Team Members')),
+                ('state', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='miscellaneous.State')),
+            ],
+            options={
+                'verbose_name': 'Stax',
+                'verbose_name_plural': 'Stax',
+            },
+        ),
+        migrations.RemoveField(
+            model_name='bombdisposal',
+            name='country',
+        ),
+        migrations.RemoveField(
+            model_name='bombdisposal',
+            name='participant',
+        ),
+        migrations.RemoveField(
+            model_name='bombdisposal',
+            name='state',
+        ),
+        migrations.RemoveField(
+            model_name='bricks',
+            name='country',
+        ),
+        migrations.RemoveField(
+            model_name='bricks',
+            name='participant',
+        ),
+        migrations.RemoveField(
+            model_name='bricks',
+            name='state',
+        ),
+        migrations.RemoveField(
+            model_name='conquest',
+            name='country',
+        ),
+        migrations.RemoveField(
+            model_name='conquest',
+            name='participant',
+        ),
+        migrations.RemoveField(
+            model_name='conquest',
+            name='state',
+        ),
+        migrations.DeleteModel(
+            name='BombDisposal',
+        ),
+        migrations.DeleteModel(
+            name='Bricks',
+        ),
+        migrations.DeleteModel(
+            name='Conquest',
+        ),
+    ]
@@ -0,0 +1,73 @@
+# -*- coding: utf-8 -*-
+from __future__ import unicode_literals
+
+from django.core.management.color import no_style
+from django.db import migrations
+
+
+EVENTS = (
+    ('PolesApart', 'PA'),
+    ('Fortress', 'FT'),
+    ('Stax', 'ST'),
+)
+
+FIELDS = (
+    'name', 'street', 'locality', 'city', 'state_id', 'country_id', 'pin',
+    'certificate', 'verification',
+    'round_one', 'qualify_round_one',
+    'round_two', 'qualify_round_two',
+    'round_three',
+)
+
+
+def copy_event_teams(apps, schema_editor):
+    """
+    Move every per-event team and its members into the shared team table.
+    Teams keep their primary keys, and so their public numbers (FT-12),
+    unless an event earlier in EVENTS has a team with the same key; those
+    are numbered after all the others and listed as they are copied.
+    """
+    Team = apps.get_model('team', 'Team')
+    Membership = Team.participant.through
+    memberships = []
+    clashes = []
+    taken = set()
+
+    def copy(old, code, **kwargs):
+        team = Team.objects.create(
+            event=code,
+            **dict({field: getattr(old, field) for field in FIELDS}, **kwargs)
+        )
+        memberships.extend(
+            Membership(team_id=team.pk, participant_id=participant_id)
+            for participant_id in old.participant.values_list('pk', flat=True)
+        )
+        return team
+
+    for model_name, code in EVENTS:
+        Event = apps.get_model('team', model_name)
+        for old in Event.objects.order_by('pk'):
+            if old.pk in taken:
+                clashes.append((code, old))
+            else:
+                taken.add(old.pk)
+                copy(old, code, pk=old.pk)
+
+    # Rows inserted with their own keys leave PostgreSQL's sequence behind
+    for sql in schema_editor.connection.ops.sequence_reset_sql(no_style(), [Team]):
+        schema_editor.execute(sql)
+    for code, old in clashes:
+        team = copy(old, code)
+        print('  {}-{} is now {}-{}'.format(code, old.pk, code, team.pk))
+    Membership.objects.bulk_create(memberships)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('team', '0003_team'),
+    ]
+
+    operations = [
+        migrations.RunPython(copy_event_teams),
+    ]
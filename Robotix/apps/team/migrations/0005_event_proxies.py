@@ -0,0 +1,56 @@
+# -*- coding: utf-8 -*-
+from __future__ import unicode_literals
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('team', '0004_copy_event_teams'),
+    ]
+
+    operations = [
+        migrations.DeleteModel(
+            name='PolesApart',
+        ),
+        migrations.DeleteModel(
+            name='Fortress',
+        ),
+        migrations.DeleteModel(
+            name='Stax',
+        ),
+        migrations.CreateModel(
+            name='PolesApart',
+            fields=[
+            ],
+            options={
+                'verbose_name': 'PolesApart',
+                'verbose_name_plural': 'PolesApart',
+                'proxy': True,
+            },
+            bases=('team.team',),
+        ),
+        migrations.CreateModel(
+            name='Fortress',
+            fields=[
+            ],
+            options={
+                'verbose_name': 'Fortress',
+                'verbose_name_plural': 'Fortress',
+                'proxy': True,
+            },
+            bases=('team.team',),
+        ),
+        migrations.CreateModel(
+            name='Stax',
+            fields=[
+            ],
+            options={
+                'verbose_name': 'Stax',
+                'verbose_name_plural': 'Stax',
+                'proxy': True,
+            },
+            bases=('team.team',),
+        ),
+    ]
@@ -0,0 +1,19 @@
+# -*- coding: utf-8 -*-
+# Generated by Django 1.10.5 on 2026-10-18 16:56
+from __future__ import unicode_literals
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('team', '0005_event_proxies'),
+    ]
+
+    operations = [
+        migrations.AlterIndexTogether(
+            name='team',
+            index_together=set([('qualify_round_one', 'event'), ('event', 'certificate'), ('qualify_round_two', 'event'), ('event', 'verification')]),
+        ),
+    ]
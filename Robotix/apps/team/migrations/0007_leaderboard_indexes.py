@@ -0,0 +1,19 @@
+# -*- coding: utf-8 -*-
+# Generated by Django 1.10.5 on 2026-10-18 17:03
+from __future__ import unicode_literals
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('team', '0006_admin_filter_indexes'),
+    ]
+
+    operations = [
+        migrations.AlterIndexTogether(
+            name='team',
+            index_together=set([('qualify_round_two', 'event'), ('event', 'round_two'), ('qualify_round_one', 'event'), ('event', 'round_one'), ('event', 'certificate'), ('event', 'verification'), ('event', 'round_three')]),
+        ),
+    ]
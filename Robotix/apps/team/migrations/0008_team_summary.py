@@ -0,0 +1,59 @@
+# -*- coding: utf-8 -*-
+# Generated by Django 1.10.5 on 2026-10-18 17:26
+from __future__ import unicode_literals
+
+from collections import defaultdict
+
+from django.db import migrations, models
+
+
+def fill_summaries(apps, schema_editor):
+    """
+    Fill in the member summary of existing teams. Same result as
+    team.summary.refresh, written against the historical models.
+    """
+    Team = apps.get_model('team', 'Team')
+    Membership = Team.participant.through
+    members = defaultdict(list)
+    memberships = Membership.objects.select_related('participant__college').order_by('participant_id')
+    for membership in memberships:
+        members[membership.team_id].append(membership.participant)
+    for team_pk, participants in members.items():
+        colleges = []
+        for participant in participants:
+            if participant.college.name not in colleges:
+                colleges.append(participant.college.name)
+        Team.objects.filter(pk=team_pk).update(
+            member_names=', '.join(
+                '{} {}'.format(participant.first_name, participant.last_name).title()
+                for participant in participants
+            ),
+            member_colleges=', '.join(colleges),
+            member_count=len(participants),
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('team', '0007_leaderboard_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='team',
+            name='member_colleges',
+            field=models.TextField(blank=True, editable=False, verbose_name='Colleges'),
+        ),
+        migrations.AddField(
+            model_name='team',
+            name='member_count',
+            field=models.PositiveSmallIntegerField(default=0, editable=False, verbose_name='Team size'),
+        ),
+        migrations.AddField(
+            model_name='team',
+            name='member_names',
+            field=models.TextField(blank=True, editable=False, verbose_name='Members'),
+        ),
+        migrations.RunPython(fill_summaries, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,51 @@
+# -*- coding: utf-8 -*-
+# Generated by Django 1.10.5 on 2026-10-18 17:45
+from __future__ import unicode_literals
+
+from django.conf import settings
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+        ('team', '0008_team_summary'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Qualification',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('event', models.CharField(choices=[('PA', 'PolesApart'), ('FT', 'Fortress'), ('ST', 'Stax')], max_length=2)),
+                ('round', models.CharField(choices=[('round_one', 'Round One, to Round Two'), ('round_two', 'Round Two, to Round Three')], max_length=10)),
+                ('rule', models.CharField(max_length=100)),
+                ('considered', models.PositiveIntegerField(help_text='Teams the rule was applied to')),
+                ('qualified', models.TextField(help_text='JSON list of [team, score, college, place] of every team that qualified')),
+                ('added', models.PositiveIntegerField(default=0)),
+                ('removed', models.PositiveIntegerField(default=0)),
+                ('created', models.DateTimeField(auto_now_add=True)),
+                ('user', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'ordering': ('-created',),
+            },
+        ),
+        migrations.CreateModel(
+            name='QualificationRule',
+            fields=[
+                ('id', models.AutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('event', models.CharField(choices=[('PA', 'PolesApart'), ('FT', 'Fortress'), ('ST', 'Stax')], max_length=2)),
+                ('round', models.CharField(choices=[('round_one', 'Round One, to Round Two'), ('round_two', 'Round Two, to Round Three')], help_text='The round whose scores decide who goes on to the next', max_length=10)),
+                ('top', models.PositiveIntegerField(blank=True, help_text='Qualify the best N teams, ties at the boundary included', null=True)),
+                ('cutoff', models.IntegerField(blank=True, help_text='Only teams scoring at least this much qualify', null=True)),
+                ('college_quota', models.PositiveSmallIntegerField(blank=True, help_text='At most this many teams of one college qualify, its best first. A team belongs to the college most of its members are from', null=True)),
+            ],
+        ),
+        migrations.AlterUniqueTogether(
+            name='qualificationrule',
+            unique_together=set([('event', 'round')]),
+        ),
+    ]
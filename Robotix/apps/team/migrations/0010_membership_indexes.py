@@ -0,0 +1,38 @@
+# -*- coding: utf-8 -*-
+from __future__ import unicode_literals
+
+from django.db import migrations
+
+
+def index_memberships(apps, schema_editor):
+    """
+    Index the team to participant table on both columns where 0003 left
+    it without (SQLite), as qualification ranks teams by their members.
+    """
+    through = apps.get_model('team', 'Team').participant.through
+    table = through._meta.db_table
+    with schema_editor.connection.cursor() as cursor:
+        constraints = schema_editor.connection.introspection.get_constraints(cursor, table)
+    indexed = {
+        tuple(constraint['columns'])[0]
+        for constraint in constraints.values()
+        if constraint['index'] or constraint['unique']
+    }
+    for column in ('team_id', 'participant_id'):
+        if column not in indexed:
+            schema_editor.execute('CREATE INDEX {} ON {} ({})'.format(
+                schema_editor.quote_name('{}_{}'.format(table, column)),
+                schema_editor.quote_name(table),
+                schema_editor.quote_name(column),
+            ))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('team', '0009_qualification'),
+    ]
+
+    operations = [
+        migrations.RunPython(index_memberships, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,67 @@
+# -*- coding: utf-8 -*-
+# Generated by Django 1.10.5 on 2026-10-18 17:57
+from __future__ import unicode_literals
+
+import django.core.validators
+from django.db import migrations, models
+
+
+# The events that were classes until now
+EVENTS = (
+    ('PA', 'PolesApart'),
+    ('FT', 'Fortress'),
+    ('ST', 'Stax'),
+)
+
+
+def create_events(apps, schema_editor):
+    Event = apps.get_model('team', 'Event')
+    for code, name in EVENTS:
+        Event.objects.get_or_create(code=code, defaults={'name': name, 'max_team_size': 4, 'rounds': 3})
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('team', '0010_membership_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Event',
+            fields=[
+                ('code', models.CharField(help_text='Two letters, used in team numbers such as FT-12', max_length=2, primary_key=True, serialize=False)),
+                ('name', models.CharField(max_length=50, unique=True)),
+                ('max_team_size', models.PositiveSmallIntegerField(default=4)),
+                ('rounds', models.PositiveSmallIntegerField(default=3, help_text='Rounds scored, up to three', validators=[django.core.validators.MinValueValidator(1), django.core.validators.MaxValueValidator(3)])),
+            ],
+            options={
+                'ordering': ('name',),
+            },
+        ),
+        migrations.RunPython(create_events, migrations.RunPython.noop),
+        migrations.DeleteModel(
+            name='Fortress',
+        ),
+        migrations.DeleteModel(
+            name='PolesApart',
+        ),
+        migrations.DeleteModel(
+            name='Stax',
+        ),
+        migrations.AlterField(
+            model_name='qualification',
+            name='event',
+            field=models.CharField(max_length=2),
+        ),
+        migrations.AlterField(
+            model_name='qualificationrule',
+            name='event',
+            field=models.CharField(max_length=2),
+        ),
+        migrations.AlterField(
+            model_name='team',
+            name='event',
+            field=models.CharField(db_index=True, max_length=2),
+        ),
+    ]
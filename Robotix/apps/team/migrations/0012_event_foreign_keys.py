@@ -0,0 +1,31 @@
+# -*- coding: utf-8 -*-
+# Generated by Django 1.10.5 on 2026-10-18 18:19
+from __future__ import unicode_literals
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('team', '0011_event_registry'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='qualification',
+            name='event',
+            field=models.ForeignKey(db_column='event', on_delete=django.db.models.deletion.PROTECT, related_name='+', to='team.Event'),
+        ),
+        migrations.AlterField(
+            model_name='qualificationrule',
+            name='event',
+            field=models.ForeignKey(db_column='event', on_delete=django.db.models.deletion.PROTECT, related_name='+', to='team.Event'),
+        ),
+        migrations.AlterField(
+            model_name='team',
+            name='event',
+            field=models.ForeignKey(db_column='event', on_delete=django.db.models.deletion.PROTECT, related_name='teams', to='team.Event'),
+        ),
+    ]
@@ -1,18 +1,73 @@
+from django.conf import settings
 from django.db import models
 from django.core.exceptions import ValidationError
+from django.core.validators import MaxValueValidator, MinValueValidator
 
 from participant.models import Participant
 from miscellaneous.models import College, State, Country
+from miscellaneous.responses import changed
+
+
+QUALIFY_ROUND_CHOICES = (
+    ('round_one', 'Round One, to Round Two'),
+    ('round_two', 'Round Two, to Round Three'),
+)
+QUALIFY_ROUNDS = [round for round, name in QUALIFY_ROUND_CHOICES]
+
+SCORE_FIELDS = ('round_one', 'round_two', 'round_three')
+
+
+class TeamQuerySet(models.QuerySet):
+
+    def of(self, participant):
+        return self.filter(participant=participant)
+
+    def qualified(self, round=2):
+        if round == 3:
+            return self.filter(qualify_round_two=True)
+        return self.filter(qualify_round_one=True)
+
+    def update(self, **kwargs):
+        rows = super(TeamQuerySet, self).update(**kwargs)
+        # Updates send no signals, and cached admin pages show every team
+        changed(self.model)
+        return rows
+
+
+class Event(models.Model):
+    code        = models.CharField(
+        max_length=2,
+        primary_key=True,
+        help_text='Two letters, used in team numbers such as FT-12'
+    )
+    name        = models.CharField(max_length=50, unique=True)
+    max_team_size = models.PositiveSmallIntegerField(default=4)
+    rounds      = models.PositiveSmallIntegerField(
+        default=3,
+        validators=[MinValueValidator(1), MaxValueValidator(3)],
+        help_text='Rounds scored, up to three'
+    )
+
+    class Meta:
+        ordering = ('name',)
+
+    def __str__(self):
+        return self.name
 
 
 class Team(models.Model):
+    event       = models.ForeignKey(Event,
+        to_field='code',
+        on_delete=models.PROTECT,
+        db_column='event',
+        related_name='teams'
+    )
     participant = models.ManyToManyField(
         Participant,
         verbose_name='Team Members',
-        related_name='%(app_label)s_%(class)s_related',
+        related_name='teams',
         help_text='<strong>Type in team member\'s name, mobile or e-mail to begin a search</strong><br>'
     )
-    max_team_size = 4
 
     name        = models.CharField(
         max_length=50,
@@ -62,30 +117,113 @@ class Team(models.Model):
         verbose_name='Round Three Score'
     )
 
+    # Kept in step with the members by team.summary, so changelists and
+    # exports can show who is on a team without a query per row
+    member_names = models.TextField(blank=True, editable=False, verbose_name='Members')
+    member_colleges = models.TextField(blank=True, editable=False, verbose_name='Colleges')
+    member_count = models.PositiveSmallIntegerField(default=0, editable=False, verbose_name='Team size')
+
+    objects = TeamQuerySet.as_manager()
+
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        team = super(Team, cls).from_db(db, field_names, values)
+        # The scores as loaded, so a save can tell whether it changes the
+        # leaderboard without reading the row again
+        team._loaded_scores = {field: getattr(team, field) for field in SCORE_FIELDS if field in field_names}
+        return team
+
     def __str__(self):
-        return '{}-{}'.format(self.event, self.pk)
+        return '{}-{}'.format(self.event_id, self.pk)
 
     class Meta:
-        abstract = True
+        index_together = [
+            ('qualify_round_one', 'event'),
+            ('qualify_round_two', 'event'),
+            ('event', 'verification'),
+            ('event', 'certificate'),
+            ('event', 'round_one'),
+            ('event', 'round_two'),
+            ('event', 'round_three'),
+        ]
+
 
-class PolesApart(Team):
-    event = 'PA'
+class QualificationRule(models.Model):
+    event       = models.ForeignKey(Event,
+        to_field='code',
+        on_delete=models.PROTECT,
+        db_column='event',
+        related_name='+'
+    )
+    round       = models.CharField(
+        max_length=10,
+        choices=QUALIFY_ROUND_CHOICES,
+        help_text='The round whose scores decide who goes on to the next'
+    )
+    top         = models.PositiveIntegerField(
+        null=True,
+        blank=True,
+        help_text='Qualify the best N teams, ties at the boundary included'
+    )
+    cutoff      = models.IntegerField(
+        null=True,
+        blank=True,
+        help_text='Only teams scoring at least this much qualify'
+    )
+    college_quota = models.PositiveSmallIntegerField(
+        null=True,
+        blank=True,
+        help_text='At most this many teams of one college qualify, its best first. '
+                  'A team belongs to the college most of its members are from'
+    )
 
     class Meta:
-        verbose_name = 'PolesApart'
-        verbose_name_plural = verbose_name
+        unique_together = ('event', 'round')
 
-class Fortress(Team):
-    event ='FT'
+    def clean(self):
+        if self.top is None and self.cutoff is None and self.college_quota is None:
+            raise ValidationError('Give a top N, a cutoff or a college quota')
+        event = Event.objects.filter(pk=self.event_id).first()
+        if event is not None and self.round in QUALIFY_ROUNDS and QUALIFY_ROUNDS.index(self.round) + 1 >= event.rounds:
+            raise ValidationError('{} has no round after this one'.format(event))
 
-    class Meta:
-        verbose_name = 'Fortress'
-        verbose_name_plural = verbose_name
+    def describe(self):
+        parts = []
+        if self.top is not None:
+            parts.append('top {}'.format(self.top))
+        if self.cutoff is not None:
+            parts.append('at least {}'.format(self.cutoff))
+        if self.college_quota is not None:
+            parts.append('at most {} per college'.format(self.college_quota))
+        return ', '.join(parts)
 
+    def __str__(self):
+        return '{} {}: {}'.format(self.event.name, self.get_round_display(), self.describe())
 
-class Stax(Team):
-    event = 'ST'
+
+class Qualification(models.Model):
+    """One qualification decision, as it was taken."""
+    event       = models.ForeignKey(Event,
+        to_field='code',
+        on_delete=models.PROTECT,
+        db_column='event',
+        related_name='+'
+    )
+    round       = models.CharField(max_length=10, choices=QUALIFY_ROUND_CHOICES)
+    rule        = models.CharField(max_length=100)
+    considered  = models.PositiveIntegerField(help_text='Teams the rule was applied to')
+    qualified   = models.TextField(help_text='JSON list of [team, score, college, place] of every team that qualified')
+    added       = models.PositiveIntegerField(default=0)
+    removed     = models.PositiveIntegerField(default=0)
+    user        = models.ForeignKey(settings.AUTH_USER_MODEL,
+        null=True,
+        blank=True,
+        on_delete=models.SET_NULL
+    )
+    created     = models.DateTimeField(auto_now_add=True)
 
     class Meta:
-        verbose_name = 'Stax'
-        verbose_name_plural = verbose_name
+        ordering = ('-created',)
+
+    def __str__(self):
+        return '{} {} ({})'.format(self.event.name, self.get_round_display(), self.rule)
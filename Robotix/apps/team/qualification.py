@@ -0,0 +1,160 @@
+"""
+Set-based qualification.
+
+A QualificationRule of an event and round is applied to a pool of that
+event's teams in the database: teams without a score, or below the
+cutoff, drop out; each college keeps its best ``college_quota`` teams,
+ties broken by team id; the ``top`` N of the rest qualify, ties at the
+boundary included. The ranking is one query with window functions, so
+it needs PostgreSQL or SQLite 3.25 or later. The result is written with
+a single UPDATE of the pool and recorded as a Qualification.
+"""
+import json
+
+from django.db import connection, transaction
+
+from miscellaneous.responses import changed
+from participant.models import Participant
+
+from .models import Qualification, QualificationRule, Team
+
+
+QUALIFY_FIELDS = {
+    'round_one': 'qualify_round_one',
+    'round_two': 'qualify_round_two',
+}
+
+
+def ranking(pool, round, rule):
+    """SQL and params selecting ``(team, score, college, place)`` of the teams of ``pool`` that qualify."""
+    qn = connection.ops.quote_name
+    pool_sql, pool_params = pool.order_by().values('pk').query.sql_with_params()
+    score = 't.{}'.format(qn(round))
+    params = list(pool_params)
+    scored_where = ''
+    if rule.cutoff is not None:
+        scored_where = ' AND {} >= %s'.format(score)
+        params.append(rule.cutoff)
+    placed_where = ''
+    if rule.college_quota is not None:
+        placed_where = ' WHERE college_place <= %s'
+        params.append(rule.college_quota)
+    ranked_where = ''
+    if rule.top is not None:
+        ranked_where = ' WHERE place <= %s'
+        params.append(rule.top)
+
+    sql = '''
+        WITH scored AS (
+            SELECT t.id, {score} AS score FROM {team} t
+            WHERE t.id IN ({pool}) AND {score} IS NOT NULL{scored_where}
+        ),
+        counted AS (
+            SELECT s.id, s.score, p.college_id, ROW_NUMBER() OVER (
+                PARTITION BY s.id ORDER BY COUNT(p.id) DESC, p.college_id
+            ) AS n
+            FROM scored s
+            LEFT JOIN {membership} m ON m.team_id = s.id
+            LEFT JOIN {participant} p ON p.id = m.participant_id
+            GROUP BY s.id, s.score, p.college_id
+        ),
+        placed AS (
+            SELECT id, score, college_id, ROW_NUMBER() OVER (
+                PARTITION BY COALESCE(college_id, -id) ORDER BY score DESC, id
+            ) AS college_place
+            FROM counted WHERE n = 1
+        ),
+        ranked AS (
+            SELECT id, score, college_id, RANK() OVER (ORDER BY score DESC) AS place
+            FROM placed{placed_where}
+        )
+        SELECT id, score, college_id, place FROM ranked{ranked_where} ORDER BY place, id
+    '''.format(
+        score=score,
+        team=qn(Team._meta.db_table),
+        membership=qn(Team.participant.through._meta.db_table),
+        participant=qn(Participant._meta.db_table),
+        pool=pool_sql,
+        scored_where=scored_where,
+        placed_where=placed_where,
+        ranked_where=ranked_where,
+    )
+    return sql, params
+
+
+def import_rule(event, round, top=None, cutoff=None, college_quota=None):
+    """
+    The rule a score import qualifies ``event``'s teams for ``round`` by:
+    an unsaved one of the limits given, or the event's own rule for the
+    round when none are. None if there is neither. Raises ValidationError
+    if the event has no round after ``round``.
+    """
+    if top is None and cutoff is None and college_quota is None:
+        return QualificationRule.objects.filter(event=event, round=round).first()
+    rule = QualificationRule(event_id=event, round=round, top=top, cutoff=cutoff, college_quota=college_quota)
+    rule.clean()
+    return rule
+
+
+def qualify(pool, round, rule, user=None, dry_run=False):
+    """
+    Apply ``rule`` to the teams of ``pool`` in the rule's event: every one
+    of them gets the round's qualification flag set or cleared. Returns the
+    Qualification recording the decision, unsaved on a dry run.
+    """
+    pool = pool.filter(event=rule.event_id)
+    flag = QUALIFY_FIELDS[round]
+    qn = connection.ops.quote_name
+    with transaction.atomic():
+        sql, params = ranking(pool, round, rule)
+        with connection.cursor() as cursor:
+            cursor.execute(sql, params)
+            rows = cursor.fetchall()
+        qualified = {row[0] for row in rows}
+        before = set(pool.filter(**{flag: True}).values_list('pk', flat=True))
+        decision = Qualification(
+            event_id=rule.event_id,
+            round=round,
+            rule=rule.describe(),
+            considered=pool.count(),
+            qualified=json.dumps([list(row) for row in rows]),
+            added=len(qualified - before),
+            removed=len(before - qualified),
+            user=user,
+        )
+        if not dry_run:
+            pool_sql, pool_params = pool.order_by().values('pk').query.sql_with_params()
+            with connection.cursor() as cursor:
+                cursor.execute(
+                    'UPDATE {team} SET {flag} = CASE WHEN id IN (SELECT id FROM ({ranking}) qualified) '
+                    'THEN %s ELSE %s END WHERE id IN ({pool})'.format(
+                        team=qn(Team._meta.db_table),
+                        flag=qn(flag),
+                        ranking=sql,
+                        pool=pool_sql,
+                    ),
+                    params + [True, False] + list(pool_params),
+                )
+            decision.save()
+            changed(Team)
+    return decision
+
+
+def promote(team, user=None):
+    """
+    Qualify ``team`` for the round after the last one it qualified for,
+    recorded as a manual decision.
+    """
+    round = 'round_two' if team.qualify_round_one else 'round_one'
+    flag = QUALIFY_FIELDS[round]
+    with transaction.atomic():
+        added = Team.objects.filter(pk=team.pk, **{flag: False}).update(**{flag: True})
+        return Qualification.objects.create(
+            event_id=team.event_id,
+            round=round,
+            rule='manual',
+            considered=1,
+            qualified=json.dumps([[team.pk, getattr(team, round), None, None]]),
+            added=added,
+            user=user,
+        )
@@ -0,0 +1,142 @@
+"""
+Bulk score import for one event.
+
+A score sheet is a CSV with a ``team`` column (``FT-12`` or just ``12``)
+and any of the ``round_one``, ``round_two`` and ``round_three`` columns.
+Blank cells leave a score untouched. All changes are written with a few
+batched UPDATEs inside one transaction, optionally followed by qualifying
+the event's teams for a round on the new scores with ``qualify()``.
+"""
+import csv
+import json
+
+from django.core.exceptions import ValidationError
+from django.db import transaction
+from django.db.models import Case, Value, When
+
+from .events import get_event
+from .leaderboard import invalidate
+from .models import Team
+from .qualification import QUALIFY_FIELDS, qualify
+
+
+SCORE_FIELDS = ('round_one', 'round_two', 'round_three')
+BATCH_SIZE = 500
+
+
+def batch_update(field, values):
+    """Set ``field`` to ``values[pk]`` for every team, one UPDATE per batch."""
+    batch_update_fields({pk: {field: value} for pk, value in values.items()})
+
+
+def batch_update_fields(rows):
+    """
+    Set the fields of every team to ``rows[pk]``, a dict of the same
+    fields for each team, all of them in one UPDATE per batch.
+    """
+    pks = sorted(rows)
+    fields = list(rows[pks[0]]) if pks else []
+    for start in range(0, len(pks), BATCH_SIZE):
+        batch = pks[start:start + BATCH_SIZE]
+        Team.objects.filter(pk__in=batch).update(**{field: Case(
+            *[When(pk=pk, then=Value(rows[pk][field])) for pk in batch],
+            output_field=Team._meta.get_field(field)
+        ) for field in fields})
+
+
+class ScoreImport(object):
+
+    def __init__(self, event_code):
+        self.event_code = event_code
+        self.event = get_event(event_code)
+        self.teams = Team.objects.filter(event=event_code)
+        self.scores = {}
+        self.errors = []
+        self.diff = []
+
+    def _team_pk(self, value):
+        code, sep, pk = value.strip().rpartition('-')
+        if sep and code.upper() != self.event_code:
+            raise ValidationError('{} is not a {} team'.format(value, self.event))
+        try:
+            return int(pk)
+        except ValueError:
+            raise ValidationError('{} is not a team'.format(value))
+
+    def read(self, lines):
+        """Parse and validate a score sheet, collecting errors by line number."""
+        reader = csv.DictReader(lines)
+        fields = [field for field in SCORE_FIELDS if field in (reader.fieldnames or [])]
+        if 'team' not in (reader.fieldnames or []) or not fields:
+            self.errors.append((1, 'Expected a team column and at least one of {}'.format(', '.join(SCORE_FIELDS))))
+            return self
+
+        for line, row in enumerate(reader, start=2):
+            try:
+                pk = self._team_pk(row['team'] or '')
+                if pk in self.scores:
+                    raise ValidationError('Team {} appears more than once'.format(row['team']))
+                self.scores[pk] = {
+                    field: Team._meta.get_field(field).clean(row[field].strip(), None)
+                    for field in fields if row[field] and row[field].strip()
+                }
+            except ValidationError as e:
+                self.errors.append((line, '; '.join(e.messages)))
+
+        known = set(self.teams.filter(pk__in=self.scores).values_list('pk', flat=True))
+        for pk in sorted(set(self.scores) - known):
+            self.errors.append((None, 'There is no {} team {}'.format(self.event, pk)))
+        return self
+
+    def plan(self):
+        """
+        Work out every score the import changes, as ``self.changes`` (field
+        to ``{pk: value}``) and a readable ``self.diff``.
+        """
+        current = {
+            row['pk']: row
+            for row in self.teams.values('pk', *SCORE_FIELDS)
+        }
+
+        self.changes = {}
+        for pk, scores in sorted(self.scores.items()):
+            for field, value in scores.items():
+                if current[pk][field] != value:
+                    self.changes.setdefault(field, {})[pk] = value
+
+        self.diff = [
+            ('{}-{}'.format(self.event_code, pk), field, current[pk][field], value)
+            for pk, field, value in sorted(
+                (pk, field, value)
+                for field, values in self.changes.items()
+                for pk, value in values.items()
+            )
+        ]
+        return self
+
+    def apply(self, round=None, rule=None, user=None, dry_run=False):
+        """
+        Write the planned scores and, given a ``round`` and a qualification
+        ``rule``, qualify the event's teams for it on the new scores. The
+        flags that change are added to ``self.diff`` and the decision is kept
+        as ``self.decision``. A dry run ranks the teams on the new scores
+        too, so it writes them and rolls them back.
+        """
+        self.decision = None
+        with transaction.atomic():
+            for field, values in self.changes.items():
+                batch_update(field, values)
+            if rule is not None:
+                flag = QUALIFY_FIELDS[round]
+                before = set(self.teams.filter(**{flag: True}).values_list('pk', flat=True))
+                self.decision = qualify(self.teams, round, rule, user, dry_run=dry_run)
+                after = {row[0] for row in json.loads(self.decision.qualified)}
+                self.diff.extend(
+                    ('{}-{}'.format(self.event_code, pk), flag, pk in before, pk in after)
+                    for pk in sorted(before ^ after)
+                )
+            if dry_run:
+                transaction.set_rollback(True)
+        if self.changes and not dry_run:
+            invalidate(self.event_code)
+        return self
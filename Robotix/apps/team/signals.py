@@ -0,0 +1,76 @@
+from django.db.models.signals import m2m_changed, post_delete, post_save, pre_delete, pre_save
+from django.dispatch import receiver
+
+from miscellaneous.models import College
+from participant.models import Participant
+
+from .events import registry
+from .leaderboard import invalidate
+from .models import SCORE_FIELDS, Event, Team
+from .summary import members_changed
+
+
+Membership = Team.participant.through
+
+
+@receiver(pre_save, sender=Team)
+def invalidate_leaderboard_on_score_change(sender, instance, raw=False, **kwargs):
+    if raw or not instance.event_id:
+        return
+    loaded = getattr(instance, '_loaded_scores', None)
+    if loaded is None or any(score != getattr(instance, field) for field, score in loaded.items()):
+        invalidate(instance.event_id)
+    instance._loaded_scores = {field: getattr(instance, field) for field in (loaded or SCORE_FIELDS)}
+
+
+@receiver(post_delete, sender=Team)
+def invalidate_leaderboard_on_delete(sender, instance, **kwargs):
+    invalidate(instance.event_id)
+
+
+# Members decide a team's summary and its leaderboard's college
+# breakdown. Team forms and the related managers change them through
+# m2m_changed. Django sends no signals for the through table's own rows,
+# so the membership inline reports its changes itself and a deleted
+# participant's teams are looked up before the delete.
+
+@receiver(m2m_changed, sender=Membership)
+def update_teams_on_members_change(sender, instance, action, reverse, pk_set, **kwargs):
+    if not reverse:
+        if action.startswith('post_'):
+            members_changed([instance.pk])
+    elif action == 'pre_clear':
+        # Once cleared, the participant's former teams can't be looked up
+        instance._cleared_teams = list(instance.teams.values_list('pk', flat=True))
+    elif action == 'post_clear':
+        members_changed(getattr(instance, '_cleared_teams', []))
+    elif action.startswith('post_'):
+        members_changed(pk_set)
+
+
+@receiver(pre_delete, sender=Participant)
+def remember_teams_of_participant(sender, instance, **kwargs):
+    instance._deleted_from_teams = list(instance.teams.values_list('pk', flat=True))
+
+
+@receiver(post_delete, sender=Participant)
+def update_teams_on_participant_delete(sender, instance, **kwargs):
+    members_changed(getattr(instance, '_deleted_from_teams', []))
+
+
+@receiver(post_save, sender=Participant)
+def update_teams_on_participant_change(sender, instance, created=False, raw=False, **kwargs):
+    if not (raw or created):
+        members_changed(Membership.objects.filter(participant=instance).values_list('team_id', flat=True))
+
+
+@receiver(post_save, sender=College)
+def update_teams_on_college_change(sender, instance, created=False, raw=False, **kwargs):
+    if not (raw or created):
+        members_changed(Membership.objects.filter(participant__college=instance).values_list('team_id', flat=True))
+
+
+@receiver(post_save, sender=Event)
+@receiver(post_delete, sender=Event)
+def invalidate_events(sender, **kwargs):
+    registry.bump()
@@ -0,0 +1,53 @@
+"""
+The denormalized member summary on each team row.
+
+``member_names``, ``member_colleges`` and ``member_count`` are rewritten
+by ``refresh``. ``members_changed`` does that and also invalidates the
+teams' leaderboards; ``team.signals`` calls it when a team's members, or
+a member's name or college, change. Django sends no signals for rows of
+the membership table itself, so code writing those rows directly (the
+membership inline, bulk_create, queryset updates, raw fixtures) calls
+``members_changed`` itself, or ``manage.py refresh_team_summaries``
+afterwards.
+"""
+from collections import defaultdict
+
+from .leaderboard import invalidate
+from .models import Team
+from .scores import BATCH_SIZE, batch_update_fields
+
+
+Membership = Team.participant.through
+
+
+def summarize(participants):
+    """The summary fields for a team of ``participants``, colleges prefetched."""
+    colleges = []
+    for participant in participants:
+        if participant.college.name not in colleges:
+            colleges.append(participant.college.name)
+    return {
+        'member_names': ', '.join(participant.name for participant in participants),
+        'member_colleges': ', '.join(colleges),
+        'member_count': len(participants),
+    }
+
+
+def refresh(team_pks):
+    """Rewrite the summary of every team in ``team_pks``, a batch at a time."""
+    team_pks = sorted(set(team_pks))
+    for start in range(0, len(team_pks), BATCH_SIZE):
+        batch = team_pks[start:start + BATCH_SIZE]
+        members = defaultdict(list)
+        memberships = Membership.objects.filter(team_id__in=batch).select_related('participant__college')
+        for membership in memberships.order_by('participant_id'):
+            members[membership.team_id].append(membership.participant)
+        batch_update_fields({pk: summarize(members[pk]) for pk in batch})
+
+
+def members_changed(team_pks):
+    """Bring the summaries and leaderboards of ``team_pks`` up to date."""
+    team_pks = set(team_pks)
+    refresh(team_pks)
+    for event in set(Team.objects.filter(pk__in=team_pks).values_list('event', flat=True)):
+        invalidate(event)
@@ -0,0 +1,174 @@
+import csv
+import io
+import json
+
+from django.contrib import admin
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+
+from miscellaneous.testing import make_teams
+
+from .leaderboard import board
+from .models import Qualification, QualificationRule, Team
+from .qualification import import_rule, qualify
+from .scores import ScoreImport
+from .summary import refresh
+
+
+class TeamExportTests(TestCase):
+    fixtures = ['fixtures']
+
+    def export(self):
+        fileobj = admin.site._registry[Team].write_csv(None, Team.objects.all())
+        try:
+            return list(csv.reader(io.TextIOWrapper(fileobj, encoding='utf-8', newline='')))
+        finally:
+            fileobj.close()
+
+    def test_query_count_does_not_grow_with_teams(self):
+        make_teams(5)
+        # Warm the state and country lookups
+        self.export()
+        with CaptureQueriesContext(connection) as queries:
+            rows = self.export()
+        self.assertEqual(len(rows), 6)
+
+        make_teams(495)
+        with self.assertNumQueries(len(queries)):
+            rows = self.export()
+        self.assertEqual(len(rows), 501)
+
+    def test_rows(self):
+        team, = make_teams(1)
+        header, row = self.export()
+        row = dict(zip(header, row))
+        self.assertEqual(row['event'], 'FT')
+        self.assertEqual(row['state'], team.state.name)
+        self.assertEqual(len(row['participant'].splitlines()), 2)
+
+
+class QualifyTests(TestCase):
+    fixtures = ['fixtures']
+
+    def setUp(self):
+        self.teams = make_teams(4, scores=[10, 40, 30, 20])
+
+    def flagged(self):
+        return sorted(Team.objects.filter(qualify_round_one=True).values_list('pk', flat=True))
+
+    def test_top(self):
+        rule = QualificationRule.objects.create(event_id='FT', round='round_one', top=2)
+        decision = qualify(Team.objects.all(), 'round_one', rule)
+        self.assertEqual(self.flagged(), sorted([self.teams[1].pk, self.teams[2].pk]))
+        self.assertEqual((decision.considered, decision.added, decision.removed), (4, 2, 0))
+        self.assertEqual(Qualification.objects.count(), 1)
+
+    def test_cutoff_clears_flags(self):
+        Team.objects.update(qualify_round_one=True)
+        rule = QualificationRule(event_id='FT', round='round_one', cutoff=25)
+        decision = qualify(Team.objects.all(), 'round_one', rule)
+        self.assertEqual(self.flagged(), sorted([self.teams[1].pk, self.teams[2].pk]))
+        self.assertEqual(decision.removed, 2)
+
+    def test_college_quota(self):
+        # Every team has one member of each of the same two colleges
+        rule = QualificationRule(event_id='FT', round='round_one', college_quota=1)
+        qualify(Team.objects.all(), 'round_one', rule)
+        self.assertEqual(self.flagged(), [self.teams[1].pk])
+
+    def test_other_events_untouched(self):
+        other, = make_teams(1, event='ST', scores=[100])
+        rule = QualificationRule(event_id='FT', round='round_one', top=1)
+        qualify(Team.objects.all(), 'round_one', rule)
+        self.assertEqual(self.flagged(), [self.teams[1].pk])
+
+    def test_dry_run(self):
+        rule = QualificationRule(event_id='FT', round='round_one', top=2)
+        decision = qualify(Team.objects.all(), 'round_one', rule, dry_run=True)
+        self.assertEqual(decision.added, 2)
+        self.assertIsNone(decision.pk)
+        self.assertEqual(self.flagged(), [])
+        self.assertFalse(Qualification.objects.exists())
+
+
+class ScoreImportTests(TestCase):
+    fixtures = ['fixtures']
+
+    def setUp(self):
+        self.teams = make_teams(3, scores=[10, 20, 30])
+
+    def sheet(self, *rows):
+        return io.StringIO('\n'.join(('team,round_one',) + rows))
+
+    def test_scores_and_qualification(self):
+        first, second, third = self.teams
+        scores = ScoreImport('FT').read(self.sheet('FT-{},50'.format(first.pk), '{},'.format(second.pk)))
+        self.assertEqual(scores.errors, [])
+        scores.plan().apply('round_one', import_rule('FT', 'round_one', top=1))
+
+        first.refresh_from_db()
+        self.assertEqual(first.round_one, 50)
+        self.assertTrue(first.qualify_round_one)
+        self.assertEqual(Team.objects.filter(qualify_round_one=True).count(), 1)
+        self.assertEqual(scores.decision.rule, QualificationRule(top=1).describe())
+        self.assertIn((str(first), 'round_one', 10, 50), scores.diff)
+        self.assertIn((str(first), 'qualify_round_one', False, True), scores.diff)
+
+    def test_stored_rule(self):
+        QualificationRule.objects.create(event_id='FT', round='round_one', top=2)
+        rule = import_rule('FT', 'round_one')
+        ScoreImport('FT').read(self.sheet()).plan().apply('round_one', rule)
+        self.assertEqual(Team.objects.filter(qualify_round_one=True).count(), 2)
+
+    def test_dry_run(self):
+        first = self.teams[0]
+        scores = ScoreImport('FT').read(self.sheet('{},50'.format(first.pk)))
+        scores.plan().apply('round_one', import_rule('FT', 'round_one', top=1), dry_run=True)
+        first.refresh_from_db()
+        self.assertEqual(first.round_one, 10)
+        self.assertFalse(Team.objects.filter(qualify_round_one=True).exists())
+        self.assertEqual(json.loads(scores.decision.qualified)[0][0], first.pk)
+        self.assertFalse(Qualification.objects.exists())
+
+    def test_errors(self):
+        other, = make_teams(1, event='ST')
+        scores = ScoreImport('FT').read(self.sheet(
+            'ST-{},1'.format(other.pk),
+            '{},x'.format(self.teams[0].pk),
+            '{},1'.format(other.pk),
+        ))
+        self.assertEqual([line for line, error in scores.errors], [2, 3, None])
+
+
+class SummaryTests(TestCase):
+    fixtures = ['fixtures']
+
+    def test_one_update_per_batch(self):
+        teams = make_teams(3)
+        Team.objects.update(member_names='', member_colleges='', member_count=0)
+        with self.assertNumQueries(2):
+            refresh(team.pk for team in teams)
+        team = Team.objects.get(pk=teams[0].pk)
+        self.assertEqual(team.member_names, ', '.join(member.name for member in team.participant.order_by('pk')))
+        self.assertEqual(team.member_count, 2)
+        self.assertTrue(team.member_colleges)
+
+
+class LeaderboardSignalTests(TestCase):
+    fixtures = ['fixtures']
+
+    def test_only_score_changes_invalidate(self):
+        team = Team.objects.get(pk=make_teams(1, scores=[10])[0].pk)
+        generation = board('FT').current()
+        team.name = 'Renamed'
+        with self.assertNumQueries(1):
+            team.save()
+        self.assertEqual(board('FT').current(), generation)
+
+        team.round_one = 20
+        team.save()
+        self.assertNotEqual(board('FT').current(), generation)
+        generation = board('FT').current()
+        team.save()
+        self.assertEqual(board('FT').current(), generation)
@@ -0,0 +1,87 @@
+"""
+Team size and membership rules, checked a batch of teams at a time.
+
+Every writer of team memberships (team forms, the membership inlines,
+imports and the API) describes the teams it is about to save as
+``(team pk or None, event code, member pks)`` and gets back the rule
+violations for the whole batch from a single query.
+"""
+from collections import defaultdict
+
+from .events import get_event
+from .models import Event, Team
+
+
+def max_team_size(event_code):
+    event = get_event(event_code)
+    if event is None:
+        return Event._meta.get_field('max_team_size').default
+    return event.max_team_size
+
+
+def team_label(event_code, pk):
+    return '{}-{}'.format(event_code, pk) if pk else 'a new {} team'.format(event_code)
+
+
+def _batch_errors(teams):
+    """Violations within the batch itself, and who is in which team of it."""
+    errors = defaultdict(list)
+    seen = defaultdict(dict)
+    for i, (pk, event_code, members) in enumerate(teams):
+        if len(members) > max_team_size(event_code):
+            errors[i].append('Max team size is {}'.format(max_team_size(event_code)))
+        for member in members:
+            if member in seen[event_code]:
+                other = teams[seen[event_code][member]][0]
+                errors[i].append('Participant {} is also in {}'.format(member, team_label(event_code, other)))
+            else:
+                seen[event_code][member] = i
+    return errors, seen
+
+
+def membership_errors(teams):
+    """
+    Check a batch of intended team memberships.
+
+    ``teams`` is a list of ``(pk, event_code, member_pks)`` giving the full
+    membership each team will have, with ``pk`` None for unsaved teams.
+    Existing memberships of the teams in the batch are ignored in favour of
+    the given ones. Returns ``{index in teams: [error message, ...]}``.
+    """
+    errors, seen = _batch_errors(teams)
+    members = {member for event_members in seen.values() for member in event_members}
+    if members:
+        conflicts = Team.participant.through.objects.filter(
+            participant_id__in=members,
+            team__event__in=list(seen),
+        ).exclude(
+            team_id__in=[pk for pk, event_code, team_members in teams if pk]
+        ).values_list('participant_id', 'participant__first_name', 'participant__last_name', 'team__event', 'team_id')
+        for member, first_name, last_name, event_code, other in conflicts:
+            if member in seen[event_code]:
+                errors[seen[event_code][member]].append('{} is already in {}'.format(
+                    '{} {}'.format(first_name, last_name).title(),
+                    team_label(event_code, other),
+                ))
+    return dict(errors)
+
+
+def audit(event_code):
+    """
+    Rule violations among all teams of an event, from one pass over its
+    memberships, as ``[(team label, error message), ...]``.
+    """
+    teams = {pk: set() for pk in Team.objects.filter(event=event_code).values_list('pk', flat=True)}
+    memberships = Team.participant.through.objects.filter(team__event=event_code)
+    for team, member in memberships.values_list('team_id', 'participant_id'):
+        teams[team].add(member)
+    batch = [(pk, event_code, members) for pk, members in sorted(teams.items())]
+    errors, seen = _batch_errors(batch)
+    for i, (pk, event_code, members) in enumerate(batch):
+        if not members:
+            errors[i].append('Team has no members')
+    return [
+        (team_label(event_code, batch[i][0]), error)
+        for i in sorted(errors)
+        for error in errors[i]
+    ]
@@ -0,0 +1,21 @@
+from jet.dashboard.dashboard import DefaultIndexDashboard
+
+from team.dashboard import Leaderboard
+from team.leaderboard import ROUNDS
+from team.events import events
+
+
+class IndexDashboard(DefaultIndexDashboard):
+
+    def init_with_context(self, context):
+        super(IndexDashboard, self).init_with_context(context)
+        self.available_children.append(Leaderboard)
+        for order, event in enumerate(events().values()):
+            round, name = ROUNDS[0]
+            self.children.append(Leaderboard(
+                '{} {}'.format(event.name, name),
+                event=event.code,
+                round=round,
+                column=2,
+                order=order + 2,
+            ))
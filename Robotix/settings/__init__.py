@@ -1 +0,0 @@
-from .base import *
@@ -1,6 +1,9 @@
+import os
 import sys
 from os.path import join, abspath, dirname
 
+from django.core.exceptions import ImproperlyConfigured
+
 # PATH vars
 
 here = lambda *x: join(abspath(dirname(__file__)), *x)
@@ -15,7 +18,7 @@ sys.path.insert(0, root('apps'))
 SECRET_KEY = 'ryewpidEc2ryewpidEc2'
 
 # SECURITY WARNING: don't run with debug turned on in production!
-DEBUG = True
+DEBUG = False
 
 ALLOWED_HOSTS = ['*']
 
@@ -41,11 +44,18 @@ PROJECT_APPS = (
     'participant',
     'team',
     'miscellaneous',
+    'certificate',
+    'registration',
+    'jobs',
 )
 
 INSTALLED_APPS += PROJECT_APPS
 
+# The apps are imported from Robotix/apps, so tests are found there
+TEST_RUNNER = 'miscellaneous.testing.ProjectAppsRunner'
+
 MIDDLEWARE_CLASSES = (
+    'miscellaneous.middleware.MetricsMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
@@ -60,16 +70,59 @@ ROOT_URLCONF = 'Robotix.urls'
 # Python dotted path to the WSGI application used by Django's runserver.
 WSGI_APPLICATION = 'Robotix.wsgi.application'
 
-DATABASES = {
-    'default': {
-        'ENGINE': 'django.db.backends.sqlite3',
-        'NAME': 'Robotix2018.db',
-        'USER': '',
-        'PASSWORD': '',
-        'HOST': '',
-        'PORT': '',
+# The database is chosen with environment variables. DATABASE_ENGINE is
+# "sqlite" (the default, for small deployments) or "postgresql". For
+# PostgreSQL, DATABASE_HOST may also point at a pgbouncer in front of the
+# server; DATABASE_REPLICA_HOST adds a read replica that changelists and
+# exports read from.
+DATABASE_ENGINE = os.environ.get('DATABASE_ENGINE', 'sqlite')
+
+if DATABASE_ENGINE == 'postgresql':
+    DATABASES = {
+        'default': {
+            'ENGINE': 'django.db.backends.postgresql',
+            'NAME': os.environ.get('DATABASE_NAME', 'robotix'),
+            'USER': os.environ.get('DATABASE_USER', ''),
+            'PASSWORD': os.environ.get('DATABASE_PASSWORD', ''),
+            'HOST': os.environ.get('DATABASE_HOST', ''),
+            'PORT': os.environ.get('DATABASE_PORT', ''),
+            # Keep connections open across requests
+            'CONN_MAX_AGE': int(os.environ.get('DATABASE_CONN_MAX_AGE', 300)),
+        }
     }
-}
+    if os.environ.get('DATABASE_REPLICA_HOST'):
+        DATABASES['replica'] = dict(DATABASES['default'],
+            HOST=os.environ['DATABASE_REPLICA_HOST'],
+            PORT=os.environ.get('DATABASE_REPLICA_PORT', DATABASES['default']['PORT']),
+            TEST={'MIRROR': 'default'},
+        )
+elif DATABASE_ENGINE == 'sqlite':
+    DATABASES = {
+        'default': {
+            'ENGINE': 'django.db.backends.sqlite3',
+            'NAME': os.environ.get('DATABASE_NAME', 'Robotix2018.db'),
+            'OPTIONS': {
+                # Seconds a writer waits for the lock before "database is locked"
+                'timeout': int(os.environ.get('DATABASE_TIMEOUT', 20)),
+            },
+        }
+    }
+else:
+    raise ImproperlyConfigured('Unknown DATABASE_ENGINE "{}"'.format(DATABASE_ENGINE))
+
+# Run on every new SQLite connection. WAL lets readers carry on while
+# another worker writes.
+SQLITE_PRAGMAS = (
+    'journal_mode=WAL',
+    'synchronous=NORMAL',
+)
+
+DATABASE_ROUTERS = ['miscellaneous.db.ReplicaRouter']
+
+# Addresses of the reverse proxies whose X-Real-IP header is taken as the
+# client's address. Any other request is taken at its REMOTE_ADDR, as a
+# client can send the header itself.
+TRUSTED_PROXY = ()
 
 LANGUAGE_CODE = 'en-gb'
 TIME_ZONE = 'Asia/Kolkata'
@@ -79,12 +132,16 @@ USE_TZ = False
 
 STATIC_URL = '/static/'
 
-MEDIA_ROOT = root('assets')
+MEDIA_ROOT = root('media')
 MEDIA_URL = '/media/'
 
-STATICFILES_DIRS = (
-    root('assets'),
-)
+# Uploaded files waiting for a job, kept out of MEDIA_ROOT as nothing serves them
+UPLOAD_ROOT = root('uploads')
+
+# Files jobs produce, such as exports full of participants' details. Only
+# the job's admin page serves them, to its owner.
+JOB_ARTIFACT_ROOT = root('artifacts')
+
 STATIC_ROOT = root('static')
 
 TEMPLATES = [
@@ -115,10 +172,10 @@ TEMPLATES = [
 
 CACHES = {
     'default': {
-        'BACKEND': 'django.core.cache.backends.memcached.MemcachedCache',
-        'LOCATION': '127.0.0.1:11211',
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
     }
 }
 
 JET_SIDE_MENU_COMPACT = True
+JET_INDEX_DASHBOARD = 'Robotix.dashboard.IndexDashboard'
 
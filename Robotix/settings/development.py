@@ -0,0 +1,15 @@
+from .base import *
+
+DEBUG = True
+
+INSTALLED_APPS += (
+    'debug_toolbar',
+)
+
+MIDDLEWARE_CLASSES = (
+    'debug_toolbar.middleware.DebugToolbarMiddleware',
+) + MIDDLEWARE_CLASSES
+
+INTERNAL_IPS = (
+    '127.0.0.1',
+)
@@ -0,0 +1,36 @@
+from .base import *
+
+try:
+    SECRET_KEY = os.environ['DJANGO_SECRET_KEY']
+except KeyError:
+    raise ImproperlyConfigured('Set DJANGO_SECRET_KEY in the environment')
+
+ALLOWED_HOSTS = os.environ.get('ALLOWED_HOSTS', '*').split(',')
+
+# nginx reaches gunicorn over a unix socket, which gunicorn passes on as
+# an empty REMOTE_ADDR. Proxies reached over TCP are added in the
+# environment.
+TRUSTED_PROXY = ('',) + tuple(
+    address for address in os.environ.get('TRUSTED_PROXY', '').split(',') if address
+)
+
+# Shared by every worker, so rate limits and cache generations hold
+# across the whole deployment
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.memcached.MemcachedCache',
+        'LOCATION': os.environ.get('CACHE_LOCATION', '127.0.0.1:11211'),
+    }
+}
+
+# Modules the app only imports when it first needs them. The gunicorn
+# master imports them before forking, so every worker shares one copy.
+PRELOAD_MODULES = (
+    'reportlab.pdfgen.canvas',
+    'reportlab.pdfbase.pdfmetrics',
+    'reportlab.lib.units',
+    'reportlab.lib.utils',
+    'pdfrw',
+    'pdfrw.buildxobj',
+    'pdfrw.toreportlab',
+)
@@ -0,0 +1,32 @@
+"""
+gunicorn settings for the web workers.
+
+The app is loaded once in the master and the workers fork from it, so the
+code and the PRELOAD_MODULES are shared copy-on-write instead of loaded
+by every worker. A preloaded app is not re-read on HUP; deploys restart
+the service. ``manage.py startup_profile --master <pid>`` shows what each
+worker costs.
+"""
+import os
+from importlib import import_module
+
+
+workers = int(os.environ.get('GUNICORN_WORKERS', 3))
+preload_app = True
+accesslog = '-'
+
+
+def when_ready(server):
+    from django.conf import settings
+    for module in getattr(settings, 'PRELOAD_MODULES', ()):
+        import_module(module)
+
+
+def pre_fork(server, worker):
+    # Workers must not share the master's sockets
+    from django.core.cache import caches
+    from django.db import connections
+    for connection in connections.all():
+        connection.close()
+    for cache in caches.all():
+        cache.close()